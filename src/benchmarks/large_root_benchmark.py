@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication, QTreeView, QHeaderView
+from PyQt6.QtCore import QTimer
+from file_monitoring.ignore_matcher import IgnoreMatcher
+from file_system.size_cache_store import SizeCacheStore
+from file_system.custom_file_system_model import CustomFileSystemModel
+from file_system.ignore_filter_proxy_model import IgnoreFilterProxyModel
+
+
+class StallMeter:
+    """Records the gaps between ticks of a fast timer; a long gap is a frozen GUI thread."""
+
+    def __init__(self, interval_ms=5):
+        self.gaps = []
+        self.last = time.perf_counter()
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(interval_ms)
+
+    def tick(self):
+        now = time.perf_counter()
+        self.gaps.append(now - self.last)
+        self.last = now
+
+    def reset(self):
+        self.gaps = []
+        self.last = time.perf_counter()
+
+
+def create_entries(root_dir, count):
+    os.makedirs(root_dir)
+    for i in range(count):
+        open(os.path.join(root_dir, f"file_{i:06d}.txt"), 'w').close()
+
+
+def wait(app, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def run(app, work_dir, large_root_mode, batch_size, settle_seconds):
+    model = CustomFileSystemModel()
+    proxy = IgnoreFilterProxyModel(IgnoreMatcher(['.git']), batch_size=batch_size if large_root_mode else 0)
+    proxy.setSourceModel(model)
+    view = QTreeView()
+    view.setModel(proxy)
+    view.setSortingEnabled(True)
+    view.setAnimated(not large_root_mode)
+    view.setUniformRowHeights(large_root_mode)
+    if large_root_mode:
+        view.header().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        view.header().setResizeContentsPrecision(200)
+    else:
+        view.header().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+    view.resize(800, 600)
+    view.show()
+
+    model.setRootPath(work_dir)
+    view.setRootIndex(proxy.mapFromSource(model.index(work_dir)))
+    wait(app, 0.5)
+
+    meter = StallMeter()
+    view.expand(proxy.mapFromSource(model.index(os.path.join(work_dir, "root"))))
+    wait(app, settle_seconds)
+    if large_root_mode:
+        view.resizeColumnToContents(0)
+    open_gaps = meter.gaps
+    meter.reset()
+    view.sortByColumn(1, view.header().sortIndicatorOrder())
+    wait(app, 1)
+    sort_gaps = meter.gaps
+
+    meter.timer.stop()
+    model.shutdown()
+    view.close()
+    return max(open_gaps), max(sort_gaps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long the GUI thread stalls while a large folder opens.")
+    parser.add_argument("--entries", type=int, default=30000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--settle-seconds", type=float, default=6.0,
+                        help="time allowed for the folder to load before sorting it")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    work_dir = tempfile.mkdtemp(prefix="large_root_benchmark_")
+    try:
+        SizeCacheStore.cache_dir = os.path.join(work_dir, "cache")
+        create_entries(os.path.join(work_dir, "root"), args.entries)
+        for label, large_root_mode in (("ResizeToContents", False), ("large-root mode", True)):
+            open_stall, sort_stall = run(app, work_dir, large_root_mode, args.batch_size, args.settle_seconds)
+            print(f"{label:<18} {args.entries:7d} entries  longest stall opening {open_stall * 1000:7.0f} ms  "
+                  f"sorting {sort_stall * 1000:7.0f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from version_management.archive_writer import ArchiveWriter
+from version_management.backup_reader import ArchiveBackup
+
+
+def create_project(project_dir, file_count, file_size, big_file_size):
+    os.makedirs(os.path.join(project_dir, "src"), exist_ok=True)
+    for i in range(file_count):
+        with open(os.path.join(project_dir, "src", f"module_{i}.py"), 'wb') as f:
+            f.write((f"# module {i}\n".encode() + os.urandom(file_size // 4).hex().encode())[:file_size])
+    with open(os.path.join(project_dir, "data.bin"), 'wb') as f:
+        f.write(os.urandom(big_file_size))
+
+
+def timed(label, func, size):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {elapsed * 1000:10.1f} ms {size / (1 << 20) / elapsed:10.1f} MB/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single-file restore against full archive extraction.")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--file-size", type=int, default=8192)
+    parser.add_argument("--big-file-mb", type=int, default=64)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="restore_benchmark_")
+    try:
+        project_dir = os.path.join(work_dir, "project")
+        create_project(project_dir, args.files, args.file_size, args.big_file_mb << 20)
+        files = [(os.path.join(root, name), os.path.relpath(os.path.join(root, name), project_dir))
+                 for root, _, names in os.walk(project_dir) for name in names]
+        total_size = sum(os.path.getsize(path) for path, _ in files)
+
+        archive_path = os.path.join(work_dir, "project.zip")
+        timed("write archive (parallel)", lambda: ArchiveWriter(archive_path).write(files), total_size)
+
+        one_file = f"src/module_{args.files // 2}.py"
+        one_size = args.file_size
+        backup = ArchiveBackup(archive_path, "backups")
+
+        def extract_all():
+            with zipfile.ZipFile(archive_path) as zf:
+                zf.extractall(os.path.join(work_dir, "full"))
+
+        full = timed("full extraction (zipfile.extractall)", extract_all, total_size)
+        single = timed("single file via member index", lambda: backup.extract(one_file, os.path.join(work_dir, "one")),
+                       one_size)
+        timed("subtree 'src' via member index", lambda: backup.extract("src", os.path.join(work_dir, "sub")),
+              args.files * args.file_size)
+        print(f"single-file restore is {full / single:.0f}x faster than full extraction")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication, QTreeView, QHeaderView
+from PyQt6.QtCore import QObject, QEvent
+from file_system.size_cache_store import SizeCacheStore
+from file_system.custom_file_system_model import CustomFileSystemModel
+
+
+class PaintCounter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.paints += 1
+        return False
+
+
+def create_entries(root_dir, count):
+    for i in range(count):
+        os.makedirs(os.path.join(root_dir, f"dir_{i:05d}"))
+
+
+def run(app, root_dir, count, results, per_result_layout, results_per_event):
+    model = CustomFileSystemModel()
+    view = QTreeView()
+    view.setModel(model)
+    view.header().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+    model.setRootPath(root_dir)
+    view.setRootIndex(model.index(root_dir))
+    view.resize(800, 600)
+    view.show()
+    counter = PaintCounter()
+    view.viewport().installEventFilter(counter)
+
+    deadline = time.monotonic() + 30
+    while model.rowCount(model.index(root_dir)) < count and time.monotonic() < deadline:
+        app.processEvents()
+    app.processEvents()
+
+    paths = [os.path.join(root_dir, f"dir_{i:05d}") for i in range(results)]
+    mtimes = {path: os.stat(path).st_mtime_ns for path in paths}
+    counter.paints = 0
+    started = time.perf_counter()
+    for start in range(0, results, results_per_event):
+        batch = paths[start:start + results_per_event]
+        if per_result_layout:
+            # What the model did before: one layoutChanged per size result
+            for path in batch:
+                model.size_store.put(path, 4096, mtimes[path])
+                model.layoutChanged.emit()
+        else:
+            model.on_sizes_calculated({path: (4096, mtimes[path]) for path in batch})
+        app.processEvents()
+    while model.row_update_timer.isActive():
+        app.processEvents()
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+
+    model.shutdown()
+    view.close()
+    return elapsed, counter.paints
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare repaint cost while sizes of a large directory fill in.")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--results-per-event", type=int, default=10,
+                        help="size results delivered between two event loop iterations")
+    parser.add_argument("--baseline-results", type=int, default=500,
+                        help="results timed for the old behaviour, which grows with the directory size")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    work_dir = tempfile.mkdtemp(prefix="size_repaint_benchmark_")
+    try:
+        SizeCacheStore.cache_dir = os.path.join(work_dir, "cache")
+        root_dir = os.path.join(work_dir, "root")
+        create_entries(root_dir, args.entries)
+        runs = [("layoutChanged per result", True, min(args.baseline_results, args.entries)),
+                ("batched dataChanged", False, args.entries)]
+        for label, per_result_layout, results in runs:
+            elapsed, paints = run(app, root_dir, args.entries, results, per_result_layout, args.results_per_event)
+            print(f"{label:<26} {results:6d} results {elapsed * 1000:10.1f} ms "
+                  f"({elapsed * 1000 / results:.3f} ms/result) {paints:6d} viewport paints")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
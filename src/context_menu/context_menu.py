@@ -2,68 +2,104 @@ import os
 import subprocess
 from PyQt6.QtWidgets import QMenu, QMessageBox, QInputDialog
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import QPoint
+from PyQt6.QtCore import QPoint, QObject, pyqtSlot
+from version_management.git_executor import GitExecutor
 
-class ContextMenu:
+class ContextMenu(QObject):
     def __init__(self, parent):
-        self.parent = parent
+        super().__init__(parent)
+        self.window = parent
+        # repo dir -> whether adding it to safe.directory worked; done once per repository,
+        # however many chunks of a command fail on dubious ownership
+        self.safe_directory_repos = {}
+        # (repo dir, action, args) of commands resubmitted after safe.directory was set
+        self.retried_commands = set()
+        # Git runs off the GUI thread; results come back through on_git_finished
+        self.git = GitExecutor()
+        self.git.command_finished.connect(self.on_git_finished)
 
+    def git_add(self, file_paths):
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        outside = self.git.add(file_paths)
+        if outside:
+            QMessageBox.warning(self.window, "Git Add", "Not in a git repository:\n" + "\n".join(outside))
 
-
-    def git_add(self, file_path):
-        if os.path.isdir(file_path):
-            command = ["git", "add", "."]
-        else:
-            command = ["git", "add", file_path]
-
-        self.run_git_command(command, file_path, "add")
-
-    def git_commit(self, file_path):
-        commit_message, ok = QInputDialog.getText(self.parent, 'Git Commit', 'Enter commit message:')
+    def git_commit(self, file_paths):
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        commit_message, ok = QInputDialog.getText(self.window, 'Git Commit', 'Enter commit message:')
         if ok and commit_message:
-            if os.path.isdir(file_path):
-                command = ["git", "commit", "-m", commit_message]
-            else:
-                command = ["git", "commit", file_path, "-m", commit_message]
-
-            self.run_git_command(command, file_path, "commit")
+            groups, outside = GitExecutor.group_by_repo(file_paths)
+            for repo_dir, relative_paths in groups.items():
+                # A folder commits everything staged, files commit only themselves
+                only_files = all(not os.path.isdir(os.path.join(repo_dir, p)) for p in relative_paths)
+                self.git.commit(repo_dir, commit_message, relative_paths if only_files else None)
+            if outside:
+                QMessageBox.warning(self.window, "Git Commit", "Not in a git repository:\n" + "\n".join(outside))
 
-    def git_push(self, file_path):
-        # Use "git push origin" to push the changes to the remote repository
-        command = ["git", "push", "origin"]
+    def git_push(self, file_paths):
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+        groups, outside = GitExecutor.group_by_repo(file_paths)
+        for repo_dir in groups:
+            # You may need to specify the branch depending on your setup
+            self.git.push(repo_dir)
+        if outside:
+            QMessageBox.warning(self.window, "Git Push", "Not in a git repository:\n" + "\n".join(outside))
 
-        # You may need to specify the branch depending on your setup
-        self.run_git_command(command, file_path, "push")
+    @pyqtSlot(object)
+    def on_git_finished(self, result):
+        action = result.action
+        target = ", ".join(result.paths[:3]) + (f" and {len(result.paths) - 3} more" if len(result.paths) > 3 else "")
+        target = target or os.path.basename(result.repo_dir)
+        key = (result.repo_dir, action, tuple(result.args or ()))
+        retried = key in self.retried_commands
+        self.retried_commands.discard(key)
+        if result.returncode == 0:
+            self.window.statusBar().showMessage(
+                f"git {action} {target}: done in {result.run_seconds:.2f} s "
+                f"(waited {result.queued_seconds:.2f} s)", 10000)
+            return
+        error_message = result.stderr.strip() or result.stdout.strip() or f"git exited with status {result.returncode}"
+        if "detected dubious ownership" in error_message and not retried:
+            self.handle_dubious_ownership(result, error_message)
+        else:
+            self.handle_non_zero_exit_status(error_message, result.returncode, target, action)
 
-    def run_git_command(self, command, file_path, action):
-        try:
-            result = subprocess.run(command, cwd=os.path.dirname(file_path), check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            QMessageBox.information(self.parent, f"Git {action.capitalize()}", f"Successfully executed git {action} on {file_path}")
-        except subprocess.CalledProcessError as e:
-            error_message = e.stderr.decode('utf-8') if e.stderr else str(e)
-            if "detected dubious ownership" in error_message:
-                self.handle_dubious_ownership(file_path, error_message)
-            else:
-                self.handle_non_zero_exit_status(error_message, file_path, action)
+    def handle_dubious_ownership(self, result, error_message):
+        first = result.repo_dir not in self.safe_directory_repos
+        if first:
+            safe_directory = self.extract_directory_from_error(error_message)
+            error = self.add_safe_directory(safe_directory)
+            self.safe_directory_repos[result.repo_dir] = error is None
+        if self.safe_directory_repos[result.repo_dir]:
+            # Retry the original git command after adding the safe directory
+            self.retried_commands.add((result.repo_dir, result.action, tuple(result.args or ())))
+            self.git.submit(result.repo_dir, result.action, result.args, result.paths)
+        if not first:
+            return
+        # Shown last, as the message box's event loop delivers the other chunks' results meanwhile
+        if error is None:
+            QMessageBox.information(self.window, "Git Safe Directory", f"Added {safe_directory} to the safe directories list.")
+        else:
+            QMessageBox.critical(self.window, "Git Safe Directory Error", error)
 
-    def handle_dubious_ownership(self, file_path, error_message):
+    def add_safe_directory(self, safe_directory):
+        """Add safe_directory to git's safe directories; returns an error message, or None if it worked."""
+        if not safe_directory:
+            return "Could not extract the safe directory path from the error message."
         try:
-            safe_directory = self.extract_directory_from_error(error_message)
-            if safe_directory:
-                subprocess.run(["git", "config", "--global", "--add", "safe.directory", safe_directory], check=True)
-                QMessageBox.information(self.parent, "Git Safe Directory", f"Added {safe_directory} to the safe directories list.")
-                # Retry the original git command after adding the safe directory
-                self.run_git_command(["git", "add", "." if os.path.isdir(file_path) else file_path], file_path, "add")
-            else:
-                QMessageBox.critical(self.parent, "Git Safe Directory Error", "Could not extract the safe directory path from the error message.")
+            subprocess.run(["git", "config", "--global", "--add", "safe.directory", safe_directory], check=True)
         except subprocess.CalledProcessError as e:
-            QMessageBox.critical(self.parent, "Git Safe Directory Error", f"Failed to add safe directory: {str(e)}")
+            return f"Failed to add safe directory: {str(e)}"
+        return None
 
-    def handle_non_zero_exit_status(self, error_message, file_path, action):
-        if "returned a non-zero exit status 128" in error_message:
-            QMessageBox.critical(self.parent, f"Git {action.capitalize()} Error", f"Git returned error 128 for {file_path}. This might be due to an issue with the repository. Error details: {error_message}")
+    def handle_non_zero_exit_status(self, error_message, returncode, target, action):
+        if returncode == 128:
+            QMessageBox.critical(self.window, f"Git {action.capitalize()} Error", f"Git returned error 128 for {target}. This might be due to an issue with the repository. Error details: {error_message}")
         else:
-            QMessageBox.critical(self.parent, f"Git {action.capitalize()} Error", f"An error occurred while executing git {action}: {error_message}")
+            QMessageBox.critical(self.window, f"Git {action.capitalize()} Error", f"An error occurred while executing git {action}: {error_message}")
 
     def extract_directory_from_error(self, error_message):
         try:
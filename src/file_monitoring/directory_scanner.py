@@ -0,0 +1,157 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from file_monitoring.tracker_store import TrackerStore, DirSnapshot
+
+# Directories modified this close to the scan are listed again next time, since a
+# change within the same mtime tick would otherwise go unnoticed.
+RACY_WINDOW_NS = 2 * 10**9
+
+
+class ScanStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.dirs_scanned = 0
+        self.dirs_skipped = 0
+        self.files_seen = 0
+        self.new_files = 0
+        self.dirs_changed = 0
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def files_per_second(self):
+        elapsed = self.elapsed
+        return self.files_seen / elapsed if elapsed > 0 else 0.0
+
+
+class DirectoryScanner:
+    """Walks a tree with os.scandir, fanning subdirectories out across a thread pool.
+
+    Workers only list and stat directories; the calling thread works out which
+    files are new or changed in size/mtime and writes them in batches, so
+    directories whose contents are already tracked cost no writes at all.
+
+    Each listed directory's mtime, inode and entries are saved as a DirSnapshot.
+    An incremental scan only stats a directory whose snapshot still matches and
+    descends into the recorded subdirectories without listing it again.
+    """
+
+    def __init__(self, is_ignored, max_workers=None, batch_size=5000,
+                 progress_callback=None, progress_interval=0.25):
+        self.is_ignored = is_ignored
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+
+    def scan(self, root_dir, root_store, incremental=True):
+        stats = ScanStats()
+        pending = {}
+        snapshots = {}
+        last_progress = 0.0
+        racy_after_ns = time.time_ns() - RACY_WINDOW_NS
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="DirectoryScanner") as pool:
+            futures = {pool.submit(self._scan_directory, os.path.abspath(root_dir), root_store, incremental)}
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory, store, child_store, files, subdirs, snapshot, previous = future.result()
+                    for subdir in subdirs:
+                        futures.add(pool.submit(self._scan_directory, subdir, child_store, incremental))
+
+                    if snapshot is None:
+                        if previous:
+                            stats.dirs_skipped += 1
+                            stats.files_seen += previous.entry_count - len(previous.subdirs)
+                        continue
+
+                    stats.dirs_scanned += 1
+                    stats.files_seen += len(files)
+                    relative_dir = store.relative_path(directory)
+                    if snapshot.mtime_ns < racy_after_ns and snapshot != previous:
+                        snapshots.setdefault(store, {})[relative_dir] = snapshot
+                    if previous and set(previous.subdirs) - set(snapshot.subdirs):
+                        store.remove_snapshots(os.path.join(relative_dir, name)
+                                               for name in set(previous.subdirs) - set(snapshot.subdirs))
+
+                    batch = pending.setdefault(child_store, {})
+                    batch_size = len(batch)
+                    for path, size, mtime_ns in files:
+                        relative_path = child_store.relative_path(path)
+                        fingerprint = child_store.fingerprint(relative_path)
+                        if fingerprint is None:
+                            stats.new_files += 1
+                        elif (fingerprint.size, fingerprint.mtime_ns) == (size, mtime_ns):
+                            continue
+                        batch[relative_path] = (size, mtime_ns)
+                    if len(batch) > batch_size:
+                        stats.dirs_changed += 1
+                    if len(batch) >= self.batch_size:
+                        child_store.update_stats(batch)
+                        batch.clear()
+
+                now = time.monotonic()
+                if self.progress_callback and now - last_progress >= self.progress_interval:
+                    last_progress = now
+                    self.progress_callback(stats)
+
+        for store, batch in pending.items():
+            store.update_stats(batch)
+        for store, store_snapshots in snapshots.items():
+            store.save_snapshots(store_snapshots)
+
+        if self.progress_callback:
+            self.progress_callback(stats)
+        return stats
+
+    def _scan_directory(self, directory, store, incremental):
+        """List one directory, or reuse its snapshot if the directory is unchanged.
+
+        The snapshot is kept in the store the directory was reached through;
+        child_store is the store that owns the directory's entries.
+        """
+        try:
+            st = os.stat(directory)
+        except OSError as e:
+            print(f"Could not scan {directory}: {e}")
+            return directory, store, store, [], [], None, None
+
+        previous = store.get_snapshot(store.relative_path(directory))
+        if incremental and previous and previous.mtime_ns == st.st_mtime_ns and previous.inode == st.st_ino:
+            child_store = TrackerStore.open(directory) if previous.owns_store else store
+            subdirs = [os.path.join(directory, name) for name in previous.subdirs]
+            return directory, store, child_store, [], subdirs, None, previous
+
+        child_store = store
+        owns_store = False
+        entry_count = 0
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name == TrackerStore.db_file_name and entry.is_file():
+                        # A directory with its own store owns its subtree.
+                        child_store = TrackerStore.open(directory)
+                        owns_store = True
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self.is_ignored(entry.path, True):
+                            subdirs.append(entry.path)
+                            entry_count += 1
+                    elif entry.is_file() and not self.is_ignored(entry.path, False):
+                        try:
+                            file_st = entry.stat()
+                        except OSError:
+                            continue
+                        files.append((entry.path, file_st.st_size, file_st.st_mtime_ns))
+                        entry_count += 1
+        except OSError as e:
+            print(f"Could not scan {directory}: {e}")
+
+        snapshot = DirSnapshot(st.st_mtime_ns, st.st_ino, entry_count, owns_store,
+                               tuple(os.path.basename(d) for d in subdirs))
+        return directory, store, child_store, files, subdirs, snapshot, previous
@@ -0,0 +1,81 @@
+import time
+import queue
+import threading
+
+
+class CoalescingEventQueue:
+    """Bounded queue that collects file events and flushes them in debounced batches.
+
+    Paths that arrive within one debounce window are deduplicated and handed to
+    flush_callback as a single list, so a burst of events costs one write.
+    after_flush, if given, receives (batch_size, queue_depth, latency_ms) once
+    the batch has been written.
+    """
+
+    _STOP = object()
+
+    def __init__(self, flush_callback, debounce_ms=500, max_queue_size=10000, after_flush=None):
+        self.flush_callback = flush_callback
+        self.after_flush = after_flush
+        self.debounce_seconds = debounce_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+
+        self.events_received = 0
+        self.batches_flushed = 0
+        self.last_batch_size = 0
+        self.last_flush_latency_ms = 0.0
+
+        self._worker = threading.Thread(target=self._run, name="CoalescingEventQueue", daemon=True)
+        self._worker.start()
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def put(self, path):
+        # Blocks the producer when the queue is full instead of dropping events.
+        self._queue.put(path)
+        self.events_received += 1
+
+    def stop(self):
+        self._queue.put(CoalescingEventQueue._STOP)
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is CoalescingEventQueue._STOP:
+                return
+
+            first_event_time = time.monotonic()
+            deadline = first_event_time + self.debounce_seconds
+            batch = {item: None}
+            stopping = False
+
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is CoalescingEventQueue._STOP:
+                    stopping = True
+                    break
+                batch[item] = None
+
+            self._flush(list(batch), first_event_time)
+            if stopping:
+                return
+
+    def _flush(self, paths, first_event_time):
+        try:
+            self.flush_callback(paths)
+        except Exception as e:
+            print(f"Error flushing {len(paths)} file event(s): {e}")
+        self.batches_flushed += 1
+        self.last_batch_size = len(paths)
+        self.last_flush_latency_ms = (time.monotonic() - first_event_time) * 1000.0
+        if self.after_flush:
+            self.after_flush(self.last_batch_size, self.depth, self.last_flush_latency_ms)
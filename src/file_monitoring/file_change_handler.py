@@ -1,24 +1,79 @@
+import os
 from watchdog.events import FileSystemEventHandler
 from file_monitoring.file_tracker import FileTracker
-import os
+from file_monitoring.event_queue import CoalescingEventQueue
+from file_monitoring.ignore_matcher import IgnoreMatcher
 
 class FileChangeHandler(FileSystemEventHandler):
-    def __init__(self, project_name):
+    def __init__(self, project_name, debounce_ms=500, max_queue_size=10000, on_flush=None, on_change=None,
+                 on_paths=None):
         self.project_name = project_name
-        self.tracker_file = os.path.join(project_name, "file_tracker.json")
+        # on_change(project_name) runs after a flush, move or delete that changed tracked files;
+        # on_paths(paths) receives every flushed batch and moved or deleted path, ignored files included
+        self.on_change = on_change
+        self.on_paths = on_paths
+        self.event_queue = CoalescingEventQueue(self.flush_events, debounce_ms, max_queue_size, after_flush=on_flush)
 
     def on_modified(self, event):
         if not event.is_directory:
-            if event.src_path == self.tracker_file:
-                # Ignore modifications to the tracker file itself
-                return
-            print(f"File modified: {event.src_path}")
-            FileTracker.track_file(self.project_name, event.src_path)
+            self.queue_event(event.src_path)
 
     def on_created(self, event):
         if not event.is_directory:
-            if event.src_path == self.tracker_file:
-                # Ignore creations of the tracker file itself
-                return
-            print(f"File created: {event.src_path}")
-            FileTracker.track_file(self.project_name, event.src_path)
+            self.queue_event(event.src_path)
+
+    def on_moved(self, event):
+        self.apply_move(event.src_path, event.dest_path)
+
+    def on_deleted(self, event):
+        self.apply_delete(event.src_path)
+
+    def apply_move(self, src_path, dest_path):
+        """Move the tracker entries right away; a directory move is one prefix rewrite."""
+        if FileTracker.is_tracker_file(src_path) or FileTracker.is_tracker_file(dest_path):
+            return
+        self._invalidate_gitignore(src_path)
+        self._invalidate_gitignore(dest_path)
+        try:
+            changed = FileTracker.move_path(self.project_name, src_path, dest_path)
+        except Exception as e:
+            print(f"Error tracking move of {src_path} to {dest_path}: {e}")
+            return
+        self._report(changed, [src_path, dest_path])
+
+    def apply_delete(self, path):
+        if FileTracker.is_tracker_file(path):
+            return
+        self._invalidate_gitignore(path)
+        try:
+            changed = FileTracker.untrack_paths(self.project_name, [path]) > 0
+        except Exception as e:
+            print(f"Error untracking {path}: {e}")
+            return
+        self._report(changed, [path])
+
+    def _invalidate_gitignore(self, path):
+        if os.path.basename(path) == IgnoreMatcher.gitignore_file_name:
+            FileTracker.ignore_matcher.invalidate(os.path.dirname(path))
+
+    def _report(self, tracker_changed, paths):
+        if tracker_changed and self.on_change:
+            self.on_change(self.project_name)
+        if self.on_paths:
+            self.on_paths(paths)
+
+    def queue_event(self, path):
+        if FileTracker.is_tracker_file(path):
+            # Writes to the tracker store itself are suppressed by path
+            return
+        self._invalidate_gitignore(path)
+        self.event_queue.put(path)
+
+    def flush_events(self, paths):
+        if FileTracker.track_files(self.project_name, paths) and self.on_change:
+            self.on_change(self.project_name)
+        if self.on_paths:
+            self.on_paths(paths)
+
+    def stop(self):
+        self.event_queue.stop()
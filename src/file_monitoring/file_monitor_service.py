@@ -0,0 +1,250 @@
+import os
+import json
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+from file_monitoring.file_change_handler import FileChangeHandler
+from file_monitoring.file_tracker import FileTracker
+from file_monitoring.hybrid_watcher import HybridWatcher
+
+
+class ProjectDiscoveryHandler(FileSystemEventHandler):
+    """Re-syncs the watch set when a directory appears or disappears at project level."""
+
+    def __init__(self, service):
+        self.service = service
+
+    def on_created(self, event):
+        if event.is_directory:
+            self.service.request_sync()
+
+    def on_deleted(self, event):
+        self.service.request_sync()
+
+    def on_moved(self, event):
+        self.service.request_sync()
+
+
+class FileMonitorService(QObject):
+    """Monitors every project under the projects root with a single watchdog Observer.
+
+    Projects are the directories <root>/<type>/<name>, as created by the app.
+    Each project gets a recursive watch with its own FileChangeHandler; the root
+    and the type directories get non-recursive watches, so projects created,
+    moved or deleted outside the app are picked up as well. The watched
+    projects are saved to watch_set_path and watched again on the next start,
+    before the root has been listed. Signals are emitted from watchdog's threads
+    and reach slots on the GUI thread as queued calls.
+
+    On Linux, projects are watched by a HybridWatcher instead of recursive
+    watchdog schedules, which would put an inotify watch on every directory,
+    ignored ones included, and fail once max_user_watches is used up.
+    """
+    # batch size, queue depth, flush latency in milliseconds
+    events_flushed = pyqtSignal(int, int, float)
+    project_changed = pyqtSignal(str)
+    paths_changed = pyqtSignal(list)
+    # watched project count
+    watches_changed = pyqtSignal(int)
+
+    state_dir = os.path.join(os.path.expanduser("~"), ".project_manager")
+
+    def __init__(self, debounce_ms=500, max_queue_size=10000, watch_set_path=None, max_watches=0,
+                 poll_seconds=30, cold_seconds=600):
+        super().__init__()
+        self.debounce_ms = debounce_ms
+        self.max_queue_size = max_queue_size
+        self.watch_set_path = watch_set_path or os.path.join(FileMonitorService.state_dir, "watched_projects.json")
+        self.root_dir = None
+
+        # project dir -> (ObservedWatch, FileChangeHandler)
+        self._projects = {}
+        # root and type dir -> ObservedWatch
+        self._discovery_watches = {}
+        self._discovery_handler = ProjectDiscoveryHandler(self)
+        self._lock = threading.RLock()
+        # Separate from _lock: watchdog dispatches events while holding its own lock,
+        # and sync() takes watchdog's lock while holding _lock.
+        self._timer_lock = threading.Lock()
+        self._sync_timer = None
+        self._stopped = False
+        self._saved_projects = []
+        self._observer = Observer()
+        self._observer.start()
+        self._hybrid = None
+        if HybridWatcher.is_supported():
+            self._hybrid = HybridWatcher(FileTracker.is_ignored, max_watches, poll_seconds, cold_seconds)
+
+    def watched_projects(self):
+        with self._lock:
+            return sorted(self._projects)
+
+    def status_lines(self):
+        """Describe, per project, how many directories are watched live and which subtrees are polled."""
+        if not self._hybrid:
+            return [f"{project_dir}: recursive watch" for project_dir in self.watched_projects()]
+        lines = [f"{self._hybrid.watches_in_use} of {self._hybrid.max_watches} inotify watches in use, "
+                 f"polling every {self._hybrid.poll_seconds} s"]
+        for status in self._hybrid.status():
+            lines.append(f"{status.project_dir}: {status.live_dirs} directories live, {status.polled_dirs} polled")
+            lines.extend(f"    polled: {root}" for root in status.polled_roots)
+        return lines
+
+    def start(self, root_dir):
+        """Watch the saved projects first, then every project found under root_dir, off the calling thread."""
+        with self._lock:
+            self.root_dir = os.path.normpath(root_dir)
+            for project_dir in [p for p in self._projects if not self._is_under_root(p)]:
+                self._remove_watch(project_dir)
+            for directory in list(self._discovery_watches):
+                self._unschedule(self._discovery_watches.pop(directory))
+            self._saved_projects = [p for p in self._load_watch_set() if self._is_under_root(p)]
+        self.request_sync(delay=0)
+
+    def add_project(self, project_dir):
+        with self._lock:
+            if self._add_watch(os.path.normpath(project_dir)):
+                self._save_watch_set()
+                self.watches_changed.emit(len(self._projects))
+
+    def remove_project(self, project_dir):
+        with self._lock:
+            if self._remove_watch(os.path.normpath(project_dir)):
+                self._save_watch_set()
+                self.watches_changed.emit(len(self._projects))
+
+    def request_sync(self, delay=1.0):
+        """Sync the watch set once directory events have settled for delay seconds."""
+        with self._timer_lock:
+            if self._stopped:
+                return
+            if self._sync_timer:
+                self._sync_timer.cancel()
+            self._sync_timer = threading.Timer(delay, self.sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def sync(self):
+        """Add watches for new projects under the root and remove those of projects that are gone."""
+        with self._lock:
+            if self._stopped or not self.root_dir:
+                return
+            for project_dir in self._saved_projects:
+                if os.path.isdir(project_dir):
+                    self._add_watch(project_dir)
+            self._saved_projects = []
+            type_dirs = self.discover_type_dirs(self.root_dir)
+            projects = set()
+            for type_dir in type_dirs:
+                projects.update(self.discover_projects(type_dir))
+
+            for directory in set(self._discovery_watches) - {self.root_dir} - set(type_dirs):
+                self._unschedule(self._discovery_watches.pop(directory))
+            for directory in [self.root_dir] + type_dirs:
+                if directory not in self._discovery_watches and os.path.isdir(directory):
+                    self._discovery_watches[directory] = self._observer.schedule(
+                        self._discovery_handler, directory, recursive=False)
+
+            changed = False
+            for project_dir in list(self._projects):
+                if project_dir not in projects and not os.path.isdir(project_dir):
+                    changed |= self._remove_watch(project_dir)
+            for project_dir in sorted(projects):
+                changed |= self._add_watch(project_dir)
+            if changed:
+                self._save_watch_set()
+            print(f"Monitoring {len(self._projects)} project(s) under {self.root_dir}")
+            self.watches_changed.emit(len(self._projects))
+
+    def stop(self):
+        """Stop the observer, then flush every project's pending events."""
+        with self._timer_lock:
+            self._stopped = True
+            if self._sync_timer:
+                self._sync_timer.cancel()
+        with self._lock:
+            handlers = [handler for _, handler in self._projects.values()]
+            self._projects.clear()
+            self._discovery_watches.clear()
+        self._observer.stop()
+        self._observer.join()
+        if self._hybrid:
+            self._hybrid.stop()
+        for handler in handlers:
+            handler.stop()
+
+    @staticmethod
+    def discover_type_dirs(root_dir):
+        return FileMonitorService._subdirectories(root_dir)
+
+    @staticmethod
+    def discover_projects(type_dir):
+        return FileMonitorService._subdirectories(type_dir)
+
+    @staticmethod
+    def _subdirectories(directory):
+        try:
+            with os.scandir(directory) as entries:
+                return sorted(os.path.normpath(entry.path) for entry in entries
+                              if entry.is_dir(follow_symlinks=False) and not FileTracker.is_ignored(entry.path, True))
+        except OSError:
+            return []
+
+    def _add_watch(self, project_dir):
+        if project_dir in self._projects or self._stopped:
+            return False
+        handler = FileChangeHandler(project_dir, self.debounce_ms, self.max_queue_size,
+                                    on_flush=self.events_flushed.emit,
+                                    on_change=self.project_changed.emit,
+                                    on_paths=self.paths_changed.emit)
+        try:
+            if self._hybrid:
+                self._hybrid.add_tree(project_dir, handler)
+                watch = None
+            else:
+                watch = self._observer.schedule(handler, project_dir, recursive=True)
+        except OSError as e:
+            print(f"Cannot monitor {project_dir}: {e}")
+            handler.stop()
+            return False
+        self._projects[project_dir] = (watch, handler)
+        return True
+
+    def _remove_watch(self, project_dir):
+        entry = self._projects.pop(project_dir, None)
+        if entry is None:
+            return False
+        watch, handler = entry
+        if watch is None:
+            self._hybrid.remove_tree(project_dir)
+        else:
+            self._unschedule(watch)
+        handler.stop()
+        return True
+
+    def _unschedule(self, watch):
+        try:
+            self._observer.unschedule(watch)
+        except KeyError:
+            # The emitter already went away with the deleted directory
+            pass
+
+    def _is_under_root(self, path):
+        return path.startswith(self.root_dir.rstrip(os.sep) + os.sep)
+
+    def _load_watch_set(self):
+        try:
+            with open(self.watch_set_path, 'r', encoding='utf-8') as f:
+                return [os.path.normpath(p) for p in json.load(f).get("projects", [])]
+        except (OSError, ValueError) as e:
+            if os.path.exists(self.watch_set_path):
+                print(f"Ignoring unreadable watch set {self.watch_set_path}: {e}")
+            return []
+
+    def _save_watch_set(self):
+        os.makedirs(os.path.dirname(self.watch_set_path), exist_ok=True)
+        temp_path = self.watch_set_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"root": self.root_dir, "projects": sorted(self._projects)}, f, indent=2)
+        os.replace(temp_path, self.watch_set_path)
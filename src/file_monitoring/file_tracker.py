@@ -1,88 +1,166 @@
 import os
-import json
-import fnmatch
+from file_monitoring.tracker_store import TrackerStore
+from file_monitoring.ignore_matcher import IgnoreMatcher
+from file_monitoring.directory_scanner import DirectoryScanner
+from file_monitoring.fingerprinter import Fingerprinter
 
 class FileTracker:
-    ignore_next_update = False
     tracker_file_name = "file_tracker.json"
 
     # Patterns for files and directories to be ignored
     ignored_patterns = [
         '*.pyc', '*.pyo', '*.pyd', '__pycache__', '.git', '.venv', 'node_modules', '.DS_Store',
         '*.log', '*.tmp', '*.swp', '*.bak', '*.old', '*.pid', '.idea', '*.iml', '.vscode',
+        'file_tracker.db*',
+        # Backups older versions kept inside a project; only at the project root
+        '/.snapshots/', '/backups/', '/working_versions/',
     ]
+    ignore_matcher = IgnoreMatcher(ignored_patterns, root_marker=TrackerStore.db_file_name)
 
     @staticmethod
     def track_file(project_name, file_path):
-        if FileTracker.ignore_next_update:
-            FileTracker.ignore_next_update = False
-            return
+        FileTracker.track_files(project_name, [file_path])
 
-        if FileTracker._matches_any_pattern(file_path):
+    @staticmethod
+    def track_files(project_name, file_paths):
+        """Track a batch of files of a project with a single store write.
+
+        Size and mtime are recorded for each file and files whose size or mtime
+        changed are queued for hashing. Returns those files' relative paths.
+        """
+        file_paths = [p for p in file_paths if not FileTracker.is_ignored(p, is_dir=False)]
+        if not file_paths:
             # Skip tracking for ignored files or directories
-            return
+            return []
+
+        store = FileTracker._store_for(project_name)
+        stats = {}
+        for file_path in file_paths:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                # The file is already gone again, e.g. an editor's temporary file
+                continue
+            stats[store.relative_path(file_path)] = (st.st_size, st.st_mtime_ns)
+
+        changed = store.update_stats(stats)
+        if changed:
+            Fingerprinter.instance().submit(store, changed)
+        return changed
 
-        tracker_file = os.path.join(project_name, FileTracker.tracker_file_name)
-        tracked_files = []
+    @staticmethod
+    def untrack_paths(project_name, paths):
+        """Untrack deleted files and directories without a rescan; returns the number of files untracked."""
+        store = TrackerStore.find(project_name)
+        if store is None:
+            return 0
+        relative_paths = [store.relative_path(p) for p in paths]
+        store.remove_snapshots(relative_paths)
+        return store.remove(relative_paths)
+
+    @staticmethod
+    def move_path(project_name, src_path, dest_path):
+        """Follow a rename or move of a file or directory in the tracker.
 
-        if os.path.exists(tracker_file):
-            with open(tracker_file, 'r') as f:
-                try:
-                    tracked_files = json.load(f)
-                except json.JSONDecodeError:
-                    # If JSON is invalid, recreate the file
-                    print(f"Invalid JSON detected in {tracker_file}. Recreating the file.")
-                    tracked_files = []
+        Tracked entries are moved with their fingerprints. A move to an ignored
+        path untracks them; a move from an untracked or ignored path, such as an
+        editor's temporary file, tracks the files at dest_path. Returns whether
+        the tracker changed.
+        """
+        if FileTracker.is_ignored(dest_path):
+            return FileTracker.untrack_paths(project_name, [src_path]) > 0
 
-        relative_path = os.path.relpath(file_path, project_name)
-        if relative_path not in tracked_files:
-            tracked_files.append(relative_path)
+        store = FileTracker._store_for(project_name)
+        src_relative = store.relative_path(src_path)
+        dest_relative = store.relative_path(dest_path)
+        store.remove_snapshots([src_relative, dest_relative])
+        if store.move(src_relative, dest_relative):
+            return True
 
-        FileTracker.ignore_next_update = True
-        with open(tracker_file, 'w') as f:
-            json.dump(tracked_files, f, indent=4)
+        if os.path.isdir(dest_path):
+            file_paths = []
+            for directory, dirs, files in os.walk(dest_path):
+                dirs[:] = [d for d in dirs if not FileTracker.is_ignored(os.path.join(directory, d), is_dir=True)]
+                file_paths.extend(os.path.join(directory, name) for name in files)
+        else:
+            file_paths = [dest_path]
+        return bool(FileTracker.track_files(project_name, file_paths))
+
+    @staticmethod
+    def get_fingerprints(directory, ensure_hashed=False, hash_here=False, throttle=None):
+        """Return {relative_path: Fingerprint} for all tracked files below directory.
+
+        With ensure_hashed set, every file is stat'ed first, files that no longer
+        exist are left out and out-of-date hashes are computed (blocking). They
+        are computed in the shared process pool, or with hash_here on the calling
+        thread, passing the size of every chunk read to throttle.
+        """
+        store = TrackerStore.find(directory)
+        if store is None:
+            return None
+        relative_dir = store.relative_path(directory)
+        fingerprints = store.fingerprints_under(relative_dir)
+        if not ensure_hashed:
+            return fingerprints
+
+        stats = {}
+        for relative_path in fingerprints:
+            try:
+                st = os.stat(os.path.join(directory, relative_path))
+            except OSError:
+                continue
+            stats[os.path.join(relative_dir, relative_path)] = (st.st_size, st.st_mtime_ns)
+        store.update_stats(stats)
+
+        fingerprints = {p: fp for p, fp in store.fingerprints_under(relative_dir).items()
+                        if os.path.join(relative_dir, p) in stats}
+        stale = [os.path.join(relative_dir, p) for p, fp in fingerprints.items() if not fp.hash_is_current]
+        if stale:
+            if hash_here:
+                Fingerprinter.instance().hash_here(store, stale, throttle)
+            else:
+                Fingerprinter.instance().hash_now(store, stale)
+            fingerprints = {p: fp for p, fp in store.fingerprints_under(relative_dir).items()
+                            if os.path.join(relative_dir, p) in stats}
+        return fingerprints
 
     @staticmethod
     def get_tracked_files(directory):
-        tracker_file = os.path.join(directory, FileTracker.tracker_file_name)
-        if os.path.exists(tracker_file):
-            with open(tracker_file, 'r') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    # If JSON is invalid and not an ignored directory, recreate the file
-                    if not FileTracker._matches_any_pattern(directory):
-                        print(f"Invalid JSON detected in {tracker_file}. Recreating the file.")
-                    return []
-        return None
+        """Return all tracked files below directory (including subdirectories), relative to it."""
+        store = TrackerStore.find(directory)
+        if store is None:
+            return None
+        return store.files_under(store.relative_path(directory))
 
     @staticmethod
-    def scan_and_track_untracked_files(project_root_dir):
-        for root, dirs, files in os.walk(project_root_dir):
-            # Filter out directories that match ignored patterns
-            dirs[:] = [d for d in dirs if not FileTracker._matches_any_pattern(d)]
-            # Generate or update the file_tracker.json for the current directory
-            if not FileTracker._matches_any_pattern(root):
-                FileTracker._generate_or_update_tracker(root, files)
+    def is_tracker_file(path):
+        return TrackerStore.is_store_file(path) or os.path.basename(path) == FileTracker.tracker_file_name
 
     @staticmethod
-    def _generate_or_update_tracker(directory, files):
-        tracker_file = os.path.join(directory, FileTracker.tracker_file_name)
-        tracked_files = FileTracker.get_tracked_files(directory) or []
+    def scan_and_track_untracked_files(project_root_dir, progress_callback=None, max_workers=None, incremental=True):
+        """Track every untracked file below project_root_dir and return the ScanStats.
 
-        for filename in files:
-            if not FileTracker._matches_any_pattern(filename):
-                relative_path = os.path.relpath(os.path.join(directory, filename), directory)
-                if relative_path not in tracked_files:
-                    tracked_files.append(relative_path)
+        With incremental set, directories unchanged since the last scan are skipped.
+        """
+        scanner = DirectoryScanner(FileTracker.is_ignored, max_workers=max_workers,
+                                   progress_callback=progress_callback)
+        return scanner.scan(project_root_dir, FileTracker._store_for(project_root_dir), incremental)
 
-        with open(tracker_file, 'w') as f:
-            json.dump(tracked_files, f, indent=4)
+    @staticmethod
+    def _store_for(project_name):
+        store = TrackerStore.find(project_name)
+        if store is None:
+            store = TrackerStore.open(project_name)
+            # Decisions cached before the directory became a project root may be out of date
+            FileTracker.ignore_matcher.invalidate(store.root_dir)
+        return store
+
+    @staticmethod
+    def is_ignored(path, is_dir=None):
+        """Check a path against the ignored patterns and the project's .gitignore files."""
+        return FileTracker.ignore_matcher.is_ignored(path, is_dir)
 
     @staticmethod
     def _matches_any_pattern(path):
         """Check if a file or directory matches any of the ignored patterns."""
-        for pattern in FileTracker.ignored_patterns:
-            if fnmatch.fnmatch(path, pattern) or any(fnmatch.fnmatch(part, pattern) for part in path.split(os.path.sep)):
-                return True
-        return False
+        return FileTracker.ignore_matcher.matches(path)
@@ -0,0 +1,129 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from file_monitoring.tracker_store import EMPTY_FINGERPRINT
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path, throttle=None):
+    """Return the BLAKE2b content hash of a file as hex; throttle, if given, is called with each chunk's size."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            if throttle:
+                throttle(len(chunk))
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_files(paths, throttle=None):
+    """Hash files in a worker process; returns (path, size, mtime_ns, hash) tuples.
+
+    Files that change while being read are left out and picked up on their next event.
+    """
+    results = []
+    for path in paths:
+        try:
+            before = os.stat(path)
+            digest = hash_file(path, throttle)
+            after = os.stat(path)
+        except OSError:
+            continue
+        if (before.st_size, before.st_mtime_ns) == (after.st_size, after.st_mtime_ns):
+            results.append((path, after.st_size, after.st_mtime_ns, digest))
+    return results
+
+
+class Fingerprinter:
+    """Computes content hashes for tracked files in a shared process pool.
+
+    Hashing runs off the GUI and watchdog threads; results are written back to
+    the tracker store from the pool's callback thread.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers=None, chunk_size=64):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.chunk_size = chunk_size
+        self.on_content_changed = None
+        self._pool = None
+        self._lock = threading.RLock()
+        # absolute path -> future of the chunk hashing it
+        self._in_flight = {}
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def submit(self, store, relative_paths):
+        """Queue files of a store for hashing; returns the futures covering them."""
+        with self._lock:
+            futures = set()
+            paths = []
+            for relative_path in relative_paths:
+                path = os.path.join(store.root_dir, relative_path)
+                if path in self._in_flight:
+                    futures.add(self._in_flight[path])
+                else:
+                    paths.append(path)
+            if not paths:
+                return futures
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+            for start in range(0, len(paths), self.chunk_size):
+                chunk = paths[start:start + self.chunk_size]
+                future = self._pool.submit(hash_files, chunk)
+                self._in_flight.update(dict.fromkeys(chunk, future))
+                future.add_done_callback(lambda f, chunk=chunk: self._store_results(store, chunk, f))
+                futures.add(future)
+            return futures
+
+    def hash_now(self, store, relative_paths):
+        """Hash the files whose stored hash is out of date and wait for the results."""
+        stale = [p for p in relative_paths if not (store.fingerprint(p) or EMPTY_FINGERPRINT).hash_is_current]
+        # Done callbacks may still be running when wait() returns, so store the results here as well.
+        for future in wait(self.submit(store, stale)).done:
+            if not future.cancelled() and future.exception() is None:
+                store.set_hashes(self._relative_results(store, future))
+
+    def hash_here(self, store, relative_paths, throttle=None):
+        """Like hash_now, but hash on the calling thread, e.g. a low-priority backup worker.
+
+        throttle, if given, is called with the size of every chunk read.
+        """
+        stale = [p for p in relative_paths if not (store.fingerprint(p) or EMPTY_FINGERPRINT).hash_is_current]
+        results = hash_files([os.path.join(store.root_dir, p) for p in stale], throttle)
+        content_changed = store.set_hashes([(store.relative_path(path), size, mtime_ns, digest)
+                                            for path, size, mtime_ns, digest in results])
+        if content_changed and self.on_content_changed:
+            self.on_content_changed(store.root_dir, content_changed)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def _store_results(self, store, chunk, future):
+        with self._lock:
+            for path in chunk:
+                if self._in_flight.get(path) is future:
+                    del self._in_flight[path]
+        if future.cancelled() or future.exception() is not None:
+            return
+        content_changed = store.set_hashes(self._relative_results(store, future))
+        if content_changed and self.on_content_changed:
+            self.on_content_changed(store.root_dir, content_changed)
+
+    @staticmethod
+    def _relative_results(store, future):
+        return [(store.relative_path(path), size, mtime_ns, digest)
+                for path, size, mtime_ns, digest in future.result()]
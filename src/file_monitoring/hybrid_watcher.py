@@ -0,0 +1,446 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from collections import namedtuple
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW)
+EVENT_HEADER = struct.Struct("iIII")
+
+# project_dir, number of live-watched directories, roots of the polled subtrees, number of polled directories
+TreeStatus = namedtuple('TreeStatus', 'project_dir live_dirs polled_roots polled_dirs')
+
+
+class Inotify:
+    """The inotify calls of libc, on one non-blocking descriptor."""
+
+    max_user_watches_path = "/proc/sys/fs/inotify/max_user_watches"
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    @staticmethod
+    def kernel_limit():
+        try:
+            with open(Inotify.max_user_watches_path, 'r') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return 8192
+
+    def add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        return wd
+
+    def remove_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """Return [(wd, mask, cookie, name)] for the events that are ready."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            events.append((wd, mask, cookie, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class HybridWatcher:
+    """Watches project trees with inotify within a watch budget, and polls the rest.
+
+    Ignored directories (.git, .venv, node_modules, .gitignore'd trees) get no
+    watch at all. The other directories get one inotify watch each, most
+    recently modified first, until max_watches are in use; the remaining, cold
+    directories are polled instead: every poll_seconds their entries are listed
+    and compared with the last listing by size and mtime. When the budget is
+    full, a directory that needs a watch takes the one of the live directory
+    that has been quiet longest, if that one has been quiet for cold_seconds.
+
+    Changed files are handed to the tree's handler through queue_event(path),
+    the same way watchdog events are. Renames within a tree go to
+    apply_move(src, dest) and deletions to apply_delete(path); a rename whose
+    two halves do not arrive together, and any change found by polling, is
+    reported as a deletion plus new files.
+    """
+
+    def __init__(self, is_ignored, max_watches=0, poll_seconds=30, cold_seconds=600):
+        self.is_ignored = is_ignored
+        # Leave half of the per-user limit to editors and other watchers
+        self.max_watches = max_watches or Inotify.kernel_limit() // 2
+        self.poll_seconds = poll_seconds
+        self.cold_seconds = cold_seconds
+
+        self._inotify = Inotify()
+        # project dir -> handler
+        self._trees = {}
+        self._wd_dirs = {}
+        self._dir_wds = {}
+        # polled dir -> {name: (is_dir, size, mtime_ns)}
+        self._polled = {}
+        # directory -> last change seen (monotonic seconds)
+        self._activity = {}
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        self._reader = threading.Thread(target=self._read_loop, name="HybridWatcherReader", daemon=True)
+        self._poller = threading.Thread(target=self._poll_loop, name="HybridWatcherPoller", daemon=True)
+        self._reader.start()
+        self._poller.start()
+
+    @staticmethod
+    def is_supported():
+        return sys.platform.startswith("linux")
+
+    @property
+    def watches_in_use(self):
+        return len(self._dir_wds)
+
+    def add_tree(self, project_dir, handler):
+        project_dir = os.path.normpath(project_dir)
+        with self._lock:
+            self._trees[project_dir] = handler
+        self._add_directories(self._walk(project_dir))
+
+    def remove_tree(self, project_dir):
+        project_dir = os.path.normpath(project_dir)
+        with self._lock:
+            self._trees.pop(project_dir, None)
+            self._forget(project_dir)
+
+    def status(self):
+        """Return a TreeStatus per watched project."""
+        with self._lock:
+            statuses = []
+            for project_dir in sorted(self._trees):
+                live = [d for d in self._dir_wds if self._project_of(d) == project_dir]
+                polled = [d for d in self._polled if self._project_of(d) == project_dir]
+                polled_set = set(polled)
+                roots = sorted(d for d in polled if os.path.dirname(d) not in polled_set)
+                statuses.append(TreeStatus(project_dir, len(live), roots, len(polled)))
+            return statuses
+
+    def stop(self):
+        self._stopped.set()
+        os.write(self._wakeup_write, b"\0")
+        self._reader.join()
+        self._poller.join()
+        self._inotify.close()
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+
+    def _walk(self, directory):
+        """Return (path, mtime_ns) of directory and every directory below it that is not ignored."""
+        found = []
+        stack = [directory]
+        while stack:
+            path = stack.pop()
+            try:
+                found.append((path, os.stat(path).st_mtime_ns))
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False) and not self.is_ignored(entry.path, True):
+                            stack.append(os.path.normpath(entry.path))
+            except OSError:
+                continue
+        return found
+
+    def _add_directories(self, directories):
+        # Recently modified directories are the likeliest to change again, so they are watched first.
+        now = time.monotonic()
+        wall_now_ns = time.time_ns()
+        with self._lock:
+            for path, mtime_ns in sorted(directories, key=lambda d: d[1], reverse=True):
+                if path in self._dir_wds or path in self._polled or self._project_of(path) is None:
+                    continue
+                self._activity[path] = now - max(0, wall_now_ns - mtime_ns) / 1e9
+                if not self._watch(path):
+                    self._polled[path] = self._list(path) or {}
+
+    def _watch(self, path):
+        """Give path a live watch if the budget allows; returns whether it has one."""
+        if self.watches_in_use >= self.max_watches and not self._demote_colder_than(self._activity[path]):
+            return False
+        try:
+            wd = self._inotify.add_watch(path)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                # Other programs use up the per-user limit; stay below what we have now.
+                print(f"inotify watch limit reached at {self.watches_in_use} watches; polling the rest")
+                self.max_watches = self.watches_in_use
+            return False
+        self._wd_dirs[wd] = path
+        self._dir_wds[path] = wd
+        return True
+
+    def _demote_colder_than(self, activity):
+        """Move the quietest live directory to polling if it has been quiet for cold_seconds and longer than activity."""
+        if not self._dir_wds:
+            return False
+        coldest = min(self._dir_wds, key=lambda d: self._activity.get(d, 0))
+        last_change = self._activity.get(coldest, 0)
+        if last_change >= activity or time.monotonic() - last_change < self.cold_seconds:
+            return False
+        # List it before the watch goes, so nothing changes unseen in between
+        self._polled[coldest] = self._list(coldest) or {}
+        self._unwatch(coldest)
+        return True
+
+    def _unwatch(self, path):
+        wd = self._dir_wds.pop(path, None)
+        if wd is not None:
+            del self._wd_dirs[wd]
+            self._inotify.remove_watch(wd)
+
+    def _forget(self, directory):
+        prefix = directory + os.sep
+        for path in [p for p in self._dir_wds if p == directory or p.startswith(prefix)]:
+            self._unwatch(path)
+        for path in [p for p in self._polled if p == directory or p.startswith(prefix)]:
+            del self._polled[path]
+        for path in [p for p in self._activity if p == directory or p.startswith(prefix)]:
+            del self._activity[path]
+
+    def _take_polled(self, directory):
+        """Stop polling directory and everything below it; returns their listings by relative path."""
+        prefix = directory + os.sep
+        return {os.path.relpath(path, directory): self._polled.pop(path)
+                for path in [p for p in self._polled if p == directory or p.startswith(prefix)]}
+
+    def _diff_listing(self, directory, previous, listing):
+        """Return (changed files, deleted paths, new subdirectories) of directory between two listings."""
+        changed = []
+        new_dirs = []
+        for name, entry in listing.items():
+            if entry == previous.get(name):
+                continue
+            path = os.path.join(directory, name)
+            if not entry[0]:
+                changed.append(path)
+            elif name not in previous and not self.is_ignored(path, True):
+                new_dirs.append(path)
+        deletes = [os.path.join(directory, name) for name in previous.keys() - listing.keys()]
+        return changed, deletes, new_dirs
+
+    def _diff_moved(self, dest, listings):
+        """Compare listings taken from a polled subtree before it moved with what is now at dest.
+
+        Changes made there since the last poll would be lost otherwise, as the
+        moved subtree is listed afresh at its new place. Returns (changed files,
+        deleted paths), both under dest.
+        """
+        changed = []
+        deletes = []
+        for relative, previous in listings.items():
+            directory = os.path.normpath(os.path.join(dest, relative))
+            listing = self._list(directory)
+            if listing is None:
+                deletes.append(directory)
+                continue
+            dir_changed, dir_deletes, new_dirs = self._diff_listing(directory, previous, listing)
+            changed.extend(dir_changed)
+            deletes.extend(dir_deletes)
+            for new_dir in new_dirs:
+                changed.extend(self._files_below(self._walk(new_dir)))
+        return changed, deletes
+
+    def _project_of(self, path):
+        while True:
+            if path in self._trees:
+                return path
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+    def _handler_of(self, path):
+        with self._lock:
+            return self._trees.get(self._project_of(path))
+
+    def _dispatch(self, changed=(), moves=(), deletes=()):
+        for src, dest in moves:
+            handler = self._handler_of(src)
+            if handler is not None and handler is self._handler_of(dest):
+                handler.apply_move(src, dest)
+            else:
+                # Moved between projects: each tracker sees its own half
+                deletes = list(deletes) + [src]
+                changed = list(changed) + ([dest] if os.path.isfile(dest) else self._files_below(self._walk(dest)))
+        for path in deletes:
+            handler = self._handler_of(path)
+            if handler is not None:
+                handler.apply_delete(path)
+        for path in dict.fromkeys(changed):
+            handler = self._handler_of(path)
+            if handler is not None:
+                handler.queue_event(path)
+
+    def _files_below(self, directories):
+        files = []
+        for directory, _ in directories:
+            try:
+                with os.scandir(directory) as entries:
+                    files.extend(os.path.normpath(e.path) for e in entries if not e.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+        return files
+
+    def _read_loop(self):
+        while not self._stopped.is_set():
+            ready, _, _ = select.select([self._inotify.fd, self._wakeup_read], [], [])
+            if self._wakeup_read in ready:
+                return
+            changed = []
+            new_dirs = []
+            moves = []
+            deletes = []
+            # cookie -> (path, polled listings below it) of a rename whose IN_MOVED_TO has not been read yet
+            moved_from = {}
+            # (dest, polled listings) of moved directories
+            moved_listings = []
+            now = time.monotonic()
+            with self._lock:
+                for wd, mask, cookie, name in self._inotify.read_events():
+                    if mask & IN_Q_OVERFLOW:
+                        print("inotify event queue overflowed; some changes were missed until the next scan")
+                        continue
+                    directory = self._wd_dirs.get(wd)
+                    if directory is None:
+                        continue
+                    if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                        self._forget(directory)
+                        continue
+                    self._activity[directory] = now
+                    path = os.path.join(directory, name)
+                    is_dir = bool(mask & IN_ISDIR)
+                    if mask & IN_MOVED_FROM:
+                        moved_from[cookie] = (path, self._take_polled(path) if is_dir else {})
+                        if is_dir:
+                            self._forget(path)
+                    elif mask & IN_MOVED_TO and cookie in moved_from:
+                        src, listings = moved_from.pop(cookie)
+                        moves.append((src, path))
+                        if listings:
+                            moved_listings.append((path, listings))
+                        if is_dir and not self.is_ignored(path, True):
+                            new_dirs.append(path)
+                    elif mask & IN_DELETE:
+                        deletes.append(path)
+                        if is_dir:
+                            self._forget(path)
+                    elif is_dir:
+                        if mask & (IN_CREATE | IN_MOVED_TO) and not self.is_ignored(path, True):
+                            new_dirs.append(path)
+                    elif mask & (IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO):
+                        changed.append(path)
+            # Moved out of every watched directory
+            deletes.extend(path for path, _ in moved_from.values())
+            # Before the moved directories are listed afresh below
+            for dest, listings in moved_listings:
+                moved_changed, moved_deletes = self._diff_moved(dest, listings)
+                changed.extend(moved_changed)
+                deletes.extend(moved_deletes)
+            moved_dirs = {dest for _, dest in moves}
+            for directory in new_dirs:
+                found = self._walk(directory)
+                self._add_directories(found)
+                if directory not in moved_dirs:
+                    # Files written before the new directory's watch was in place are picked up by listing it.
+                    changed.extend(self._files_below(found))
+            if changed or moves or deletes:
+                self._dispatch(changed, moves, deletes)
+
+    def _poll_loop(self):
+        while not self._stopped.wait(self.poll_seconds):
+            self._poll()
+
+    def _poll(self):
+        with self._lock:
+            polled = list(self._polled)
+        changed = []
+        deletes = []
+        for directory in polled:
+            listing = self._list(directory)
+            with self._lock:
+                previous = self._polled.get(directory)
+                if previous is None:
+                    # Promoted or forgotten meanwhile
+                    continue
+                if listing is None:
+                    self._forget(directory)
+                    continue
+                self._polled[directory] = listing
+            if listing == previous:
+                continue
+            dir_changed, dir_deletes, new_dirs = self._diff_listing(directory, previous, listing)
+            changed.extend(dir_changed)
+            deletes.extend(dir_deletes)
+            with self._lock:
+                for name in previous.keys() - listing.keys():
+                    if previous[name][0]:
+                        self._forget(os.path.join(directory, name))
+                self._activity[directory] = time.monotonic()
+                # A polled directory that changed is watched again, in place of a colder one if need be
+                if self._watch(directory):
+                    del self._polled[directory]
+            for path in new_dirs:
+                found = self._walk(path)
+                self._add_directories(found)
+                changed.extend(self._files_below(found))
+        if changed or deletes:
+            self._dispatch(changed, deletes=deletes)
+
+    @staticmethod
+    def _list(directory):
+        """Return {name: (is_dir, size, mtime_ns)}, or None if directory cannot be listed."""
+        listing = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            listing[entry.name] = (True, 0, 0)
+                        else:
+                            st = entry.stat(follow_symlinks=False)
+                            listing[entry.name] = (False, st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return listing
@@ -0,0 +1,215 @@
+import os
+import re
+import fnmatch
+import threading
+
+_GLOB_CHARS = set('*?[')
+_REGEX_FLAGS = re.IGNORECASE if os.name == 'nt' else 0
+
+
+class GitIgnoreRules:
+    """Rules parsed from one .gitignore file, matched relative to its directory."""
+
+    def __init__(self, base_dir, lines):
+        self.base_dir = base_dir
+        self.rules = []
+        for line in lines:
+            rule = GitIgnoreRules._parse_line(line)
+            if rule:
+                self.rules.append(rule)
+
+    @classmethod
+    def from_file(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(os.path.dirname(path), f.read().splitlines())
+        except OSError:
+            return None
+
+    def match(self, path, is_dir):
+        """Return True/False for the last rule matching path, or None if no rule matches."""
+        relative_path = os.path.relpath(path, self.base_dir).replace(os.sep, '/')
+        name = relative_path.rsplit('/', 1)[-1]
+        result = None
+        for regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative_path if anchored else name):
+                result = not negate
+        return result
+
+    @staticmethod
+    def _parse_line(line):
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+
+        anchored = '/' in line
+        line = line.lstrip('/')
+        regex = re.compile(GitIgnoreRules._translate(line) + r'\Z', _REGEX_FLAGS)
+        return regex, negate, dir_only, anchored
+
+    @staticmethod
+    def _translate(pattern):
+        """Translate a gitignore glob into a regex where wildcards never cross '/'."""
+        i, n = 0, len(pattern)
+        parts = []
+        while i < n:
+            c = pattern[i]
+            if pattern.startswith('**/', i):
+                parts.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+                continue
+            if c == '*':
+                parts.append('[^/]*')
+            elif c == '?':
+                parts.append('[^/]')
+            elif c == '[':
+                end = pattern.find(']', i + 2)
+                if end == -1:
+                    parts.append(re.escape(c))
+                else:
+                    content = pattern[i + 1:end]
+                    if content.startswith('!'):
+                        content = '^' + content[1:]
+                    parts.append('[' + content.replace('\\', '\\\\') + ']')
+                    i = end
+            elif c == '\\' and i + 1 < n:
+                parts.append(re.escape(pattern[i + 1]))
+                i += 1
+            else:
+                parts.append(re.escape(c))
+            i += 1
+        return ''.join(parts)
+
+
+class IgnoreMatcher:
+    """Compiled form of the tracker's ignore patterns plus per-project .gitignore files.
+
+    Literal names such as 'node_modules' are looked up in a set and the glob
+    patterns are folded into one regex. A pattern starting with '/', such as
+    '/backups/', is a literal name that only matches directly under a project
+    root, i.e. a directory holding a root_marker file; a trailing '/' limits it
+    to directories. Decisions are cached per directory, so anything under an
+    ignored ancestor is rejected without matching again.
+    """
+
+    gitignore_file_name = '.gitignore'
+
+    def __init__(self, patterns, use_gitignore=True, max_cached_dirs=100000, root_marker=None):
+        self.use_gitignore = use_gitignore
+        self.max_cached_dirs = max_cached_dirs
+        self.root_marker = root_marker
+        # name -> whether it only matches directories
+        self.root_names = {os.path.normcase(p.strip('/')): p.endswith('/') for p in patterns if p.startswith('/')}
+        patterns = [p for p in patterns if not p.startswith('/')]
+        self.literal_names = {os.path.normcase(p) for p in patterns if not _GLOB_CHARS.intersection(p)}
+        globs = [fnmatch.translate(os.path.normcase(p)) for p in patterns if _GLOB_CHARS.intersection(p)]
+        self.glob_regex = re.compile('|'.join(globs)) if globs else None
+
+        self._lock = threading.Lock()
+        # directory -> (ignored, stack of GitIgnoreRules that apply to its entries)
+        self._dir_cache = {}
+
+    def matches_name(self, name):
+        name = os.path.normcase(name)
+        if name in self.literal_names:
+            return True
+        return bool(self.glob_regex and self.glob_regex.match(name))
+
+    def matches(self, path):
+        """Check every component of path against the built-in patterns only, leaving out root patterns."""
+        return any(self.matches_name(part) for part in re.split(r'[\\/]', path) if part)
+
+    def is_ignored(self, path, is_dir=None):
+        """Check path against the built-in patterns and every applicable .gitignore."""
+        path = os.path.normpath(os.path.abspath(path))
+        ignored, rule_stack = self._directory_state(os.path.dirname(path))
+        if ignored:
+            return True
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        return self._decide(path, is_dir, rule_stack)
+
+    def invalidate(self, path=None):
+        """Forget cached decisions, e.g. after a .gitignore changed."""
+        with self._lock:
+            if path is None:
+                self._dir_cache.clear()
+                return
+            directory = os.path.normpath(os.path.abspath(path))
+            prefix = directory + os.sep
+            for cached in [d for d in self._dir_cache if d == directory or d.startswith(prefix)]:
+                del self._dir_cache[cached]
+
+    def _decide(self, path, is_dir, rule_stack):
+        if self.matches_name(os.path.basename(path)) or self._matches_root_name(path, is_dir):
+            return True
+        decision = None
+        for rules in rule_stack:
+            result = rules.match(path, is_dir)
+            if result is not None:
+                decision = result
+        return bool(decision)
+
+    def _matches_root_name(self, path, is_dir):
+        dir_only = self.root_names.get(os.path.normcase(os.path.basename(path)))
+        if dir_only is None or (dir_only and not is_dir) or not self.root_marker:
+            return False
+        return os.path.exists(os.path.join(os.path.dirname(path), self.root_marker))
+
+    def _directory_state(self, directory):
+        cached = self._dir_cache.get(directory)
+        if cached is not None:
+            return cached
+
+        # Resolve the nearest cached ancestor, then fill in the chain top-down.
+        chain = []
+        current = directory
+        while current not in self._dir_cache:
+            chain.append(current)
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+
+        state = self._dir_cache.get(current, (False, ()))
+
+        for current in reversed(chain):
+            state = self._child_state(current, state)
+            with self._lock:
+                if len(self._dir_cache) >= self.max_cached_dirs:
+                    self._dir_cache.clear()
+                self._dir_cache[current] = state
+        return state
+
+    def _child_state(self, directory, parent_state):
+        parent_ignored, rule_stack = parent_state
+        if parent_ignored:
+            return True, ()
+        if os.path.dirname(directory) != directory and self._decide(directory, True, rule_stack):
+            return True, ()
+        if not self.use_gitignore:
+            return False, ()
+
+        # A repository root starts a fresh rule stack, like git does.
+        if os.path.exists(os.path.join(directory, '.git')):
+            rule_stack = ()
+        gitignore = os.path.join(directory, IgnoreMatcher.gitignore_file_name)
+        if os.path.isfile(gitignore):
+            rules = GitIgnoreRules.from_file(gitignore)
+            if rules and rules.rules:
+                rule_stack = rule_stack + (rules,)
+        return False, rule_stack
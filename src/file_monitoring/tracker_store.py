@@ -0,0 +1,347 @@
+import os
+import json
+import sqlite3
+import threading
+from collections import namedtuple
+
+# Directory state recorded by the scanner so unchanged directories can be skipped.
+DirSnapshot = namedtuple('DirSnapshot', 'mtime_ns inode entry_count owns_store subdirs')
+
+
+class Fingerprint(namedtuple('Fingerprint', 'size mtime_ns hash hashed_mtime_ns')):
+    """Size, mtime and content hash of a tracked file.
+
+    The hash stays until the file is hashed again, so a stale hash can still be
+    compared against the new one to tell an edit from a touch.
+    """
+    __slots__ = ()
+
+    @property
+    def hash_is_current(self):
+        return self.hash is not None and self.hashed_mtime_ns == self.mtime_ns
+
+
+EMPTY_FINGERPRINT = Fingerprint(None, None, None, None)
+
+
+class TrackerStore:
+    """Project-wide index of tracked files, backed by SQLite in WAL mode.
+
+    One store covers a directory and everything below it. Membership checks are
+    answered from an in-memory set, and writes are grouped into one transaction
+    per batch instead of rewriting a whole JSON file per event.
+    """
+
+    db_file_name = "file_tracker.db"
+    legacy_file_name = "file_tracker.json"
+
+    _stores = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, root_dir):
+        self.root_dir = os.path.normpath(root_dir)
+        self.db_path = os.path.join(self.root_dir, TrackerStore.db_file_name)
+        self._lock = threading.RLock()
+
+        is_new = not os.path.exists(self.db_path)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS tracked_files (path TEXT PRIMARY KEY)")
+        self._add_missing_columns("tracked_files", {
+            "size": "INTEGER", "mtime_ns": "INTEGER", "hash": "TEXT", "hashed_mtime_ns": "INTEGER",
+        })
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dir_snapshots ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, inode INTEGER, entry_count INTEGER, "
+            "owns_store INTEGER, subdirs TEXT)"
+        )
+        self._conn.commit()
+
+        # path key -> Fingerprint
+        self._index = {
+            row[0]: Fingerprint(*row[1:])
+            for row in self._conn.execute("SELECT path, size, mtime_ns, hash, hashed_mtime_ns FROM tracked_files")
+        }
+        self._snapshots = None
+
+        if is_new:
+            self._import_legacy_tracker()
+
+    @classmethod
+    def open(cls, root_dir):
+        """Return the shared store rooted at root_dir, creating it if needed."""
+        root_dir = os.path.normpath(os.path.abspath(root_dir))
+        with cls._stores_lock:
+            store = cls._stores.get(root_dir)
+            if store is None:
+                store = cls(root_dir)
+                cls._stores[root_dir] = store
+            return store
+
+    @classmethod
+    def find(cls, path):
+        """Return the nearest store at or above path, or None if there is none."""
+        current = os.path.normpath(os.path.abspath(path))
+        if not os.path.isdir(current):
+            current = os.path.dirname(current)
+
+        while True:
+            if current in cls._stores or os.path.exists(os.path.join(current, cls.db_file_name)):
+                return cls.open(current)
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+
+    @classmethod
+    def close_all(cls):
+        with cls._stores_lock:
+            for store in cls._stores.values():
+                store.close()
+            cls._stores.clear()
+
+    @staticmethod
+    def is_store_file(path):
+        return os.path.basename(path).startswith(TrackerStore.db_file_name)
+
+    def __contains__(self, relative_path):
+        return self._to_key(relative_path) in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def relative_path(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root_dir)
+
+    def add_many(self, relative_paths):
+        """Add paths that are not tracked yet in a single transaction.
+
+        Returns the number of newly tracked paths.
+        """
+        with self._lock:
+            new_keys = {self._to_key(p) for p in relative_paths} - self._index.keys()
+            if not new_keys:
+                return 0
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tracked_files (path) VALUES (?)",
+                    ((key,) for key in new_keys),
+                )
+            self._index.update(dict.fromkeys(new_keys, EMPTY_FINGERPRINT))
+            return len(new_keys)
+
+    def update_stats(self, stats):
+        """Track files and record their size and mtime from a {relative_path: (size, mtime_ns)} mapping.
+
+        Returns the relative paths whose size or mtime changed, i.e. the ones that need hashing.
+        """
+        with self._lock:
+            changed = {}
+            for relative_path, (size, mtime_ns) in stats.items():
+                key = self._to_key(relative_path)
+                old = self._index.get(key)
+                if old is None or old.size != size or old.mtime_ns != mtime_ns:
+                    old = old or EMPTY_FINGERPRINT
+                    changed[key] = Fingerprint(size, mtime_ns, old.hash, old.hashed_mtime_ns)
+            if not changed:
+                return []
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO tracked_files (path, size, mtime_ns) VALUES (?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns",
+                    ((key, fp.size, fp.mtime_ns) for key, fp in changed.items()),
+                )
+            self._index.update(changed)
+            return [self._from_key(key) for key in changed]
+
+    def set_hashes(self, results):
+        """Store (relative_path, size, mtime_ns, hash) results from the fingerprinter.
+
+        Returns the relative paths whose content actually changed, leaving out
+        files that were only touched.
+        """
+        with self._lock:
+            updated = {}
+            content_changed = []
+            for relative_path, size, mtime_ns, digest in results:
+                key = self._to_key(relative_path)
+                old = self._index.get(key)
+                if old is None:
+                    continue
+                if old.hash != digest:
+                    content_changed.append(self._from_key(key))
+                updated[key] = Fingerprint(size, mtime_ns, digest, mtime_ns)
+            if updated:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE tracked_files SET size = ?, mtime_ns = ?, hash = ?, hashed_mtime_ns = ? WHERE path = ?",
+                        ((fp.size, fp.mtime_ns, fp.hash, fp.hashed_mtime_ns, key) for key, fp in updated.items()),
+                    )
+                self._index.update(updated)
+            return content_changed
+
+    def remove(self, relative_paths):
+        """Untrack the given paths and, for directories, everything below them.
+
+        Each path costs one indexed range delete. Returns the number of files untracked.
+        """
+        with self._lock:
+            removed = 0
+            with self._conn:
+                for key in map(self._to_key, relative_paths):
+                    keys = self._keys_at_or_under(key)
+                    if not keys:
+                        continue
+                    self._conn.execute(
+                        "DELETE FROM tracked_files WHERE path = ? OR (path >= ? AND path < ?)",
+                        (key, key + "/", key + "0"),
+                    )
+                    for removed_key in keys:
+                        self._index.pop(removed_key, None)
+                    removed += len(keys)
+            return removed
+
+    def move(self, old_relative_path, new_relative_path):
+        """Move a tracked file, or every tracked file below a directory, to a new path.
+
+        A directory move rewrites the whole prefix with a single UPDATE and keeps
+        the fingerprints, so nothing needs hashing again. Tracked files already at
+        the destination are replaced. Returns the number of files moved; 0 means
+        nothing was tracked at the old path and nothing was changed.
+        """
+        old_key = self._to_key(old_relative_path)
+        new_key = self._to_key(new_relative_path)
+        with self._lock:
+            keys = self._keys_at_or_under(old_key)
+            if not keys or old_key == new_key:
+                return 0
+            replaced = self._keys_at_or_under(new_key)
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM tracked_files WHERE path = ? OR (path >= ? AND path < ?)",
+                    (new_key, new_key + "/", new_key + "0"),
+                )
+                self._conn.execute(
+                    "UPDATE tracked_files SET path = ? || substr(path, ?) "
+                    "WHERE path = ? OR (path >= ? AND path < ?)",
+                    (new_key, len(old_key) + 1, old_key, old_key + "/", old_key + "0"),
+                )
+            for key in replaced:
+                self._index.pop(key, None)
+            for key in keys:
+                self._index[new_key + key[len(old_key):]] = self._index.pop(key)
+            return len(keys)
+
+    def fingerprint(self, relative_path):
+        return self._index.get(self._to_key(relative_path))
+
+    def files_under(self, relative_dir=""):
+        """Return every tracked file below relative_dir, relative to it."""
+        return [path for path, _ in self._rows_under(relative_dir, "path")]
+
+    def fingerprints_under(self, relative_dir=""):
+        """Return {relative_path: Fingerprint} for every tracked file below relative_dir."""
+        return {
+            path: Fingerprint(*values)
+            for path, values in self._rows_under(relative_dir, "path, size, mtime_ns, hash, hashed_mtime_ns")
+        }
+
+    def _rows_under(self, relative_dir, columns):
+        key = self._to_key(relative_dir)
+        with self._lock:
+            if key in ("", "."):
+                rows = self._conn.execute(f"SELECT {columns} FROM tracked_files ORDER BY path")
+                return [(self._from_key(row[0]), row[1:]) for row in rows]
+
+            prefix = key + "/"
+            # Every key under the prefix sorts between "dir/" and "dir0" ('0' follows '/').
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM tracked_files WHERE path >= ? AND path < ? ORDER BY path",
+                (prefix, key + "0"),
+            )
+            return [(self._from_key(row[0][len(prefix):]), row[1:]) for row in rows]
+
+    def _keys_at_or_under(self, key):
+        if key in self._index:
+            return [key]
+        rows = self._conn.execute(
+            "SELECT path FROM tracked_files WHERE path >= ? AND path < ?", (key + "/", key + "0"))
+        return [row[0] for row in rows]
+
+    def get_snapshot(self, relative_dir):
+        with self._lock:
+            if self._snapshots is None:
+                self._snapshots = {
+                    row[0]: DirSnapshot(row[1], row[2], row[3], bool(row[4]), tuple(json.loads(row[5])))
+                    for row in self._conn.execute("SELECT * FROM dir_snapshots")
+                }
+            return self._snapshots.get(self._to_key(relative_dir))
+
+    def save_snapshots(self, snapshots):
+        """Store a {relative_dir: DirSnapshot} mapping in a single transaction."""
+        if not snapshots:
+            return
+        rows = [
+            (self._to_key(d), s.mtime_ns, s.inode, s.entry_count, int(s.owns_store), json.dumps(list(s.subdirs)))
+            for d, s in snapshots.items()
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO dir_snapshots VALUES (?, ?, ?, ?, ?, ?)", rows)
+            if self._snapshots is not None:
+                self._snapshots.update((row[0], snapshot) for row, snapshot in zip(rows, snapshots.values()))
+
+    def remove_snapshots(self, relative_dirs):
+        """Forget the snapshots of the given directories and everything below them."""
+        with self._lock:
+            with self._conn:
+                for key in map(self._to_key, relative_dirs):
+                    self._conn.execute(
+                        "DELETE FROM dir_snapshots WHERE path = ? OR (path >= ? AND path < ?)",
+                        (key, key + "/", key + "0"),
+                    )
+                    if self._snapshots is not None:
+                        prefix = key + "/"
+                        for cached in [k for k in self._snapshots if k == key or k.startswith(prefix)]:
+                            del self._snapshots[cached]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _add_missing_columns(self, table, columns):
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+
+    def _import_legacy_tracker(self):
+        legacy_file = os.path.join(self.root_dir, TrackerStore.legacy_file_name)
+        if not os.path.exists(legacy_file):
+            return
+
+        try:
+            with open(legacy_file, 'r') as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"Could not import legacy tracker {legacy_file}.")
+            return
+
+        if isinstance(legacy, list):
+            self.add_many(legacy)
+        elif isinstance(legacy, dict):
+            self.add_many(
+                os.path.join(directory, name)
+                for directory, names in legacy.items()
+                for name in names
+            )
+
+    @staticmethod
+    def _to_key(relative_path):
+        key = os.path.normpath(relative_path).replace(os.sep, "/")
+        return "" if key == "." else key
+
+    @staticmethod
+    def _from_key(key):
+        return key.replace("/", os.sep)
@@ -0,0 +1,246 @@
+import os
+import re
+import stat
+import time
+import shutil
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from version_management.archive_writer import ArchiveWriter, ArchiveCancelled
+
+# errors is a list of (path, message); cancelled is True if the operation stopped early
+BulkResult = namedtuple('BulkResult', 'operation items_done items_total files_done errors cancelled seconds')
+
+# An archive of one selected item: the (source_path, arcname) pairs and where the zip goes
+ArchiveJob = namedtuple('ArchiveJob', 'source_dir files output_file')
+
+
+def outermost_paths(paths):
+    """Drop paths that lie inside another of the paths, so nothing is handled twice."""
+    result = []
+    for path in sorted({os.path.normpath(p) for p in paths}):
+        if not result or not path.startswith(result[-1].rstrip(os.sep) + os.sep):
+            result.append(path)
+    return result
+
+
+def plan_renames(paths, pattern, replacement):
+    """Return ([(old path, new path)], [(path, problem)]) for renaming by a regular expression.
+
+    The pattern is applied to each base name. Names it leaves unchanged are
+    not renamed; names that would collide with each other or with an existing
+    entry are reported as problems and left alone.
+    """
+    regex = re.compile(pattern)
+    renames = []
+    problems = []
+    targets = {}
+    for path in outermost_paths(paths):
+        name = os.path.basename(path)
+        new_name = regex.sub(replacement, name)
+        if new_name == name:
+            continue
+        new_path = os.path.join(os.path.dirname(path), new_name)
+        if not new_name or os.sep in new_name or (os.altsep and os.altsep in new_name):
+            problems.append((path, f"invalid new name '{new_name}'"))
+        elif new_path in targets:
+            problems.append((path, f"'{new_name}' is also the new name of {targets[new_path]}"))
+        elif os.path.lexists(new_path):
+            problems.append((path, f"'{new_name}' already exists"))
+        else:
+            targets[new_path] = path
+            renames.append((path, new_path))
+    return renames, problems
+
+
+class BulkFileOperation:
+    """Runs one file operation on many selected paths with a pool of workers.
+
+    Each selected path is an item; a selected folder being deleted is split
+    into its entries, so one large folder keeps every worker busy too.
+    progress_callback(items_done, items_total, files_done, current_path) is
+    called from the workers; cancel() stops the workers after the file each
+    of them is handling. Errors do not stop the operation, they are collected
+    in the BulkResult.
+    """
+
+    def __init__(self, max_workers=4, progress_callback=None, cancel_event=None):
+        self.max_workers = max_workers
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+        self._lock = threading.Lock()
+        self._items_done = 0
+        self._items_total = 0
+        self._files_done = 0
+        self._errors = []
+        self._writers = set()
+
+    def cancel(self):
+        self.cancel_event.set()
+        with self._lock:
+            writers = list(self._writers)
+        for writer in writers:
+            writer.cancel()
+
+    def delete(self, paths):
+        """Delete files and whole folders; folders are emptied while they are walked."""
+        paths = outermost_paths(paths)
+        units = []
+        for index, path in enumerate(paths):
+            if os.path.isdir(path) and not os.path.islink(path):
+                units.extend((index, entry) for entry in self._entries(path))
+            else:
+                units.append((index, path))
+        result = self._run("delete", len(paths), units, self._delete_tree, lambda path: path)
+        if not result.cancelled:
+            # The emptied folders themselves, once all their entries are gone
+            for path in paths:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    self._remove(os.rmdir, path)
+        return result._replace(errors=list(self._errors))
+
+    def move(self, paths, dest_dir):
+        """Move files and folders into dest_dir; names already taken there are reported, not overwritten."""
+        def move_one(path):
+            target = os.path.join(dest_dir, os.path.basename(path))
+            if os.path.lexists(target):
+                raise FileExistsError(f"{target} already exists")
+            shutil.move(path, target)
+            self._count_file()
+
+        paths = [p for p in outermost_paths(paths) if os.path.normpath(os.path.dirname(p)) != os.path.normpath(dest_dir)]
+        for path in paths:
+            if os.path.normpath(dest_dir).startswith(path.rstrip(os.sep) + os.sep):
+                raise ValueError(f"Cannot move {path} into itself")
+        return self._run("move", len(paths), list(enumerate(paths)), move_one, lambda path: path)
+
+    def rename(self, renames):
+        """Apply (old path, new path) pairs from plan_renames()."""
+        def rename_one(pair):
+            old_path, new_path = pair
+            if os.path.lexists(new_path):
+                raise FileExistsError(f"{new_path} already exists")
+            os.rename(old_path, new_path)
+            self._count_file()
+
+        return self._run("rename", len(renames), list(enumerate(renames)), rename_one, lambda pair: pair[0])
+
+    def compress(self, jobs):
+        """Write one zip archive per ArchiveJob."""
+        # The writers compress in parallel themselves; keep the total thread count near the CPU count
+        writer_workers = max(1, (os.cpu_count() or 1) // self.max_workers)
+
+        def compress_one(job):
+            # Each writer keeps its own cancel event: a writer sets it when it fails, which must not stop the others
+            writer = ArchiveWriter(job.output_file, max_workers=writer_workers,
+                                   file_callback=lambda done, total, name: self._count_file(
+                                       os.path.join(job.source_dir, name)))
+            with self._lock:
+                self._writers.add(writer)
+            try:
+                if self.cancel_event.is_set():
+                    return
+                writer.write(job.files)
+            except ArchiveCancelled:
+                pass
+            finally:
+                with self._lock:
+                    self._writers.discard(writer)
+
+        return self._run("compress", len(jobs), list(enumerate(jobs)), compress_one, lambda job: job.source_dir)
+
+    def _run(self, operation, items_total, units, handle, path_of):
+        """Call handle(payload) for every (item index, payload) unit on the pool."""
+        started = time.monotonic()
+        self._items_total = items_total
+        # A selected folder that was split into its entries is done once all of them are
+        remaining = {}
+        for index, _ in units:
+            remaining[index] = remaining.get(index, 0) + 1
+        self._items_done = items_total - len(remaining)
+
+        def work(unit):
+            index, payload = unit
+            if self.cancel_event.is_set():
+                return
+            try:
+                handle(payload)
+            except Exception as e:
+                self._error(path_of(payload), e)
+            with self._lock:
+                remaining[index] -= 1
+                if remaining[index] == 0:
+                    self._items_done += 1
+            self._report(path_of(payload))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="BulkFileOperation") as pool:
+            list(pool.map(work, units))
+        return BulkResult(operation, self._items_done, self._items_total, self._files_done, list(self._errors),
+                          self.cancel_event.is_set(), time.monotonic() - started)
+
+    @staticmethod
+    def _entries(directory):
+        try:
+            with os.scandir(directory) as entries:
+                return [entry.path for entry in entries]
+        except OSError:
+            return []
+
+    def _delete_tree(self, path):
+        """Delete path and everything below it, depth first, without listing the whole tree up front."""
+        if not os.path.isdir(path) or os.path.islink(path):
+            self._remove(os.remove, path)
+            return
+        # (directory, iterator over its entries)
+        stack = [(path, os.scandir(path))]
+        try:
+            while stack:
+                if self.cancel_event.is_set():
+                    return
+                directory, entries = stack[-1]
+                entry = next(entries, None)
+                if entry is None:
+                    entries.close()
+                    stack.pop()
+                    self._remove(os.rmdir, directory)
+                elif entry.is_dir(follow_symlinks=False):
+                    try:
+                        stack.append((entry.path, os.scandir(entry.path)))
+                    except OSError as e:
+                        self._error(entry.path, e)
+                else:
+                    self._remove(os.remove, entry.path)
+        finally:
+            for _, entries in stack:
+                entries.close()
+
+    def _remove(self, remove, path):
+        """Remove one file or empty folder; failures are recorded, not raised."""
+        try:
+            try:
+                remove(path)
+            except PermissionError:
+                # Read-only files, e.g. git objects on Windows, can be deleted once made writable
+                os.chmod(path, stat.S_IWRITE | stat.S_IREAD | (stat.S_IEXEC if remove is os.rmdir else 0))
+                remove(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            self._error(path, e)
+            return
+        if remove is os.remove:
+            self._count_file(path)
+
+    def _error(self, path, error):
+        with self._lock:
+            self._errors.append((path, str(error)))
+
+    def _count_file(self, path=None):
+        with self._lock:
+            self._files_done += 1
+        if path:
+            self._report(path)
+
+    def _report(self, current_path):
+        if self.progress_callback:
+            self.progress_callback(self._items_done, self._items_total, self._files_done, current_path)
@@ -1,82 +1,167 @@
-from PyQt6.QtGui import QFileSystemModel
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject
+from PyQt6.QtGui import QFileSystemModel, QColor
+from PyQt6.QtCore import Qt, pyqtSignal, QObject
+from PyQt6.QtCore import QTimer
 import os
-import csv
+from file_system.directory_size_cache import DirectorySizeCache
+from file_system.size_request_queue import SizeRequestQueue
+from file_system.size_cache_store import SizeCacheStore
+from file_monitoring.tracker_store import TrackerStore
 
 class SizeCalculationWorker(QObject):
-    size_calculated = pyqtSignal(str, int)
-
-    def calculate_size(self, file_info):
-        file_path = file_info.absoluteFilePath()
-
-        if file_info.isDir():
-            size = self.calculate_dir_size(file_path)
+    """Carries results from the size request threads to the model on the GUI thread."""
+    sizes_calculated = pyqtSignal(dict)  # {path: (size, mtime_ns)}
+
+    def __init__(self, excluded_dirs=()):
+        super().__init__()
+        # Backup directories are not part of a project's size
+        self.size_cache = DirectorySizeCache(excluded_dirs, root_marker=TrackerStore.db_file_name)
+        self.queue = SizeRequestQueue(self.size_cache, self.report_sizes)
+
+    def report_sizes(self, sizes):
+        self.sizes_calculated.emit({path: (size, self.size_cache.mtime_of(path)) for path, size in sizes.items()})
+
+    def calculate_size(self, file_path):
+        if file_path in self.size_cache:
+            # Known but outdated: list it again rather than return the cached total
+            self.queue.refresh(file_path)
         else:
-            size = file_info.size()
+            self.queue.request(file_path)
 
-        self.size_calculated.emit(file_path, size)
+    def refresh(self, directory):
+        self.queue.refresh(directory)
 
-    def calculate_dir_size(self, dir_path):
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(dir_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                total_size += os.path.getsize(fp)
-        return total_size
+    def stop(self):
+        self.queue.stop()
 
 
 class CustomFileSystemModel(QFileSystemModel):
+    # Name colours for the git states served by git_status
+    git_state_colors = {
+        "conflicted": QColor(200, 30, 30),
+        "modified": QColor(200, 120, 0),
+        "staged": QColor(30, 140, 30),
+        "untracked": QColor(110, 110, 160),
+    }
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.ignored_dirs = ['.venv', '.git']
-        self.size_data = {}
-        self.csv_file_path = "file_sizes.csv"
-        self.load_size_data()
-
-        self.worker_thread = QThread()
-        self.worker = SizeCalculationWorker()
-        self.worker.moveToThread(self.worker_thread)
-        self.worker.size_calculated.connect(self.on_size_calculated)
-        self.worker_thread.start()
-
-    def filterAcceptsRow(self, source_row, source_parent):
-        index = self.index(source_row, 0, source_parent)
-        if index.isValid():
-            file_info = self.fileInfo(index)
-            if self.is_ignored(file_info):
-                return False
-        return super().filterAcceptsRow(source_row, source_parent)
-
-    def is_ignored(self, file_info):
-        if file_info.isDir():
-            if file_info.fileName() in self.ignored_dirs:
-                return True
-            dir_path = file_info.absoluteFilePath()
-            for dir_name in dir_path.split(os.path.sep):
-                if dir_name in self.ignored_dirs:
-                    return True
-        return False
+        # GitStatusCache, set by the window; read from memory only, so painting never runs git
+        self.git_status = None
+        self.backup_dirs = ['.snapshots', 'backups', 'working_versions']
+        # Sizes persist in a journaled store outside the working directory
+        self.size_store = SizeCacheStore()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.size_store.flush_in_background)
+        self.flush_timer.start(2000)
+        # path -> directory mtime (ms) a measurement was last requested for
+        self.requested_mtimes = {}
+
+        # Size and git status changes are published once per frame as dataChanged on their column
+        self.changed_size_paths = set()
+        self.changed_status_paths = set()
+        self.row_update_timer = QTimer(self)
+        self.row_update_timer.setSingleShot(True)
+        self.row_update_timer.setInterval(50)
+        self.row_update_timer.timeout.connect(self.publish_row_changes)
+
+        self.worker = SizeCalculationWorker(self.backup_dirs)
+        self.worker.sizes_calculated.connect(self.on_sizes_calculated)
 
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
         if role == Qt.ItemDataRole.DisplayRole:
             if index.column() == 1:  # Assuming the "Size" column is column 1
                 file_info = self.fileInfo(index)
-                file_path = file_info.absoluteFilePath()
-
-                # Check if the size is already known
-                if file_path in self.size_data:
-                    return self.human_readable_size(self.size_data[file_path])
-
-                # If size is not known, start calculation in a separate thread
-                self.worker.calculate_size(file_info)
+                file_path = os.path.normpath(file_info.absoluteFilePath())
+
+                if not file_info.isDir():
+                    return self.human_readable_size(file_info.size())
+
+                # A stored size is used while the directory's mtime still matches. Each mtime is
+                # only measured once, even if the view's file info lags behind the file system.
+                mtime_ms = file_info.lastModified().toMSecsSinceEpoch()
+                entry = self.size_store.get(file_path)
+                requested = self.requested_mtimes.get(file_path) == mtime_ms
+                if entry and (entry[1] // 1000000 == mtime_ms or requested):
+                    return self.human_readable_size(entry[0])
+
+                # Directory sizes are measured on the size request threads; repeated requests are merged
+                if not requested:
+                    self.requested_mtimes[file_path] = mtime_ms
+                    self.worker.calculate_size(file_path)
                 return "Calculating..."
 
+        if self.git_status and index.column() == 0 and role in (Qt.ItemDataRole.ForegroundRole,
+                                                                 Qt.ItemDataRole.ToolTipRole):
+            state = self.git_status.status_of(os.path.normpath(self.filePath(index)))
+            if state:
+                return self.git_state_colors[state] if role == Qt.ItemDataRole.ForegroundRole else f"Git: {state}"
+
         return super().data(index, role)
 
-    def on_size_calculated(self, file_path, size):
-        self.size_data[file_path] = size
-        self.save_size_data()
-        self.layoutChanged.emit()  # Notify the view that data has changed
+    def on_sizes_calculated(self, sizes):
+        for path, (size, mtime_ns) in sizes.items():
+            if mtime_ns is not None:
+                self.size_store.put(path, size, mtime_ns)
+        self.queue_size_changes(sizes)
+
+    def queue_size_changes(self, paths):
+        self.changed_size_paths.update(paths)
+        if not self.row_update_timer.isActive():
+            self.row_update_timer.start()
+
+    def on_git_status_changed(self, paths):
+        self.changed_status_paths.update(paths)
+        if not self.row_update_timer.isActive():
+            self.row_update_timer.start()
+
+    def publish_row_changes(self):
+        """Emit one dataChanged per parent, covering the changed rows of the size and name columns."""
+        self.emit_rows_changed(self.changed_size_paths, 1, [Qt.ItemDataRole.DisplayRole])
+        self.emit_rows_changed(self.changed_status_paths, 0,
+                               [Qt.ItemDataRole.ForegroundRole, Qt.ItemDataRole.ToolTipRole])
+
+    def emit_rows_changed(self, paths, column, roles):
+        rows = {}
+        for path in paths:
+            # index(path) does not load anything; paths the model has not loaded give an invalid index
+            index = self.index(path, column)
+            if index.isValid():
+                parent = index.parent()
+                first, last = rows.get(parent, (index.row(), index.row()))
+                rows[parent] = (min(first, index.row()), max(last, index.row()))
+        paths.clear()
+        for parent, (first, last) in rows.items():
+            self.dataChanged.emit(self.index(first, column, parent), self.index(last, column, parent), roles)
+
+    def set_visible_paths(self, paths):
+        """Measure only the directories of rows that are on screen, top row first."""
+        for path in self.worker.queue.retain(paths):
+            self.requested_mtimes.pop(path, None)
+
+    def on_paths_changed(self, paths):
+        """Update sizes along the changed paths' ancestors instead of measuring them again."""
+        root_path = os.path.normpath(self.rootPath())
+        stale = set()
+        for directory in {os.path.dirname(os.path.normpath(p)) for p in paths}:
+            self.worker.refresh(directory)
+            # Stored sizes of ancestors the cache has not measured are stale now, though their mtime is not.
+            while directory == root_path or directory.startswith(root_path + os.sep):
+                if directory not in self.worker.size_cache:
+                    self.size_store.discard(directory)
+                    self.requested_mtimes.pop(directory, None)
+                    stale.add(directory)
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    break
+                directory = parent
+        if stale:
+            self.queue_size_changes(stale)
+
+    def shutdown(self):
+        self.flush_timer.stop()
+        self.row_update_timer.stop()
+        self.worker.stop()
+        self.size_store.close()
 
     def human_readable_size(self, size, decimal_places=2):
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -84,17 +169,3 @@ class CustomFileSystemModel(QFileSystemModel):
                 return f"{size:.{decimal_places}f} {unit}"
             size /= 1024.0
         return f"{size:.{decimal_places}f} TB"
-
-    def load_size_data(self):
-        if os.path.exists(self.csv_file_path):
-            with open(self.csv_file_path, mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    self.size_data[row['path']] = int(row['size'])
-
-    def save_size_data(self):
-        with open(self.csv_file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=['path', 'size'])
-            writer.writeheader()
-            for path, size in self.size_data.items():
-                writer.writerow({'path': path, 'size': size})
@@ -0,0 +1,146 @@
+import os
+import threading
+from collections import namedtuple
+
+# own_bytes: files directly in the directory; total_bytes: own_bytes plus all subdirectories;
+# mtime_ns: the directory's mtime when it was listed
+DirSize = namedtuple('DirSize', 'own_bytes total_bytes subdirs mtime_ns')
+
+
+class DirectorySizeCache:
+    """Directory sizes computed bottom-up, each directory listed once.
+
+    Measuring a directory lists every not yet measured directory below it with
+    os.scandir, sums the file sizes from the entries' stat data and rolls child
+    totals up into their parents, so measuring a parent after its children
+    costs one listing. After a change, refresh lists the one affected directory
+    again and adds the difference to its cached ancestors.
+
+    excluded_dirs are left out only where they sit directly in a project root,
+    a directory holding a root_marker file.
+    """
+
+    def __init__(self, excluded_dirs=(), root_marker=None):
+        self.excluded_dirs = set(excluded_dirs)
+        self.root_marker = root_marker
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, directory):
+        with self._lock:
+            return os.path.normpath(directory) in self._entries
+
+    def size_of(self, directory):
+        directory = os.path.normpath(directory)
+        with self._lock:
+            entry = self._entries.get(directory)
+        if entry is None:
+            return self._measure(directory)
+        return entry.total_bytes
+
+    def mtime_of(self, directory):
+        with self._lock:
+            entry = self._entries.get(os.path.normpath(directory))
+        return entry.mtime_ns if entry else None
+
+    def refresh(self, directory):
+        """List a changed directory again and roll the difference up to its ancestors.
+
+        If the directory is gone or was never measured, its nearest measured
+        ancestor is refreshed instead. Returns {directory: total_bytes} for every
+        cached directory whose total was updated.
+        """
+        directory = os.path.normpath(directory)
+        with self._lock:
+            while directory not in self._entries or not os.path.isdir(directory):
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    return {}
+                directory = parent
+
+        own_bytes, subdirs, mtime_ns = self._list(directory)
+        child_totals = {name: self.size_of(os.path.join(directory, name)) for name in subdirs}
+        total_bytes = own_bytes + sum(child_totals.values())
+
+        with self._lock:
+            old = self._entries.get(directory)
+            if old is None:
+                return {}
+            for name in set(old.subdirs) - set(subdirs):
+                self._forget(os.path.join(directory, name))
+            self._entries[directory] = DirSize(own_bytes, total_bytes, subdirs, mtime_ns)
+
+            updated = {directory: total_bytes}
+            delta = total_bytes - old.total_bytes
+            parent = os.path.dirname(directory)
+            while delta and parent != directory and parent in self._entries:
+                entry = self._entries[parent]
+                self._entries[parent] = entry._replace(total_bytes=entry.total_bytes + delta)
+                updated[parent] = entry.total_bytes + delta
+                directory, parent = parent, os.path.dirname(parent)
+            return updated
+
+    def _measure(self, directory):
+        """Measure a directory and every unmeasured one below it; returns its total.
+
+        Directories are listed without holding the lock, so several threads can
+        measure different subtrees at once.
+        """
+        # Iterative post-order walk: a directory's total is set once all its children have one.
+        listed = {}
+        totals = {}
+        stack = [(directory, False)]
+        while stack:
+            path, children_done = stack.pop()
+            if children_done:
+                own_bytes, subdirs, mtime_ns = listed.pop(path)
+                with self._lock:
+                    total_bytes = own_bytes + sum(self._child_total(os.path.join(path, name), totals)
+                                                  for name in subdirs)
+                    self._entries[path] = DirSize(own_bytes, total_bytes, subdirs, mtime_ns)
+                totals[path] = total_bytes
+                continue
+            listed[path] = self._list(path)
+            stack.append((path, True))
+            with self._lock:
+                unmeasured = [os.path.join(path, name) for name in listed[path][1]
+                              if os.path.join(path, name) not in self._entries]
+            stack.extend((child, False) for child in unmeasured)
+        return totals[directory]
+
+    def _child_total(self, child, totals):
+        entry = self._entries.get(child)
+        if entry is not None:
+            return entry.total_bytes
+        # Forgotten by a concurrent refresh since it was measured
+        return totals.get(child, 0)
+
+    def _list(self, directory):
+        own_bytes = 0
+        subdirs = []
+        mtime_ns = None
+        try:
+            # Taken before listing, so a change made during the listing leaves the entry outdated
+            mtime_ns = os.stat(directory).st_mtime_ns
+            excluded_dirs = self.excluded_dirs if self._is_root(directory) else ()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in excluded_dirs:
+                                subdirs.append(entry.name)
+                        else:
+                            own_bytes += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Could not measure {directory}: {e}")
+        return own_bytes, tuple(subdirs), mtime_ns
+
+    def _is_root(self, directory):
+        return bool(self.root_marker) and os.path.exists(os.path.join(directory, self.root_marker))
+
+    def _forget(self, directory):
+        prefix = directory + os.sep
+        for path in [p for p in self._entries if p == directory or p.startswith(prefix)]:
+            del self._entries[path]
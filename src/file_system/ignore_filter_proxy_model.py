@@ -0,0 +1,75 @@
+import os
+from PyQt6.QtCore import QSortFilterProxyModel
+from file_monitoring.ignore_matcher import IgnoreMatcher
+
+
+class IgnoreFilterProxyModel(QSortFilterProxyModel):
+    """Hides ignored directories of a QFileSystemModel before the view ever sees them.
+
+    Directories are tested with the tracker's IgnoreMatcher, so .venv, .git,
+    node_modules and .gitignore'd trees are never expanded, which means the
+    source model never lists, stats or watches anything inside them. Files stay
+    visible. Decisions are cached per path. Sorting is left to the source model.
+
+    With a batch_size, a directory shows its first batch_size rows and each
+    fetchMore() reveals the next batch, so a directory with tens of thousands of
+    entries costs the view one batch at a time.
+    """
+
+    def __init__(self, ignore_matcher, parent=None, batch_size=0):
+        super().__init__(parent)
+        self.ignore_matcher = ignore_matcher
+        self.batch_size = batch_size
+        self._decisions = {}
+        # source parent internalId -> number of rows revealed
+        self._row_limits = {}
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.batch_size and source_row >= self._row_limit(source_parent):
+            return False
+        source = self.sourceModel()
+        index = source.index(source_row, 0, source_parent)
+        if not index.isValid() or not source.isDir(index):
+            return True
+        path = os.path.normpath(source.filePath(index))
+        accepted = self._decisions.get(path)
+        if accepted is None:
+            accepted = self._is_at_or_above_root(path) or not self.ignore_matcher.is_ignored(path, True)
+            self._decisions[path] = accepted
+        return accepted
+
+    def canFetchMore(self, parent):
+        source_parent = self.mapToSource(parent)
+        if self.sourceModel().canFetchMore(source_parent):
+            return True
+        return bool(self.batch_size) and self.sourceModel().rowCount(source_parent) > self._row_limit(source_parent)
+
+    def fetchMore(self, parent):
+        source_parent = self.mapToSource(parent)
+        if self.sourceModel().canFetchMore(source_parent):
+            self.sourceModel().fetchMore(source_parent)
+        elif self.batch_size:
+            self._row_limits[source_parent.internalId()] = self._row_limit(source_parent) + self.batch_size
+            self.invalidateRowsFilter()
+
+    def sort(self, column, order):
+        # QFileSystemModel sorts directories first and sizes numerically; keep its order.
+        self.sourceModel().sort(column, order)
+
+    def invalidate_decisions(self):
+        self._decisions.clear()
+        self._row_limits.clear()
+        self.invalidateFilter()
+
+    def on_paths_changed(self, paths):
+        """Re-evaluate the filter when a .gitignore changed."""
+        if any(os.path.basename(p) == IgnoreMatcher.gitignore_file_name for p in paths):
+            self.invalidate_decisions()
+
+    def _row_limit(self, source_parent):
+        return self._row_limits.get(source_parent.internalId(), self.batch_size)
+
+    def _is_at_or_above_root(self, path):
+        # The projects root and its ancestors are always shown, whatever their names.
+        root_path = os.path.normpath(self.sourceModel().rootPath())
+        return root_path == path or root_path.startswith(path.rstrip(os.sep) + os.sep)
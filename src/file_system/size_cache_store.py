@@ -0,0 +1,179 @@
+import os
+import csv
+import time
+import threading
+
+
+class SizeCacheStore:
+    """Persistent path -> (size, mtime_ns) cache: a compacted snapshot plus an append-only journal.
+
+    put() and discard() only buffer the change; flush() appends buffered changes
+    to the journal. Once flush_threshold changes are buffered, put() hands the
+    flush to a background writer thread, so callers on the GUI thread never
+    wait for the disk. When the journal has grown past compact_ratio times the
+    number of entries, the writer rewrites the snapshot and starts a new
+    journal. Entries older than max_age_seconds are dropped on load and
+    compaction.
+    """
+
+    cache_dir = os.path.join(os.path.expanduser("~"), ".project_manager")
+
+    def __init__(self, name="file_sizes", cache_dir=None, flush_threshold=500, compact_ratio=2.0,
+                 max_age_seconds=7 * 24 * 3600):
+        cache_dir = cache_dir or SizeCacheStore.cache_dir
+        self.snapshot_path = os.path.join(cache_dir, f"{name}.csv")
+        self.journal_path = os.path.join(cache_dir, f"{name}.journal")
+        self.flush_threshold = flush_threshold
+        self.compact_ratio = compact_ratio
+        self.max_age_seconds = max_age_seconds
+
+        # path -> (size, mtime_ns, measured at)
+        self._entries = {}
+        self._pending = []
+        self._journal_rows = 0
+        self._lock = threading.Lock()
+        # Background writer thread, None while it has nothing to do
+        self._writer = None
+        self._write_requested = False
+        self._compact_requested = False
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, path):
+        """Return (size, mtime_ns) for path, or None."""
+        entry = self._entries.get(path)
+        return entry[:2] if entry else None
+
+    def put(self, path, size, mtime_ns):
+        entry = (size, mtime_ns, int(time.time()))
+        with self._lock:
+            self._entries[path] = entry
+            self._pending.append((path,) + entry)
+            should_flush = len(self._pending) >= self.flush_threshold
+        if should_flush:
+            self.flush_in_background()
+
+    def discard(self, path):
+        with self._lock:
+            if self._entries.pop(path, None) is not None:
+                # A row without a size removes the path when the journal is replayed
+                self._pending.append((path, "", "", ""))
+
+    def flush(self):
+        """Append buffered changes to the journal now; a due compaction goes to the writer thread."""
+        if self._append_pending():
+            self.compact_in_background()
+
+    def flush_in_background(self):
+        self._wake_writer()
+
+    def compact_in_background(self):
+        self._wake_writer(compact=True)
+
+    def _wake_writer(self, compact=False):
+        with self._lock:
+            self._write_requested = True
+            self._compact_requested = self._compact_requested or compact
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="SizeCacheWriter", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                if not self._write_requested:
+                    self._writer = None
+                    return
+                compact = self._compact_requested
+                self._write_requested = self._compact_requested = False
+            try:
+                if self._append_pending() or compact:
+                    self.compact()
+            except OSError as e:
+                print(f"Could not write the size cache: {e}")
+
+    def _append_pending(self):
+        """Append buffered changes to the journal; returns whether the journal is due for compaction."""
+        with self._lock:
+            if not self._pending:
+                return False
+            with open(self.journal_path, 'a', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(self._pending)
+            self._journal_rows += len(self._pending)
+            self._pending = []
+            return self._journal_rows > self.compact_ratio * max(len(self._entries), self.flush_threshold)
+
+    def compact(self):
+        """Write all live entries to a new snapshot and start an empty journal."""
+        with self._lock:
+            old_journal = self.journal_path + ".old"
+            if os.path.exists(self.journal_path):
+                os.replace(self.journal_path, old_journal)
+            self._journal_rows = len(self._pending)
+            entries = dict(self._entries)
+
+        # The rotated journal stays until the snapshot that covers it is in place.
+        cutoff = time.time() - self.max_age_seconds
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['path', 'size', 'mtime_ns', 'measured'])
+            writer.writerows((path,) + entry for path, entry in entries.items() if entry[2] >= cutoff)
+        os.replace(temp_path, self.snapshot_path)
+        if os.path.exists(old_journal):
+            os.remove(old_journal)
+
+    def close(self):
+        self._join_writer()
+        self.flush()
+        self._join_writer()
+
+    def _join_writer(self):
+        while True:
+            with self._lock:
+                writer = self._writer
+            if writer is None:
+                return
+            writer.join()
+
+    def _load(self):
+        cutoff = time.time() - self.max_age_seconds
+        for path in (self.snapshot_path, self.journal_path + ".old", self.journal_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                for row in reader:
+                    if len(row) != 4 or row[0] == 'path' and row[1] == 'size':
+                        continue
+                    if path == self.journal_path:
+                        self._journal_rows += 1
+                    if not row[1]:
+                        self._entries.pop(row[0], None)
+                        continue
+                    try:
+                        entry = (int(row[1]), int(row[2]), int(row[3]))
+                    except ValueError:
+                        # A row cut short by a crash
+                        continue
+                    if entry[2] >= cutoff:
+                        self._entries[row[0]] = entry
+                    else:
+                        self._entries.pop(row[0], None)
+        self._end_torn_journal_line()
+
+    def _end_torn_journal_line(self):
+        """End a row cut short by a crash, so the next append does not run into it."""
+        try:
+            with open(self.journal_path, 'rb+') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        except FileNotFoundError:
+            return
@@ -0,0 +1,90 @@
+import os
+import threading
+
+
+class SizeRequestQueue:
+    """Work queue that measures directory sizes on a bounded pool of threads.
+
+    A path that is already queued or being measured is not queued again, so
+    repaints of a row still showing "Calculating..." cost nothing; queued
+    refreshes are merged the same way. retain() drops queued paths whose rows
+    are no longer visible and moves the visible ones to the front, top row
+    first. Refreshes of changed directories are served before size requests.
+    Results go to on_sizes({path: size}) from the worker threads.
+    """
+
+    def __init__(self, size_cache, on_sizes, max_workers=None):
+        self.size_cache = size_cache
+        self.on_sizes = on_sizes
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+
+        self._condition = threading.Condition()
+        # Insertion-ordered dict used as a deduplicating FIFO
+        self._pending = {}
+        self._refreshes = {}
+        self._in_flight = set()
+        self._stopped = False
+        self._workers = [threading.Thread(target=self._run, name=f"SizeRequestQueue-{i}", daemon=True)
+                         for i in range(self.max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def request(self, path):
+        path = os.path.normpath(path)
+        with self._condition:
+            if path in self._pending or path in self._in_flight:
+                return
+            self._pending[path] = None
+            self._condition.notify()
+
+    def refresh(self, directory):
+        with self._condition:
+            self._refreshes[os.path.normpath(directory)] = None
+            self._condition.notify()
+
+    def retain(self, visible_paths):
+        """Keep only queued paths that are in visible_paths, in that order; returns the dropped ones."""
+        with self._condition:
+            visible = [os.path.normpath(p) for p in visible_paths]
+            dropped = set(self._pending).difference(visible)
+            self._pending = {p: None for p in visible if p in self._pending}
+        return dropped
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._refreshes.clear()
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not (self._stopped or self._pending or self._refreshes):
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                if self._refreshes:
+                    directory = next(iter(self._refreshes))
+                    del self._refreshes[directory]
+                    path = None
+                else:
+                    path = next(iter(self._pending))
+                    del self._pending[path]
+                    self._in_flight.add(path)
+
+            try:
+                if path is None:
+                    sizes = self.size_cache.refresh(directory)
+                else:
+                    sizes = {path: self.size_cache.size_of(path)}
+                if sizes:
+                    self.on_sizes(sizes)
+            except Exception as e:
+                print(f"Error measuring {path or directory}: {e}")
+            finally:
+                if path is not None:
+                    with self._condition:
+                        self._in_flight.discard(path)
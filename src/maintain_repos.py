@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+import argparse
+from config.config_manager import ConfigManager
+from file_monitoring.file_tracker import FileTracker
+from version_management.repo_maintenance import OPERATIONS, find_repositories, run_maintenance
+
+
+def print_report(report, root_dir):
+    changes = "" if report.staged is None else report.staged + report.modified + report.conflicted
+    untracked = "" if report.untracked is None else report.untracked
+    print(f"{os.path.relpath(report.repo_dir, root_dir):<50} {report.branch or '':<20} {changes:>8} {untracked:>9} "
+          f"{report.seconds:8.2f}s  {'' if report.ok else 'FAILED: '}{report.summary}", flush=True)
+
+
+def main():
+    config = ConfigManager.load_config()
+    parser = argparse.ArgumentParser(description="Run a local git operation in every repository under the projects root.")
+    parser.add_argument("root", nargs="?", default=config.get('settings', 'project_root', fallback=None),
+                        help="projects root directory (default: project_root from config.ini)")
+    parser.add_argument("--operation", choices=OPERATIONS, default="status")
+    parser.add_argument("--workers", type=int, default=config.getint('git', 'maintenance_workers', fallback=4),
+                        help="repositories processed at the same time")
+    args = parser.parse_args()
+    if not args.root or not os.path.isdir(args.root):
+        parser.error(f"projects root directory not found: {args.root}")
+
+    started = time.monotonic()
+    repositories = find_repositories(args.root, FileTracker.is_ignored)
+    print(f"{'Repository':<50} {'Branch':<20} {'Changes':>8} {'Untracked':>9} {'Time':>9}  Result")
+    reports = run_maintenance(repositories, args.operation, args.workers,
+                              on_report=lambda report: print_report(report, args.root))
+    failed = sum(1 for report in reports if not report.ok)
+    busy = sum(report.seconds for report in reports)
+    print(f"{args.operation}: {len(reports)} repositories in {time.monotonic() - started:.2f}s "
+          f"({busy:.2f}s of git time, {args.workers} workers), {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class TaskCancelled(Exception):
+    """Raised by Task.check_cancelled() to end a task that has been cancelled."""
+
+
+class Task(QObject):
+    """A unit of work submitted to a TaskExecutor, and the future of its result.
+
+    The work function is called as fn(task, *args) on a pool thread. It reports
+    progress with report(), stops early with check_cancelled() or by watching
+    cancel_event, and its return value is the result. Exactly one of
+    succeeded(result), failed(message) and cancelled() is emitted, followed by
+    finished(). partial_result(value) is free for the work function to hand out
+    values before it is done.
+    """
+    # done, total (0 if unknown), description
+    progress = pyqtSignal('qint64', 'qint64', str)
+    partial_result = pyqtSignal(object)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+    # Progress signals per second, so that tight loops do not flood the GUI
+    progress_rate = 10
+
+    def __init__(self, executor, task_id, category, title, fn, args):
+        super().__init__()
+        self.executor = executor
+        self.task_id = task_id
+        self.category = category
+        self.title = title
+        self.fn = fn
+        self.args = args
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.done = 0
+        self.total = 0
+        self.description = ""
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self._cancel_callbacks = []
+        self._last_progress = 0.0
+
+    @property
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def elapsed(self):
+        """Seconds spent running so far, or in total once finished."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def cancel(self):
+        """Drop the task if it is still queued, otherwise ask it to stop."""
+        self.executor.cancel(self)
+
+    def on_cancel(self, callback):
+        """Call callback() when the task is cancelled, e.g. to stop a writer it is waiting on."""
+        self._cancel_callbacks.append(callback)
+        if self.is_cancelled:
+            callback()
+
+    def check_cancelled(self):
+        if self.is_cancelled:
+            raise TaskCancelled()
+
+    def report(self, done=None, total=None, description=None):
+        """Update progress from any thread; unchanged values may be left out."""
+        if done is not None:
+            self.done = done
+        if total is not None:
+            self.total = total
+        if description is not None:
+            self.description = description
+        now = time.monotonic()
+        if now - self._last_progress >= 1.0 / self.progress_rate or (self.total and self.done >= self.total):
+            self._last_progress = now
+            self.progress.emit(self.done, self.total, self.description)
+            self.executor.task_updated.emit(self)
+
+
+class TaskExecutor(QObject):
+    """One thread pool for the app's background work, with a concurrency limit per category.
+
+    A category never runs more than its limit of tasks at a time; further
+    tasks wait in submission order. The pool has one thread per slot, so a
+    task whose category has a free slot starts at once, whatever the other
+    categories are doing. Threads are reused between tasks.
+
+    submit() must be called on the GUI thread. A task does not start before
+    control returns to the event loop, so signals connected right after
+    submit() see all of its progress. task_updated(task) is emitted whenever a
+    task changes state or reports progress; tasks() lists the queued and
+    running tasks and the most recently finished ones.
+    """
+    task_updated = pyqtSignal(object)
+    _dispatch_requested = pyqtSignal()
+
+    default_limits = {"io": 4, "scan": 1, "archive": 2, "backup": 1, "project": 2, "git": 1}
+
+    def __init__(self, limits=None, history=100):
+        super().__init__()
+        self.limits = dict(TaskExecutor.default_limits, **(limits or {}))
+        self._pool = ThreadPoolExecutor(max_workers=sum(self.limits.values()), thread_name_prefix="Task")
+        self._lock = threading.Lock()
+        self._next_id = 1
+        # Submitted on the GUI thread, not yet released to the category queues
+        self._submitted = []
+        self._queues = {category: deque() for category in self.limits}
+        self._running = {category: 0 for category in self.limits}
+        self._active = {}
+        self._history = deque(maxlen=history)
+        self._stopped = False
+        self._dispatch_requested.connect(self._dispatch, Qt.ConnectionType.QueuedConnection)
+
+    def submit(self, category, title, fn, *args):
+        if category not in self.limits:
+            raise ValueError(f"Unknown task category: {category}")
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("The task executor has been shut down")
+            task = Task(self, self._next_id, category, title, fn, args)
+            self._next_id += 1
+            self._active[task.task_id] = task
+            self._submitted.append(task)
+        self._dispatch_requested.emit()
+        self.task_updated.emit(task)
+        return task
+
+    def tasks(self):
+        with self._lock:
+            return sorted(list(self._active.values()) + list(self._history), key=lambda task: task.task_id)
+
+    def cancel(self, task):
+        with self._lock:
+            if task.state not in (QUEUED, RUNNING):
+                return
+            task.cancel_event.set()
+            dropped = task.state == QUEUED
+            if dropped:
+                if task in self._submitted:
+                    self._submitted.remove(task)
+                else:
+                    self._queues[task.category].remove(task)
+                self._finish(task, CANCELLED)
+        if dropped:
+            self._emit_outcome(task)
+            return
+        for callback in list(task._cancel_callbacks):
+            callback()
+
+    def shutdown(self, wait=False):
+        """Drop queued tasks and cancel running ones; with wait, block until those have returned."""
+        with self._lock:
+            self._stopped = True
+            tasks = list(self._active.values())
+        for task in tasks:
+            self.cancel(task)
+        self._pool.shutdown(wait=wait)
+
+    def _dispatch(self):
+        with self._lock:
+            for task in self._submitted:
+                self._queues[task.category].append(task)
+            self._submitted = []
+            for category in self._queues:
+                self._start_queued(category)
+
+    def _start_queued(self, category):
+        # Called with _lock held
+        queue = self._queues[category]
+        while queue and self._running[category] < self.limits[category] and not self._stopped:
+            task = queue.popleft()
+            task.state = RUNNING
+            task.started_at = time.monotonic()
+            self._running[category] += 1
+            self._pool.submit(self._run, task)
+
+    def _run(self, task):
+        self.task_updated.emit(task)
+        state = SUCCEEDED
+        try:
+            task.result = task.fn(task, *task.args)
+        except TaskCancelled:
+            state = CANCELLED
+        except Exception as e:
+            state = FAILED
+            task.error = str(e) or e.__class__.__name__
+            print(f"Task '{task.title}' failed: {task.error}")
+        with self._lock:
+            self._finish(task, state)
+            self._running[task.category] -= 1
+            self._start_queued(task.category)
+        self._emit_outcome(task)
+
+    def _finish(self, task, state):
+        # Called with _lock held
+        task.state = state
+        task.finished_at = time.monotonic()
+        self._active.pop(task.task_id, None)
+        self._history.append(task)
+
+    def _emit_outcome(self, task):
+        if task.state == SUCCEEDED:
+            task.succeeded.emit(task.result)
+        elif task.state == FAILED:
+            task.failed.emit(task.error)
+        else:
+            task.cancelled.emit()
+        task.finished.emit()
+        self.task_updated.emit(task)
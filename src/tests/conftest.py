@@ -0,0 +1,38 @@
+import os
+import sys
+import pytest
+
+# The app imports its packages relative to src/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_monitoring.tracker_store import TrackerStore
+
+
+@pytest.fixture(autouse=True)
+def close_tracker_stores():
+    yield
+    TrackerStore.close_all()
+
+
+def write_file(path, content="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtCore import QCoreApplication
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def process_events_until(app, condition, timeout=5):
+    """Run the Qt event loop until condition() holds; returns whether it did."""
+    import time
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
@@ -0,0 +1,42 @@
+import json
+import zipfile
+from conftest import write_file
+from version_management.archive_writer import ArchiveWriter
+from version_management.backup_reader import ArchiveBackup
+
+
+def make_archive(tmp_path):
+    contents = {"a.txt": "alpha", "src/main.py": "print('hi')\n" * 1000, "src/pkg/util.py": ""}
+    files = []
+    for name, content in contents.items():
+        write_file(str(tmp_path / "project" / name), content)
+        files.append((str(tmp_path / "project" / name), name))
+    archive = str(tmp_path / "backup.zip")
+    ArchiveWriter(archive, max_workers=2).write(files)
+    return archive, contents
+
+
+def test_archive_is_a_valid_zip_with_a_member_index(tmp_path):
+    archive, contents = make_archive(tmp_path)
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.testzip() is None
+        assert {name: zf.read(name).decode() for name in zf.namelist()} == contents
+    with open(archive + ArchiveWriter.index_suffix, encoding='utf-8') as f:
+        members = json.load(f)["members"]
+    assert sorted(m["name"] for m in members) == sorted(contents)
+    with open(archive, 'rb') as f:
+        data = f.read()
+    for member in members:
+        # Each indexed data offset points right behind the member's local header
+        assert data[member["header_offset"]:member["header_offset"] + 4] == b"PK\x03\x04"
+        assert member["data_offset"] > member["header_offset"]
+
+
+def test_member_is_restored_through_the_index(tmp_path):
+    archive, contents = make_archive(tmp_path)
+    restored = tmp_path / "restored"
+    files, size = ArchiveBackup(archive, "backups").extract("src", str(restored))
+    assert files == 2
+    assert size == len(contents["src/main.py"])
+    assert (restored / "src" / "main.py").read_text() == contents["src/main.py"]
+    assert not (restored / "a.txt").exists()
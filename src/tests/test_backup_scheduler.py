@@ -0,0 +1,137 @@
+import pytest
+from conftest import write_file
+from file_monitoring.file_tracker import FileTracker
+from version_management import backup_scheduler
+from version_management.backup_scheduler import BackupScheduler, ByteThrottle
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(backup_scheduler, "time", clock)
+    monkeypatch.setattr(backup_scheduler, "machine_idle_seconds", lambda: None)
+    return clock
+
+
+@pytest.fixture
+def make_scheduler():
+    schedulers = []
+
+    def make(**kwargs):
+        scheduler = BackupScheduler(**kwargs)
+        scheduler.backed_up = []
+        # Record instead of backing up; the project stays running until finish() is called
+        scheduler._backup = scheduler.backed_up.append
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield make
+    for scheduler in schedulers:
+        scheduler.shutdown()
+
+
+def finish(scheduler, project_dir):
+    with scheduler._lock:
+        scheduler._running.discard(project_dir)
+
+
+def test_throttle_lets_the_first_second_through(clock):
+    throttle = ByteThrottle(1000)
+    throttle(600)
+    throttle(400)
+    assert clock.slept == 0
+
+
+def test_throttle_holds_readers_to_the_rate(clock):
+    throttle = ByteThrottle(1000)
+    for _ in range(10):
+        throttle(500)
+    # 5000 bytes at 1000 bytes/s, the first 1000 of them free
+    assert clock.slept == pytest.approx(4.0)
+
+
+def test_throttle_refills_while_idle(clock):
+    throttle = ByteThrottle(1000)
+    throttle(1000)
+    clock.now += 10
+    throttle(1000)
+    assert clock.slept == 0
+
+
+def test_project_is_backed_up_once_quiet(clock, make_scheduler):
+    scheduler = make_scheduler(interval_seconds=600, idle_seconds=60)
+    scheduler.mark_dirty("/p")
+    clock.now += 30
+    assert scheduler.run_due() == []
+    clock.now += 30
+    assert scheduler.run_due() == ["/p"]
+    assert scheduler.dirty_projects == []
+
+
+def test_busy_project_is_backed_up_after_the_interval(clock, make_scheduler):
+    scheduler = make_scheduler(interval_seconds=600, idle_seconds=60)
+    scheduler.mark_dirty("/p")
+    for _ in range(19):
+        clock.now += 30
+        scheduler.mark_dirty("/p")
+        assert scheduler.run_due() == []
+    clock.now += 30
+    scheduler.mark_dirty("/p")
+    assert scheduler.run_due() == ["/p"]
+
+
+def test_max_concurrent_limits_backups_and_oldest_change_goes_first(clock, make_scheduler):
+    scheduler = make_scheduler(interval_seconds=600, idle_seconds=60, max_concurrent=1)
+    scheduler.mark_dirty("/b")
+    clock.now += 1
+    scheduler.mark_dirty("/a")
+    clock.now += 60
+    assert scheduler.run_due() == ["/b"]
+    assert scheduler.run_due() == []
+    finish(scheduler, "/b")
+    assert scheduler.run_due() == ["/a"]
+
+
+def test_project_changed_during_its_backup_waits_for_it(clock, make_scheduler):
+    scheduler = make_scheduler(interval_seconds=600, idle_seconds=60, max_concurrent=2)
+    scheduler.mark_dirty("/p")
+    clock.now += 60
+    assert scheduler.run_due() == ["/p"]
+    scheduler.mark_dirty("/p")
+    clock.now += 60
+    assert scheduler.run_due() == []
+    finish(scheduler, "/p")
+    assert scheduler.run_due() == ["/p"]
+
+
+def test_user_activity_postpones_a_quiet_project(clock, make_scheduler, monkeypatch):
+    monkeypatch.setattr(backup_scheduler, "machine_idle_seconds", lambda: 5)
+    scheduler = make_scheduler(interval_seconds=600, idle_seconds=60)
+    scheduler.mark_dirty("/p")
+    clock.now += 60
+    assert scheduler.run_due() == []
+    clock.now += 540
+    assert scheduler.run_due() == ["/p"]
+
+
+def test_backup_hashes_on_its_own_thread_through_the_throttle(tmp_path, monkeypatch):
+    write_file(str(tmp_path / "a.txt"), "a" * 5000)
+    FileTracker.scan_and_track_untracked_files(str(tmp_path), max_workers=1)
+    read = []
+    fingerprints = FileTracker.get_fingerprints(str(tmp_path), ensure_hashed=True, hash_here=True,
+                                                throttle=read.append)
+    assert fingerprints["a.txt"].hash_is_current
+    assert sum(read) == 5000
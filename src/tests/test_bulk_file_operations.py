@@ -0,0 +1,48 @@
+import os
+from conftest import write_file
+from file_system.bulk_file_operations import BulkFileOperation, outermost_paths, plan_renames
+
+
+def test_outermost_paths_drops_nested_paths():
+    paths = [os.path.join("p", "a", "b"), os.path.join("p", "a"), os.path.join("p", "ab"), os.path.join("p", "a")]
+    assert outermost_paths(paths) == [os.path.join("p", "a"), os.path.join("p", "ab")]
+
+
+def test_plan_renames_reports_collisions(tmp_path):
+    for name in ("img1.jpg", "img2.jpg", "photo2.jpg", "notes.txt"):
+        write_file(str(tmp_path / name))
+    paths = [str(tmp_path / name) for name in ("img1.jpg", "img2.jpg", "notes.txt")]
+    renames, problems = plan_renames(paths, r"^img", "photo")
+    assert renames == [(str(tmp_path / "img1.jpg"), str(tmp_path / "photo1.jpg"))]
+    assert problems == [(str(tmp_path / "img2.jpg"), "'photo2.jpg' already exists")]
+
+
+def test_plan_renames_rejects_names_that_would_collide_with_each_other(tmp_path):
+    for name in ("a1.txt", "b1.txt"):
+        write_file(str(tmp_path / name))
+    renames, problems = plan_renames([str(tmp_path / "a1.txt"), str(tmp_path / "b1.txt")], r"^[ab]", "c")
+    assert len(renames) == 1
+    assert len(problems) == 1
+
+
+def test_delete_removes_files_and_folders(tmp_path):
+    write_file(str(tmp_path / "dir" / "sub" / "a.txt"))
+    write_file(str(tmp_path / "dir" / "b.txt"))
+    write_file(str(tmp_path / "c.txt"))
+    write_file(str(tmp_path / "kept.txt"))
+    result = BulkFileOperation(max_workers=2).delete([str(tmp_path / "dir"), str(tmp_path / "dir" / "b.txt"),
+                                                      str(tmp_path / "c.txt")])
+    assert result.errors == []
+    assert result.items_done == result.items_total == 2
+    assert result.files_done == 3
+    assert sorted(os.listdir(tmp_path)) == ["kept.txt"]
+
+
+def test_move_does_not_overwrite(tmp_path):
+    write_file(str(tmp_path / "a.txt"), "new")
+    write_file(str(tmp_path / "b.txt"))
+    write_file(str(tmp_path / "dest" / "a.txt"), "old")
+    result = BulkFileOperation().move([str(tmp_path / "a.txt"), str(tmp_path / "b.txt")], str(tmp_path / "dest"))
+    assert [path for path, _ in result.errors] == [str(tmp_path / "a.txt")]
+    assert (tmp_path / "dest" / "a.txt").read_text() == "old"
+    assert (tmp_path / "dest" / "b.txt").exists()
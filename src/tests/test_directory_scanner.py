@@ -0,0 +1,70 @@
+import os
+import time
+from file_monitoring.directory_scanner import DirectoryScanner
+from file_monitoring.tracker_store import TrackerStore
+from tests.conftest import write_file
+
+
+def backdate_dirs(root, seconds=3600):
+    """Move directory mtimes out of the scanner's racy window."""
+    past = time.time() - seconds
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (past, past))
+
+
+def make_tree(root):
+    for path in ("a.txt", "src/main.py", "src/pkg/util.py", "docs/readme.md"):
+        write_file(os.path.join(root, path))
+
+
+def scan(root):
+    scanner = DirectoryScanner(lambda path, is_dir=None: TrackerStore.is_store_file(path), max_workers=2)
+    return scanner.scan(str(root), TrackerStore.open(str(root)))
+
+
+def test_first_scan_tracks_every_file(tmp_path):
+    make_tree(tmp_path)
+    stats = scan(tmp_path)
+    store = TrackerStore.open(str(tmp_path))
+    assert stats.new_files == 4
+    assert sorted(store.files_under()) == sorted(
+        os.path.join(*p.split("/")) for p in ("a.txt", "src/main.py", "src/pkg/util.py", "docs/readme.md"))
+
+
+def test_rescan_of_unchanged_tree_skips_every_directory(tmp_path):
+    make_tree(tmp_path)
+    # Open the store first so that creating its database does not touch the root's mtime
+    TrackerStore.open(str(tmp_path))
+    backdate_dirs(tmp_path)
+    first = scan(tmp_path)
+    assert first.dirs_scanned == 4
+
+    second = scan(tmp_path)
+    assert second.dirs_scanned == 0
+    assert second.dirs_skipped == 4
+    assert second.new_files == 0
+
+
+def test_snapshot_records_the_directory_not_its_last_file(tmp_path):
+    make_tree(tmp_path)
+    TrackerStore.open(str(tmp_path))
+    backdate_dirs(tmp_path)
+    scan(tmp_path)
+    snapshot = TrackerStore.open(str(tmp_path)).get_snapshot("src")
+    st = os.stat(os.path.join(tmp_path, "src"))
+    assert (snapshot.mtime_ns, snapshot.inode) == (st.st_mtime_ns, st.st_ino)
+
+
+def test_rescan_lists_a_changed_directory_again(tmp_path):
+    make_tree(tmp_path)
+    TrackerStore.open(str(tmp_path))
+    backdate_dirs(tmp_path)
+    scan(tmp_path)
+
+    write_file(os.path.join(tmp_path, "src", "pkg", "new.py"))
+    past = time.time() - 60
+    os.utime(os.path.join(tmp_path, "src", "pkg"), (past, past))
+    stats = scan(tmp_path)
+    assert stats.dirs_scanned == 1
+    assert stats.new_files == 1
+    assert os.path.join("src", "pkg", "new.py") in TrackerStore.open(str(tmp_path))
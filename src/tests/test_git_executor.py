@@ -0,0 +1,84 @@
+import os
+import threading
+import subprocess
+import pytest
+from conftest import process_events_until
+from version_management import git_executor
+from version_management.git_executor import GitExecutor
+
+
+class FakeGit:
+    """Stands in for subprocess.run; the first command blocks until released."""
+
+    def __init__(self):
+        self.commands = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, args, cwd, **kwargs):
+        self.commands.append((cwd, args[1:]))
+        if len(self.commands) == 1:
+            self.started.set()
+            self.release.wait(5)
+        return subprocess.CompletedProcess(args, 0, b"", b"")
+
+
+@pytest.fixture
+def fake_git(monkeypatch):
+    fake = FakeGit()
+    monkeypatch.setattr(git_executor.subprocess, "run", fake)
+    yield fake
+    fake.release.set()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    os.makedirs(tmp_path / "repo" / ".git")
+    return str(tmp_path / "repo")
+
+
+@pytest.fixture
+def executor(qapp):
+    executor = GitExecutor()
+    executor.results = []
+    executor.command_finished.connect(executor.results.append)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_adds_queued_behind_a_running_command_merge_and_keep_order(qapp, fake_git, repo, executor):
+    executor.commit(repo, "first")
+    assert fake_git.started.wait(5)
+    executor.add([os.path.join(repo, "a.txt"), os.path.join(repo, "b.txt")])
+    executor.add([os.path.join(repo, "c.txt"), os.path.join(repo, "a.txt")])
+    executor.push(repo)
+    executor.add([os.path.join(repo, "d.txt")])
+    fake_git.release.set()
+
+    assert process_events_until(qapp, lambda: len(executor.results) == 4)
+    assert fake_git.commands == [
+        (repo, ["commit", "-m", "first"]),
+        (repo, ["add", "--", "a.txt", "b.txt", "c.txt"]),
+        (repo, ["push", "origin"]),
+        (repo, ["add", "--", "d.txt"]),
+    ]
+    assert [result.action for result in executor.results] == ["commit", "add", "push", "add"]
+
+
+def test_long_adds_are_split_at_the_length_limit(qapp, fake_git, repo, executor, monkeypatch):
+    monkeypatch.setattr(git_executor, "MAX_ARGS_LENGTH", 40)
+    fake_git.release.set()
+    names = [f"file_{i:03}.txt" for i in range(10)]
+    executor.add([os.path.join(repo, name) for name in names])
+
+    assert process_events_until(qapp, lambda: len(executor.results) == 4)
+    chunks = [args[2:] for _, args in fake_git.commands]
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    assert all(sum(len(name) + 1 for name in chunk) <= 40 for chunk in chunks)
+    assert [name for chunk in chunks for name in chunk] == names
+
+
+def test_paths_outside_a_repository_are_returned(fake_git, tmp_path, executor):
+    outside = str(tmp_path / "loose.txt")
+    assert executor.add([outside]) == [outside]
+    assert fake_git.commands == []
@@ -0,0 +1,43 @@
+import os
+from version_management.git_status_cache import (parse_porcelain_v2, RepoStatus,
+                                                  CONFLICTED, MODIFIED, STAGED, UNTRACKED)
+
+OUTPUT = "\0".join([
+    "# branch.head main",
+    "1 .M N... 100644 100644 100644 abc abc src/main.py",
+    "1 M. N... 100644 100644 100644 abc def README.md",
+    "2 R. N... 100644 100644 100644 abc abc R100 src/new name.py",
+    "src/old name.py",
+    "u UU N... 100644 100644 100644 100644 a b c docs/conflict.md",
+    "? notes/",
+    "? scratch.txt",
+]) + "\0"
+
+
+def test_parse_porcelain_v2():
+    assert parse_porcelain_v2(OUTPUT) == {
+        "src/main.py": MODIFIED,
+        "README.md": STAGED,
+        "src/new name.py": STAGED,
+        "docs/conflict.md": CONFLICTED,
+        "notes/": UNTRACKED,
+        "scratch.txt": UNTRACKED,
+    }
+
+
+def test_repo_status_rolls_states_up_to_folders(tmp_path):
+    repo = str(tmp_path)
+    status = RepoStatus(repo, parse_porcelain_v2(OUTPUT))
+    assert status.status_of(os.path.join(repo, "src")) == MODIFIED
+    assert status.status_of(os.path.join(repo, "docs")) == CONFLICTED
+    assert status.status_of(repo) == CONFLICTED
+    assert status.status_of(os.path.join(repo, "notes", "todo.txt")) == UNTRACKED
+    assert status.status_of(os.path.join(repo, "src", "clean.py")) is None
+
+
+def test_changed_paths_between_statuses(tmp_path):
+    repo = str(tmp_path)
+    before = RepoStatus(repo, {"a.py": MODIFIED})
+    after = RepoStatus(repo, {"a.py": STAGED})
+    assert sorted(after.changed_paths(before)) == sorted([os.path.join(repo, "a.py"), repo])
+    assert sorted(after.changed_paths(None)) == sorted([os.path.join(repo, "a.py"), repo])
@@ -0,0 +1,101 @@
+import os
+import time
+import threading
+import pytest
+from conftest import write_file
+from file_monitoring.hybrid_watcher import HybridWatcher
+
+pytestmark = pytest.mark.skipif(not HybridWatcher.is_supported(), reason="inotify is Linux only")
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def queue_event(self, path):
+        with self._lock:
+            self.events.append(("changed", path))
+
+    def apply_move(self, src, dest):
+        with self._lock:
+            self.events.append(("moved", src, dest))
+
+    def apply_delete(self, path):
+        with self._lock:
+            self.events.append(("deleted", path))
+
+    def wait_for(self, *events, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if all(event in self.events for event in events):
+                    return True
+            time.sleep(0.02)
+        return False
+
+
+@pytest.fixture
+def make_watcher():
+    watchers = []
+
+    def make(root, max_watches=0, cold_seconds=600):
+        handler = RecordingHandler()
+        watcher = HybridWatcher(lambda path, is_dir=None: False, max_watches=max_watches,
+                                poll_seconds=3600, cold_seconds=cold_seconds)
+        watchers.append(watcher)
+        watcher.add_tree(str(root), handler)
+        return watcher, handler
+
+    yield make
+    for watcher in watchers:
+        watcher.stop()
+
+
+def polled_tree(tmp_path):
+    """root/a/b where b is the coldest directory, so a two-watch budget polls it."""
+    root = tmp_path / "root"
+    os.makedirs(root / "a" / "b")
+    write_file(str(root / "a" / "b" / "f.txt"))
+    os.utime(root / "a" / "b", (time.time() - 3600, time.time() - 3600))
+    return root
+
+
+def test_rename_in_watched_directory_is_a_move(tmp_path, make_watcher):
+    root = tmp_path / "root"
+    write_file(str(root / "x.txt"))
+    watcher, handler = make_watcher(root)
+    os.rename(root / "x.txt", root / "y.txt")
+    assert handler.wait_for(("moved", str(root / "x.txt"), str(root / "y.txt")))
+
+
+def test_cold_directory_is_polled(tmp_path, make_watcher):
+    root = polled_tree(tmp_path)
+    watcher, handler = make_watcher(root, max_watches=2)
+    assert list(watcher._polled) == [str(root / "a" / "b")]
+    write_file(str(root / "a" / "b" / "g.txt"))
+    os.remove(root / "a" / "b" / "f.txt")
+    watcher._poll()
+    assert handler.wait_for(("changed", str(root / "a" / "b" / "g.txt")),
+                            ("deleted", str(root / "a" / "b" / "f.txt")))
+
+
+def test_new_file_in_polled_directory_survives_parent_rename(tmp_path, make_watcher):
+    root = polled_tree(tmp_path)
+    watcher, handler = make_watcher(root, max_watches=2)
+    write_file(str(root / "a" / "b" / "g.txt"))
+    os.rename(root / "a", root / "a2")
+    assert handler.wait_for(("moved", str(root / "a"), str(root / "a2")),
+                            ("changed", str(root / "a2" / "b" / "g.txt")))
+
+
+def test_rename_in_polled_directory_survives_parent_rename(tmp_path, make_watcher):
+    root = polled_tree(tmp_path)
+    watcher, handler = make_watcher(root, max_watches=2, cold_seconds=0)
+    os.rename(root / "a" / "b" / "f.txt", root / "a" / "b" / "f2.txt")
+    os.rename(root / "a", root / "a2")
+    assert handler.wait_for(("moved", str(root / "a"), str(root / "a2")),
+                            ("deleted", str(root / "a2" / "b" / "f.txt")),
+                            ("changed", str(root / "a2" / "b" / "f2.txt")))
+    moved = handler.events.index(("moved", str(root / "a"), str(root / "a2")))
+    assert handler.events.index(("deleted", str(root / "a2" / "b" / "f.txt"))) > moved
@@ -0,0 +1,66 @@
+import os
+from conftest import write_file
+from file_monitoring.file_tracker import FileTracker
+from file_monitoring.ignore_matcher import IgnoreMatcher
+from file_monitoring.tracker_store import TrackerStore
+
+
+def test_root_patterns_only_match_directly_under_a_project_root(tmp_path):
+    project = tmp_path / "project"
+    for directory in ("backups", "working_versions", ".snapshots", "src/backups"):
+        os.makedirs(project / directory)
+    TrackerStore.open(str(project))
+    matcher = IgnoreMatcher(FileTracker.ignored_patterns, root_marker=TrackerStore.db_file_name)
+
+    assert matcher.is_ignored(str(project / "backups"), True)
+    assert matcher.is_ignored(str(project / "backups" / "old.zip"), False)
+    assert matcher.is_ignored(str(project / "working_versions"), True)
+    assert matcher.is_ignored(str(project / ".snapshots"), True)
+    assert not matcher.is_ignored(str(project / "src" / "backups"), True)
+    assert not matcher.is_ignored(str(project / "src" / "backups" / "data.csv"), False)
+
+
+def test_root_patterns_need_a_project_root(tmp_path):
+    os.makedirs(tmp_path / "folder" / "backups")
+    matcher = IgnoreMatcher(FileTracker.ignored_patterns, root_marker=TrackerStore.db_file_name)
+    assert not matcher.is_ignored(str(tmp_path / "folder" / "backups"), True)
+
+
+def test_root_pattern_with_trailing_slash_only_matches_directories(tmp_path):
+    project = tmp_path / "project"
+    write_file(str(project / "backups"))
+    TrackerStore.open(str(project))
+    matcher = IgnoreMatcher(FileTracker.ignored_patterns, root_marker=TrackerStore.db_file_name)
+    assert not matcher.is_ignored(str(project / "backups"), False)
+
+
+def test_gitignore_negation_re_includes_a_file(tmp_path):
+    write_file(str(tmp_path / ".gitignore"), "*.csv\n!keep.csv\nbuild/\n")
+    matcher = IgnoreMatcher(['.git'])
+    assert matcher.is_ignored(str(tmp_path / "data.csv"), False)
+    assert not matcher.is_ignored(str(tmp_path / "keep.csv"), False)
+    assert matcher.is_ignored(str(tmp_path / "build"), True)
+    assert not matcher.is_ignored(str(tmp_path / "build"), False)
+
+
+def test_files_below_an_ignored_directory_are_ignored(tmp_path):
+    write_file(str(tmp_path / ".gitignore"), "/out\n")
+    matcher = IgnoreMatcher(['.git'])
+    assert matcher.is_ignored(str(tmp_path / "out" / "deep" / "file.txt"), False)
+    assert not matcher.is_ignored(str(tmp_path / "src" / "out"), True)
+
+
+def test_invalidate_picks_up_a_changed_gitignore(tmp_path):
+    write_file(str(tmp_path / ".gitignore"), "")
+    matcher = IgnoreMatcher(['.git'])
+    assert not matcher.is_ignored(str(tmp_path / "a.tmp2"), False)
+    write_file(str(tmp_path / ".gitignore"), "*.tmp2\n")
+    matcher.invalidate(str(tmp_path))
+    assert matcher.is_ignored(str(tmp_path / "a.tmp2"), False)
+
+
+def test_builtin_patterns_match_names_and_globs():
+    matcher = IgnoreMatcher(FileTracker.ignored_patterns, use_gitignore=False)
+    assert matcher.matches(os.path.join("project", "node_modules", "x.js"))
+    assert matcher.matches(os.path.join("project", "module.pyc"))
+    assert not matcher.matches(os.path.join("project", "src", "backups", "x.py"))
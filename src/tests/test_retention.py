@@ -0,0 +1,83 @@
+import os
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from conftest import write_file
+from version_management.retention import RetentionPolicy, prune_project, space_report
+from version_management.snapshot_store import SnapshotStore
+
+FakeBackup = namedtuple('FakeBackup', 'label created')
+
+
+def backups_at(*times):
+    return [FakeBackup(t.isoformat(), t.timestamp()) for t in times]
+
+
+def test_keep_last_keeps_the_newest():
+    now = datetime(2026, 10, 18, 12)
+    backups = backups_at(*(now - timedelta(minutes=m) for m in range(10)))
+    kept = RetentionPolicy(keep_last=3, keep_hourly=0, keep_daily=0, keep_weekly=0).select_kept(backups)
+    assert kept == backups[:3]
+
+
+def test_newest_backup_is_always_kept():
+    backups = backups_at(datetime(2026, 10, 18, 12), datetime(2026, 10, 17, 12))
+    kept = RetentionPolicy(keep_last=0, keep_hourly=0, keep_daily=0, keep_weekly=0).select_kept(backups)
+    assert kept == backups[:1]
+
+
+def test_keep_daily_keeps_the_newest_of_each_day():
+    now = datetime(2026, 10, 18, 12)
+    # Three backups a day over five days
+    times = [now - timedelta(days=d, hours=h) for d in range(5) for h in (0, 2, 4)]
+    backups = backups_at(*times)
+    kept = RetentionPolicy(keep_last=1, keep_hourly=0, keep_daily=3, keep_weekly=0).select_kept(backups)
+    assert [b.created for b in kept] == [(now - timedelta(days=d)).timestamp() for d in range(3)]
+
+
+def test_prune_project_removes_archives_and_unreferenced_blobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(SnapshotStore, "storage_root", str(tmp_path / "storage"))
+    project = tmp_path / "project"
+    archives = []
+    for age in range(5):
+        archive = project / "backups" / f"backup_{age}.zip"
+        write_file(str(archive))
+        created = time.time() - age * 60
+        os.utime(archive, (created, created))
+        archives.append(archive)
+    store = SnapshotStore.for_project(str(project))
+    write_file(str(tmp_path / "orphan.txt"), "not in any snapshot")
+    digest, _ = store.put_file(str(tmp_path / "orphan.txt"))
+
+    result = prune_project(str(project), RetentionPolicy(keep_last=2, keep_hourly=0, keep_daily=0, keep_weekly=0),
+                           grace_seconds=0)
+
+    assert result.backups_removed == 3
+    assert result.blobs_removed == 1
+    assert [a.exists() for a in archives] == [True, True, False, False, False]
+    assert not store.has_blob(digest)
+
+
+def test_prune_project_thins_legacy_7z_archives(tmp_path, monkeypatch):
+    monkeypatch.setattr(SnapshotStore, "storage_root", str(tmp_path / "storage"))
+    project = tmp_path / "project"
+    newest = datetime(2026, 10, 18, 12)
+    archives = []
+    for day in range(4):
+        stamp = (newest - timedelta(days=day)).strftime("%Y%m%d_%H%M%S")
+        archive = project / "backups" / f"project_v{4 - day}_{stamp}.7z"
+        write_file(str(archive), "7z data")
+        archives.append(archive)
+    # The name carries the creation time; the mtime of a copied archive does not
+    os.utime(archives[-1], (time.time(), time.time()))
+    policy = RetentionPolicy(keep_last=2, keep_hourly=0, keep_daily=0, keep_weekly=0)
+
+    report = space_report(str(project), policy)
+    assert report.backup_counts["backups"] == 4
+    assert report.legacy_archive_count == 4
+    assert report.prunable_count == 2
+    assert report.prunable_bytes == 2 * len("7z data")
+
+    result = prune_project(str(project), policy, grace_seconds=0)
+    assert result.backups_removed == 2
+    assert [a.exists() for a in archives] == [True, True, False, False]
@@ -0,0 +1,95 @@
+import os
+import time
+import threading
+from file_system.size_cache_store import SizeCacheStore
+
+
+def journal_rows(store):
+    if not os.path.exists(store.journal_path):
+        return 0
+    with open(store.journal_path, encoding='utf-8') as f:
+        return len(f.read().splitlines())
+
+
+def test_entries_survive_a_reload(tmp_path):
+    store = SizeCacheStore(cache_dir=str(tmp_path))
+    store.put("/a", 10, 100)
+    store.put("/b", 20, 200)
+    store.put("/c", 30, 300)
+    store.discard("/c")
+    store.close()
+    assert journal_rows(store) == 4
+
+    reloaded = SizeCacheStore(cache_dir=str(tmp_path))
+    assert reloaded.get("/a") == (10, 100)
+    assert reloaded.get("/b") == (20, 200)
+    assert reloaded.get("/c") is None
+    assert len(reloaded) == 2
+
+
+def test_threshold_flush_runs_on_the_writer_thread(tmp_path):
+    store = SizeCacheStore(cache_dir=str(tmp_path), flush_threshold=3)
+    threads = []
+    append_pending = store._append_pending
+
+    def recording_append_pending():
+        threads.append(threading.current_thread().name)
+        return append_pending()
+
+    store._append_pending = recording_append_pending
+    store.put("/a", 1, 1)
+    store.put("/b", 2, 2)
+    assert threads == []
+    store.put("/c", 3, 3)
+    store._join_writer()
+    assert threads == ["SizeCacheWriter"]
+    assert journal_rows(store) == 3
+    store.close()
+
+
+def test_compaction_rotates_the_journal(tmp_path):
+    store = SizeCacheStore(cache_dir=str(tmp_path), flush_threshold=10, compact_ratio=2.0)
+    # 21 journal rows for a single entry passes 2 x max(entries, flush_threshold)
+    for size in range(21):
+        store.put("/a", size, size)
+        store.flush()
+    store._join_writer()
+    assert journal_rows(store) == 0
+    with open(store.snapshot_path, encoding='utf-8') as f:
+        assert f.read().splitlines()[1:] == [f"/a,20,20,{store._entries['/a'][2]}"]
+    store.close()
+    assert SizeCacheStore(cache_dir=str(tmp_path)).get("/a") == (20, 20)
+
+
+def test_journal_below_the_ratio_is_not_compacted(tmp_path):
+    store = SizeCacheStore(cache_dir=str(tmp_path), flush_threshold=10, compact_ratio=2.0)
+    for size in range(20):
+        store.put("/a", size, size)
+        store.flush()
+    store.close()
+    assert journal_rows(store) == 20
+    assert not os.path.exists(store.snapshot_path)
+
+
+def test_old_entries_expire_on_load(tmp_path):
+    now = int(time.time())
+    with open(tmp_path / "file_sizes.journal", 'w', encoding='utf-8') as f:
+        f.write(f"/old,1,1,{now - 7200}\n/new,2,2,{now}\n")
+    store = SizeCacheStore(cache_dir=str(tmp_path), max_age_seconds=3600)
+    assert store.get("/old") is None
+    assert store.get("/new") == (2, 2)
+
+
+def test_torn_last_journal_line_is_skipped(tmp_path):
+    now = int(time.time())
+    with open(tmp_path / "file_sizes.journal", 'w', encoding='utf-8') as f:
+        f.write(f"/a,1,1,{now}\n/b,2,2,{now}\n/c,3,")
+    store = SizeCacheStore(cache_dir=str(tmp_path))
+    assert store.get("/a") == (1, 1)
+    assert store.get("/b") == (2, 2)
+    assert store.get("/c") is None
+    store.put("/d", 4, 4)
+    store.close()
+    reloaded = SizeCacheStore(cache_dir=str(tmp_path))
+    assert reloaded.get("/b") == (2, 2)
+    assert reloaded.get("/d") == (4, 4)
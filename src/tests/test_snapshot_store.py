@@ -0,0 +1,84 @@
+import os
+from conftest import write_file
+from file_monitoring.file_tracker import FileTracker
+from file_monitoring.tracker_store import Fingerprint
+from version_management.backup_reader import SnapshotBackup
+from version_management.snapshot_store import SnapshotStore
+
+CONTENTS = {
+    "a.txt": "alpha",
+    os.path.join("src", "main.py"): "print('hi')\n" * 500,
+    os.path.join("src", "copy.py"): "print('hi')\n" * 500,
+    os.path.join("docs", "empty.md"): "",
+}
+
+
+def make_project(tmp_path):
+    project = tmp_path / "project"
+    for name, content in CONTENTS.items():
+        write_file(str(project / name), content)
+    FileTracker.scan_and_track_untracked_files(str(project), max_workers=1)
+    return str(project)
+
+
+def fingerprints(project):
+    return FileTracker.get_fingerprints(project, ensure_hashed=True, hash_here=True)
+
+
+def blob_count(store):
+    return store.blob_usage()[0]
+
+
+def test_identical_contents_share_one_blob(tmp_path):
+    project = make_project(tmp_path)
+    store = SnapshotStore(str(tmp_path / "store"))
+    result = store.create_snapshot(project, fingerprints(project), "backups", "first")
+    assert result.file_count == 4
+    assert result.new_blobs == 3
+    assert blob_count(store) == 3
+
+
+def test_unchanged_tree_writes_no_new_blobs(tmp_path):
+    project = make_project(tmp_path)
+    store = SnapshotStore(str(tmp_path / "store"))
+    store.create_snapshot(project, fingerprints(project), "backups", "first")
+    result = store.create_snapshot(project, fingerprints(project), "backups", "second")
+    assert result.new_blobs == 0
+    assert result.bytes_written == 0
+    assert blob_count(store) == 3
+    assert store.matches_latest("backups", fingerprints(project))
+
+
+def test_changed_content_writes_exactly_one_blob(tmp_path):
+    project = make_project(tmp_path)
+    store = SnapshotStore(str(tmp_path / "store"))
+    store.create_snapshot(project, fingerprints(project), "backups", "first")
+    write_file(os.path.join(project, "a.txt"), "alpha, edited")
+    assert not store.matches_latest("backups", fingerprints(project))
+    result = store.create_snapshot(project, fingerprints(project), "backups", "second")
+    assert result.new_blobs == 1
+    assert blob_count(store) == 4
+
+
+def test_unhashed_file_is_stored_under_its_content_hash(tmp_path):
+    project = make_project(tmp_path)
+    store = SnapshotStore(str(tmp_path / "store"))
+    unhashed = {"a.txt": Fingerprint(5, 0, None, None)}
+    result = store.create_snapshot(project, unhashed, "backups", "first")
+    digest = store.load_manifest(result.manifest_path)["files"]["a.txt"][0]
+    assert digest == fingerprints(project)["a.txt"].hash
+
+
+def test_manifest_round_trips_through_restore(tmp_path):
+    project = make_project(tmp_path)
+    store = SnapshotStore(str(tmp_path / "store"))
+    result = store.create_snapshot(project, fingerprints(project), "backups", "first")
+    backup = SnapshotBackup(store, result.manifest_path, "backups")
+    assert sorted(m.name for m in backup.members()) == sorted(n.replace(os.sep, "/") for n in CONTENTS)
+
+    restored = tmp_path / "restored"
+    files, size = backup.extract("", str(restored))
+    assert files == len(CONTENTS)
+    assert size == sum(len(content) for content in CONTENTS.values())
+    for name, content in CONTENTS.items():
+        assert (restored / name).read_text() == content
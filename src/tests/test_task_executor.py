@@ -0,0 +1,100 @@
+import threading
+import pytest
+from conftest import process_events_until
+from task_execution.task_executor import TaskExecutor, QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED
+
+
+@pytest.fixture
+def executor(qapp):
+    executor = TaskExecutor(limits={"scan": 1, "io": 2})
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def record(task):
+    events = []
+    task.succeeded.connect(lambda result: events.append(("succeeded", result)))
+    task.failed.connect(lambda message: events.append(("failed", message)))
+    task.cancelled.connect(lambda: events.append(("cancelled",)))
+    task.finished.connect(lambda: events.append(("finished",)))
+    return events
+
+
+def blocking(release):
+    def fn(task):
+        release.wait(5)
+        return task.title
+    return fn
+
+
+def test_task_succeeds_with_its_result(qapp, executor):
+    task = executor.submit("io", "add", lambda task, a, b: a + b, 2, 3)
+    events = record(task)
+    assert process_events_until(qapp, lambda: ("finished",) in events)
+    assert events == [("succeeded", 5), ("finished",)]
+    assert task.state == SUCCEEDED
+
+
+def test_category_limit_queues_while_other_categories_start(qapp, executor):
+    release = threading.Event()
+    first_scan = executor.submit("scan", "scan 1", blocking(release))
+    second_scan = executor.submit("scan", "scan 2", blocking(release))
+    io = executor.submit("io", "io", blocking(release))
+    assert process_events_until(qapp, lambda: first_scan.state == RUNNING and io.state == RUNNING)
+    assert second_scan.state == QUEUED
+    release.set()
+    assert process_events_until(qapp, lambda: second_scan.state == SUCCEEDED)
+    assert first_scan.state == io.state == SUCCEEDED
+
+
+def test_cancelling_a_queued_task_never_runs_it(qapp, executor):
+    release = threading.Event()
+    ran = []
+    executor.submit("scan", "blocker", blocking(release))
+    queued = executor.submit("scan", "queued", lambda task: ran.append(task))
+    events = record(queued)
+    queued.cancel()
+    assert process_events_until(qapp, lambda: ("finished",) in events)
+    release.set()
+    process_events_until(qapp, lambda: not executor._active)
+    assert events == [("cancelled",), ("finished",)]
+    assert queued.state == CANCELLED
+    assert ran == []
+
+
+def test_check_cancelled_ends_a_running_task(qapp, executor):
+    started = threading.Event()
+    callbacks = []
+
+    def fn(task):
+        started.set()
+        while True:
+            task.check_cancelled()
+            task.cancel_event.wait(0.01)
+
+    task = executor.submit("io", "loop", fn)
+    task.on_cancel(lambda: callbacks.append(True))
+    events = record(task)
+    assert process_events_until(qapp, started.is_set)
+    task.cancel()
+    assert process_events_until(qapp, lambda: ("finished",) in events)
+    assert events == [("cancelled",), ("finished",)]
+    assert task.state == CANCELLED
+    assert callbacks == [True]
+
+
+def test_failed_carries_the_exception_text(qapp, executor):
+    def fn(task):
+        raise ValueError("disk on fire")
+
+    task = executor.submit("io", "fail", fn)
+    events = record(task)
+    assert process_events_until(qapp, lambda: ("finished",) in events)
+    assert events == [("failed", "disk on fire"), ("finished",)]
+    assert task.state == FAILED
+    assert task.error == "disk on fire"
+
+
+def test_unknown_category_is_rejected(executor):
+    with pytest.raises(ValueError):
+        executor.submit("nope", "x", lambda task: None)
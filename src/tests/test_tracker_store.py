@@ -0,0 +1,94 @@
+import os
+from file_monitoring.tracker_store import TrackerStore, DirSnapshot
+
+
+def path(*parts):
+    return os.path.join(*parts)
+
+
+def test_add_many_tracks_each_path_once(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    assert store.add_many([path("src", "a.py"), path("src", "b.py")]) == 2
+    assert store.add_many([path("src", "a.py"), "c.txt"]) == 1
+    assert len(store) == 3
+    assert path("src", "a.py") in store
+
+
+def test_open_returns_the_shared_store_and_find_walks_up(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    os.makedirs(tmp_path / "src" / "pkg")
+    assert TrackerStore.open(str(tmp_path)) is store
+    assert TrackerStore.find(str(tmp_path / "src" / "pkg")) is store
+
+
+def test_remove_untracks_directories_by_prefix(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    # "src0" sorts right after "src/" and must survive removing src
+    store.add_many([path("src", "a.py"), path("src", "pkg", "b.py"), path("src0", "c.py"), "src.txt"])
+    assert store.remove(["src"]) == 2
+    assert sorted(store.files_under()) == sorted([path("src0", "c.py"), "src.txt"])
+
+
+def test_move_rekeys_a_directory_and_keeps_fingerprints(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    store.update_stats({path("old", "a.py"): (10, 1), path("old", "sub", "b.py"): (20, 2)})
+    store.set_hashes([(path("old", "a.py"), 10, 1, "aaaa")])
+    assert store.move("old", "new") == 2
+    assert store.files_under("new") == ["a.py", path("sub", "b.py")]
+    assert store.files_under("old") == []
+    assert store.fingerprint(path("new", "a.py")).hash == "aaaa"
+    assert store.fingerprint(path("new", "a.py")).hash_is_current
+
+
+def test_move_of_untracked_path_changes_nothing(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    store.add_many(["a.py"])
+    assert store.move("missing", "b.py") == 0
+    assert store.files_under() == ["a.py"]
+
+
+def test_update_stats_returns_only_changed_files(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    assert store.update_stats({"a.py": (1, 100), "b.py": (2, 200)}) == ["a.py", "b.py"]
+    assert store.update_stats({"a.py": (1, 100), "b.py": (3, 300)}) == ["b.py"]
+
+
+def test_set_hashes_tells_an_edit_from_a_touch(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    store.update_stats({"a.py": (1, 100)})
+    assert store.set_hashes([("a.py", 1, 100, "h1")]) == ["a.py"]
+    store.update_stats({"a.py": (1, 200)})
+    assert not store.fingerprint("a.py").hash_is_current
+    assert store.set_hashes([("a.py", 1, 200, "h1")]) == []
+
+
+def test_snapshots_are_saved_and_removed_by_prefix(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    snapshot = DirSnapshot(1, 2, 3, False, ("pkg",))
+    store.save_snapshots({"src": snapshot, path("src", "pkg"): snapshot, "docs": snapshot})
+    assert store.get_snapshot("src") == snapshot
+    store.remove_snapshots(["src"])
+    assert store.get_snapshot("src") is None
+    assert store.get_snapshot(path("src", "pkg")) is None
+    assert store.get_snapshot("docs") == snapshot
+
+
+def test_store_persists_across_reopen(tmp_path):
+    store = TrackerStore.open(str(tmp_path))
+    store.update_stats({path("src", "a.py"): (5, 50)})
+    store.set_hashes([(path("src", "a.py"), 5, 50, "hash")])
+    store.save_snapshots({"src": DirSnapshot(1, 2, 1, False, ())})
+    TrackerStore.close_all()
+
+    reopened = TrackerStore.open(str(tmp_path))
+    assert reopened is not store
+    assert reopened.files_under() == [path("src", "a.py")]
+    assert reopened.fingerprint(path("src", "a.py")).hash == "hash"
+    assert reopened.get_snapshot("src") == DirSnapshot(1, 2, 1, False, ())
+
+
+def test_legacy_json_tracker_is_imported(tmp_path):
+    with open(tmp_path / TrackerStore.legacy_file_name, 'w') as f:
+        f.write('{"src": ["a.py", "b.py"]}')
+    store = TrackerStore.open(str(tmp_path))
+    assert sorted(store.files_under()) == [path("src", "a.py"), path("src", "b.py")]
@@ -1,111 +1,161 @@
 import sys
 import os
+import re
+import time
+from datetime import datetime
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton,
                              QTreeView, QSplitter, QLabel, QLineEdit, QComboBox, QTextEdit,
                              QFileDialog, QMenu, QMessageBox, QPlainTextEdit, QDialog,
                              QDialogButtonBox, QInputDialog, QHeaderView, QMenuBar,
-                             QTreeWidget, QTreeWidgetItem)
-from PyQt6.QtCore import Qt, QDir, QDateTime, QCoreApplication
+                             QTreeWidget, QTreeWidgetItem, QProgressDialog)
+from PyQt6.QtCore import Qt, QDir, QDateTime, QCoreApplication, QTimer, QLocale
 from PyQt6.QtGui import QIcon, QAction
 from file_system.custom_file_system_model import CustomFileSystemModel
+from file_system.ignore_filter_proxy_model import IgnoreFilterProxyModel
+from file_system.bulk_file_operations import BulkFileOperation, ArchiveJob, outermost_paths, plan_renames
 from context_menu.context_menu import ContextMenu
-from project_creation.project_creation_thread import ProjectCreationThread
-from file_monitoring.file_monitor_thread import FileMonitorThread
+from project_creation.project_creator import ProjectCreator
+from file_monitoring.file_monitor_service import FileMonitorService
 from config.config_manager import ConfigManager  # Import ConfigManager
 from version_management.version_manager import VersionManager
+from version_management.snapshot_store import SnapshotStore
+from version_management.archive_writer import ArchiveWriter, ArchiveCancelled
+from version_management.backup_reader import list_backups
+from version_management.backup_scheduler import BackupScheduler
+from version_management.git_status_cache import GitStatusCache
+from version_management.repo_maintenance import OPERATIONS, find_repositories, run_maintenance
+from version_management.retention import RetentionPolicy, prune_project, space_report
 from file_monitoring.file_tracker import FileTracker
+from task_execution.task_executor import TaskExecutor, TaskCancelled
 
 
-class FileTrackerThread(QThread):
-    tracker_finished = pyqtSignal(str)
+def scan_projects(task, project_root_dir, incremental=True):
+    def report_progress(stats):
+        task.report(stats.files_seen, 0,
+                    f"Scanning: {stats.dirs_scanned} directories, {stats.files_seen} files, {stats.new_files} new "
+                    f"({stats.files_per_second:.0f} files/s)")
 
-    def __init__(self, project_root_dir):
-        super().__init__()
-        self.project_root_dir = project_root_dir
+    stats = FileTracker.scan_and_track_untracked_files(project_root_dir, progress_callback=report_progress,
+                                                       incremental=incremental)
+    return (f"Scan complete: {stats.dirs_scanned} directories listed, {stats.dirs_skipped} unchanged, "
+            f"{stats.files_seen} files, {stats.new_files} newly tracked in {stats.elapsed:.1f}s "
+            f"({stats.files_per_second:.0f} files/s).")
 
-    def run(self):
-        FileTracker.scan_and_track_untracked_files(self.project_root_dir)
-        self.tracker_finished.emit("Scan complete, file_tracker.json updated.")
 
+def compress_files(task, files_to_compress, output_file, base_dir):
+    started = time.monotonic()
+    files = [(path, os.path.relpath(path, base_dir)) for path in files_to_compress]
+    writer = ArchiveWriter(output_file,
+                           progress_callback=lambda done, total: task.report(done, total),
+                           file_callback=lambda done, total, name: task.report(description=f"{done}/{total}: {name}"))
+    task.on_cancel(writer.cancel)
+    try:
+        members = writer.write(files)
+    except ArchiveCancelled:
+        raise TaskCancelled()
+    return f"Successfully compressed {len(members)} files to {output_file} in {time.monotonic() - started:.1f}s"
 
-class CompressionThread(QThread):
-    compression_finished = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
 
-    def __init__(self, files_to_compress, output_file):
-        super().__init__()
-        self.files_to_compress = files_to_compress
-        self.output_file = output_file
+def take_snapshot(task, project_dir, kind, name, version):
+    started = time.monotonic()
+    fingerprints = FileTracker.get_fingerprints(project_dir, ensure_hashed=True)
+    store = SnapshotStore.for_project(project_dir)
+    result = store.create_snapshot(project_dir, fingerprints, kind, name, version)
+    return (f"Snapshot {name}: {result.file_count} files, {result.new_blobs} new "
+            f"({result.bytes_written / 1024:.1f} KB written) in {time.monotonic() - started:.2f}s")
 
-    def run(self):
-        try:
-            result = subprocess.run(["7z", "a", self.output_file] + self.files_to_compress, check=True,
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.returncode == 0:
-                self.compression_finished.emit(f"Successfully compressed to {self.output_file}")
-            else:
-                raise subprocess.CalledProcessError(result.returncode, result.args, output=result.stdout, stderr=result.stderr)
-        except subprocess.CalledProcessError as e:
-            error_message = e.stderr or e.stdout or str(e)
-            self.error_occurred.emit(f"An error occurred while compressing: {error_message}")
 
+def prune_backups(task, project_dir, policy):
+    result = prune_project(project_dir, policy)
+    return (f"Pruned {result.backups_removed} backup(s) and {result.blobs_removed} unused blob(s) of "
+            f"{os.path.basename(project_dir)}, {result.bytes_freed / (1 << 20):.1f} MB freed")
 
-class FileReadWriteThread(QThread):
-    operation_finished = pyqtSignal(str, str)  # file_path, content or error message
-    error_occurred = pyqtSignal(str)
 
-    def __init__(self, file_path, mode, content=None):
-        super().__init__()
-        self.file_path = file_path
-        self.mode = mode
-        self.content = content
+def restore_backup(task, backup, prefix, dest_dir):
+    started = time.monotonic()
+    files, size = backup.extract(prefix, dest_dir)
+    elapsed = time.monotonic() - started
+    return (f"Restored {files} file(s), {size / 1024:.1f} KB from {backup.label} to {dest_dir} "
+            f"in {elapsed:.2f}s ({size / (1 << 20) / elapsed if elapsed else 0:.1f} MB/s)")
 
-    def run(self):
-        try:
-            if self.mode == 'read':
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                self.operation_finished.emit(self.file_path, content)
-            elif self.mode == 'write':
-                with open(self.file_path, 'w', encoding='utf-8') as f:
-                    f.write(self.content)
-                self.operation_finished.emit(self.file_path, "Save successful")
-        except Exception as e:
-            self.error_occurred.emit(f"An error occurred: {str(e)}")
 
-class DeleteFileThread(QThread):
-    operation_finished = pyqtSignal(str)
-    error_occurred = pyqtSignal(str)
+def maintain_repositories(task, root_dir, operation, max_workers):
+    """Run operation in every repository under root_dir; each RepoReport goes out as a partial result."""
+    repositories = find_repositories(root_dir, FileTracker.is_ignored)
 
-    def __init__(self, file_path):
-        super().__init__()
-        self.file_path = file_path
+    def on_report(report):
+        task.partial_result.emit(report)
+        task.report(task.done + 1, len(repositories), os.path.relpath(report.repo_dir, root_dir))
 
-    def run(self):
-        try:
-            if os.path.isdir(self.file_path):
-                os.rmdir(self.file_path)
-            else:
-                os.remove(self.file_path)
-            self.operation_finished.emit(f"Successfully deleted: {self.file_path}")
-        except Exception as e:
-            self.error_occurred.emit(f"An error occurred while deleting: {e}")
+    return len(run_maintenance(repositories, operation, max_workers, on_report=on_report,
+                               cancel_event=task.cancel_event))
 
-class RenameFileThread(QThread):
-    operation_finished = pyqtSignal(str)
+
+class BackupSchedulerThread(QThread):
+    backup_finished = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, old_path, new_path):
+    def __init__(self, interval_seconds, idle_seconds, max_concurrent, max_bytes_per_second, retention=None,
+                 check_seconds=15):
         super().__init__()
-        self.old_path = old_path
-        self.new_path = new_path
+        self.check_seconds = check_seconds
+        self.scheduler = BackupScheduler(interval_seconds, idle_seconds, max_concurrent, max_bytes_per_second,
+                                         retention, on_finished=self.report_finished, on_error=self.report_error)
 
     def run(self):
-        try:
-            os.rename(self.old_path, self.new_path)
-            self.operation_finished.emit(f"Successfully renamed to: {self.new_path}")
-        except Exception as e:
-            self.error_occurred.emit(f"An error occurred while renaming: {e}")
+        while not self.isInterruptionRequested():
+            self.scheduler.run_due()
+            for _ in range(self.check_seconds * 10):
+                if self.isInterruptionRequested():
+                    break
+                self.msleep(100)
+
+    def stop(self):
+        self.requestInterruption()
+        self.wait()
+        self.scheduler.shutdown()
+
+    def report_finished(self, project_dir, result, pruned):
+        if result is None:
+            self.backup_finished.emit(f"Backup of {os.path.basename(project_dir)} skipped: no content changes")
+            return
+        message = (f"Backed up {os.path.basename(project_dir)}: {result.file_count} files, {result.new_blobs} new "
+                   f"({result.bytes_written / 1024:.1f} KB written) in {result.elapsed:.1f}s")
+        if pruned and pruned.backups_removed:
+            message += f"; pruned {pruned.backups_removed} old backup(s), {pruned.bytes_freed / (1 << 20):.1f} MB freed"
+        self.backup_finished.emit(message)
+
+    def report_error(self, project_dir, message):
+        self.error_occurred.emit(f"Background backup of {project_dir} failed: {message}")
+
+
+def read_text_file(task, file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_text_file(task, file_path, content):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def rename_path(task, old_path, new_path):
+    os.rename(old_path, new_path)
+    return f"Successfully renamed to: {new_path}"
+
+
+def run_bulk_operation(task, operation, max_workers, *args):
+    """Run BulkFileOperation.<operation>(*args), reporting items done and files per second."""
+    def report_progress(items_done, items_total, files_done, current_path):
+        elapsed = task.elapsed()
+        task.report(items_done, items_total,
+                    f"{items_done} of {items_total} items, {files_done} files "
+                    f"({files_done / elapsed if elapsed else 0:.0f} files/s)\n{current_path}")
+
+    bulk = BulkFileOperation(max_workers, report_progress, task.cancel_event)
+    task.on_cancel(bulk.cancel)
+    return getattr(bulk, operation)(*args)
+
 
 class ImageLoadThread(QThread):
     image_loaded = pyqtSignal(QPixmap)
@@ -326,6 +376,230 @@ class TodoApp(QDialog):
                 self.update_task_list_item(task)
                 break
 
+class RestoreDialog(QDialog):
+    def __init__(self, project_dir, tasks, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Restore: {os.path.basename(project_dir)}")
+        self.setGeometry(250, 250, 900, 600)
+        self.project_dir = project_dir
+        self.tasks = tasks
+        self.backups = list_backups(project_dir)
+
+        layout = QVBoxLayout(self)
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        self.backup_list = QTreeWidget()
+        self.backup_list.setHeaderLabels(["Backup", "Kind", "Created"])
+        self.backup_list.setRootIsDecorated(False)
+        for backup in self.backups:
+            created = datetime.fromtimestamp(backup.created).strftime("%Y-%m-%d %H:%M:%S")
+            self.backup_list.addTopLevelItem(QTreeWidgetItem([backup.label, backup.kind, created]))
+        self.backup_list.currentItemChanged.connect(self.show_members)
+        splitter.addWidget(self.backup_list)
+
+        self.member_tree = QTreeWidget()
+        self.member_tree.setHeaderLabels(["Path", "Size"])
+        self.member_tree.setUniformRowHeights(True)
+        splitter.addWidget(self.member_tree)
+        layout.addWidget(splitter)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        restore_button = button_box.addButton("Restore Selected...", QDialogButtonBox.ButtonRole.ActionRole)
+        restore_button.clicked.connect(self.restore_selected)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def show_members(self, current, previous):
+        self.member_tree.clear()
+        if current is None:
+            return
+        backup = self.backups[self.backup_list.indexOfTopLevelItem(current)]
+        if not backup.restorable:
+            QTreeWidgetItem(self.member_tree, ["7z archives are not restored here; extract them with 7-Zip", ""])
+            return
+        folders = {"": self.member_tree.invisibleRootItem()}
+        for member in sorted(backup.members()):
+            parent_path, _, name = member.name.rpartition('/')
+            parent = self.folder_item(folders, parent_path)
+            item = QTreeWidgetItem(parent, [name, f"{member.size:,}"])
+            item.setData(0, Qt.ItemDataRole.UserRole, member.name)
+
+    def folder_item(self, folders, folder_path):
+        if folder_path not in folders:
+            parent_path, _, name = folder_path.rpartition('/')
+            item = QTreeWidgetItem(self.folder_item(folders, parent_path), [name, ""])
+            item.setData(0, Qt.ItemDataRole.UserRole, folder_path)
+            folders[folder_path] = item
+        return folders[folder_path]
+
+    def restore_selected(self):
+        backup_item = self.backup_list.currentItem()
+        member_item = self.member_tree.currentItem()
+        if backup_item is None or member_item is None or member_item.data(0, Qt.ItemDataRole.UserRole) is None:
+            QMessageBox.warning(self, "Error", "Select a backup and a file or folder to restore.")
+            return
+
+        dest_dir = QFileDialog.getExistingDirectory(self, "Restore Into", self.project_dir)
+        if not dest_dir:
+            return
+        backup = self.backups[self.backup_list.indexOfTopLevelItem(backup_item)]
+        task = self.tasks.submit("backup", f"Restore {backup.label}", restore_backup,
+                                 backup, member_item.data(0, Qt.ItemDataRole.UserRole), dest_dir)
+        task.succeeded.connect(lambda message: QMessageBox.information(self, "Restore", message))
+        task.failed.connect(lambda message: QMessageBox.critical(
+            self, "Restore Error", f"An error occurred while restoring: {message}"))
+
+
+class RepoMaintenanceDialog(QDialog):
+    """Runs one operation in every repository under the projects root; rows appear as repositories finish."""
+    columns = ["Repository", "Branch", "Changes", "Untracked", "Ahead", "Behind", "Result", "Time (ms)"]
+
+    def __init__(self, root_dir, max_workers, tasks, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Repository Maintenance")
+        self.setGeometry(250, 250, 1000, 600)
+        self.root_dir = root_dir
+        self.max_workers = max_workers
+        self.tasks = tasks
+        self.maintenance_task = None
+
+        layout = QVBoxLayout(self)
+        self.operation_input = QComboBox()
+        self.operation_input.addItems(OPERATIONS)
+        layout.addWidget(QLabel(f"Operation on every repository under {root_dir}:"))
+        layout.addWidget(self.operation_input)
+
+        self.report_list = QTreeWidget()
+        self.report_list.setHeaderLabels(self.columns)
+        self.report_list.setRootIsDecorated(False)
+        self.report_list.setUniformRowHeights(True)
+        self.report_list.setSortingEnabled(True)
+        self.report_list.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        layout.addWidget(self.report_list)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.run_button = button_box.addButton("Run", QDialogButtonBox.ButtonRole.ActionRole)
+        self.run_button.clicked.connect(self.run_operation)
+        self.cancel_button = button_box.addButton("Cancel", QDialogButtonBox.ButtonRole.ActionRole)
+        self.cancel_button.clicked.connect(self.cancel_operation)
+        self.cancel_button.setEnabled(False)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+    def run_operation(self):
+        self.report_list.clear()
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        operation = self.operation_input.currentText()
+        self.status_label.setText(f"Running {operation} with {self.max_workers} workers...")
+        self.maintenance_task = self.tasks.submit("git", f"Repository {operation}", maintain_repositories,
+                                                  self.root_dir, operation, self.max_workers)
+        self.maintenance_task.partial_result.connect(self.add_report)
+        self.maintenance_task.finished.connect(self.on_maintenance_finished)
+
+    def cancel_operation(self):
+        if self.maintenance_task:
+            self.maintenance_task.cancel()
+            self.status_label.setText("Cancelling: repositories already started will finish...")
+
+    def add_report(self, report):
+        values = [os.path.relpath(report.repo_dir, self.root_dir), report.branch or "",
+                  None if report.staged is None else report.staged + report.modified + report.conflicted,
+                  report.untracked, report.ahead, report.behind,
+                  report.summary if report.ok else f"Failed: {report.summary}", round(report.seconds * 1000)]
+        item = QTreeWidgetItem()
+        for column, value in enumerate(values):
+            if value is not None:
+                # Numbers are stored as numbers so that those columns sort numerically
+                item.setData(column, Qt.ItemDataRole.DisplayRole, value)
+        if not report.ok:
+            item.setToolTip(6, report.summary)
+        self.report_list.addTopLevelItem(item)
+
+    def on_maintenance_finished(self):
+        count = self.report_list.topLevelItemCount()
+        failed = sum(1 for i in range(count) if self.report_list.topLevelItem(i).text(6).startswith("Failed: "))
+        if self.maintenance_task.error:
+            self.status_label.setText(f"Failed: {self.maintenance_task.error}")
+        else:
+            self.status_label.setText(f"{count} repositories in {self.maintenance_task.elapsed():.2f}s, {failed} failed")
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def reject(self):
+        # Repositories not started yet are skipped; the task ends once the running ones finish
+        self.cancel_operation()
+        super().reject()
+
+
+class TaskListDialog(QDialog):
+    """Queued, running and recently finished background tasks."""
+    columns = ["Task", "Category", "State", "Progress", "Details", "Time (s)"]
+
+    def __init__(self, tasks, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Tasks")
+        self.setGeometry(300, 300, 900, 400)
+        self.tasks = tasks
+        # task id -> QTreeWidgetItem
+        self.items = {}
+
+        layout = QVBoxLayout(self)
+        limits = ", ".join(f"{category}: {limit}" for category, limit in sorted(tasks.limits.items()))
+        layout.addWidget(QLabel(f"Concurrent tasks per category: {limits}"))
+        self.task_list = QTreeWidget()
+        self.task_list.setHeaderLabels(self.columns)
+        self.task_list.setRootIsDecorated(False)
+        self.task_list.setUniformRowHeights(True)
+        layout.addWidget(self.task_list)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        cancel_button = button_box.addButton("Cancel Task", QDialogButtonBox.ButtonRole.ActionRole)
+        cancel_button.clicked.connect(self.cancel_selected)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        for task in tasks.tasks():
+            self.update_task(task)
+        tasks.task_updated.connect(self.update_task)
+        # Running times keep changing without any task reporting
+        self.elapsed_timer = QTimer(self)
+        self.elapsed_timer.setInterval(1000)
+        self.elapsed_timer.timeout.connect(self.update_running)
+        self.elapsed_timer.start()
+
+    def update_task(self, task):
+        item = self.items.get(task.task_id)
+        if item is None:
+            item = QTreeWidgetItem([task.title, task.category])
+            item.setData(0, Qt.ItemDataRole.UserRole, task)
+            self.items[task.task_id] = item
+            self.task_list.insertTopLevelItem(0, item)
+        if task.total:
+            progress = f"{task.done * 100 // task.total}%"
+        else:
+            progress = str(task.done) if task.done else ""
+        item.setText(2, task.state)
+        item.setText(3, progress)
+        item.setText(4, task.error or task.description)
+        item.setText(5, f"{task.elapsed():.1f}")
+
+    def update_running(self):
+        if not self.isVisible():
+            return
+        for item in self.items.values():
+            task = item.data(0, Qt.ItemDataRole.UserRole)
+            if task.finished_at is None and task.started_at is not None:
+                item.setText(5, f"{task.elapsed():.1f}")
+
+    def cancel_selected(self):
+        for item in self.task_list.selectedItems():
+            item.data(0, Qt.ItemDataRole.UserRole).cancel()
+
+
 class LoadTaskFileThread(QThread):
     tasks_loaded = pyqtSignal(list)
     error_occurred = pyqtSignal(str)
@@ -402,12 +676,28 @@ class ProjectManagerUI(QMainWindow):
 
         self.projects_root_dir = None
         self.current_tree_index = None
-        self.file_model = CustomFileSystemModel()
+        self.maintenance_dialog = None
         self.config = ConfigManager.load_config()
+        self.tasks = TaskExecutor(limits={category: self.config.getint('tasks', category)
+                                          for category in (self.config['tasks'] if 'tasks' in self.config else [])})
+        self.task_list_dialog = None
+        self.file_model = CustomFileSystemModel()
+        # Large-root mode: uniform rows, fixed and sampled column widths, rows revealed in batches
+        self.large_root_mode = self.config.getboolean('tree', 'large_root_mode', fallback=True)
+        batch_size = self.config.getint('tree', 'fetch_batch_size', fallback=1000) if self.large_root_mode else 0
+        # The tree shows the file model through the tracker's ignore patterns
+        self.tree_model = IgnoreFilterProxyModel(FileTracker.ignore_matcher, self, batch_size)
+        self.tree_model.setSourceModel(self.file_model)
         self.context_menu = ContextMenu(self)
+        storage_dir = self.config.get('backup', 'storage_dir', fallback='')
+        if storage_dir:
+            SnapshotStore.storage_root = storage_dir
 
         self.initUI()
         self.load_project_root()  # Ensure this is defined before calling
+        self.start_backup_scheduler()
+        self.start_git_status()
+        self.start_file_monitoring()
 
     def initUI(self):
         self.create_menu_bar()
@@ -450,16 +740,30 @@ class ProjectManagerUI(QMainWindow):
         splitter = QSplitter(Qt.Orientation.Horizontal)
 
         self.project_tree = QTreeView()
-        self.project_tree.setModel(self.file_model)
-        self.project_tree.setRootIndex(self.file_model.index(QDir.currentPath()))
-        self.project_tree.setAnimated(True)
+        self.project_tree.setModel(self.tree_model)
+        self.project_tree.setRootIndex(self.tree_index(QDir.currentPath()))
+        self.project_tree.setAnimated(not self.large_root_mode)
+        self.project_tree.setUniformRowHeights(self.large_root_mode)
         self.project_tree.setIndentation(20)
         self.project_tree.setSortingEnabled(True)
+        self.project_tree.setSelectionMode(QTreeView.SelectionMode.ExtendedSelection)
         self.project_tree.clicked.connect(self.on_project_tree_clicked)
         self.project_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.project_tree.customContextMenuRequested.connect(self.open_context_menu)
 
-        self.project_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        if self.large_root_mode:
+            self.setup_large_root_header()
+        else:
+            self.project_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+
+        # Directory sizes are only measured for rows on screen
+        self.visible_rows_timer = QTimer(self)
+        self.visible_rows_timer.setSingleShot(True)
+        self.visible_rows_timer.setInterval(100)
+        self.visible_rows_timer.timeout.connect(self.update_visible_rows)
+        self.project_tree.verticalScrollBar().valueChanged.connect(lambda *_: self.visible_rows_timer.start())
+        self.project_tree.expanded.connect(lambda *_: self.visible_rows_timer.start())
+        self.project_tree.collapsed.connect(lambda *_: self.visible_rows_timer.start())
 
         splitter.addWidget(self.project_tree)
 
@@ -472,15 +776,93 @@ class ProjectManagerUI(QMainWindow):
 
         #self.update_placeholder_text(self.project_type_input.currentText())
 
+    def setup_large_root_header(self):
+        """Size columns without measuring every row: fixed widths, and a sampled width for names."""
+        header = self.project_tree.header()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        # resizeColumnToContents only measures this many rows around the visible ones
+        header.setResizeContentsPrecision(self.config.getint('tree', 'width_sample_rows', fallback=200))
+        metrics = self.project_tree.fontMetrics()
+        modified = QLocale().toString(QDateTime.currentDateTime(), QLocale.FormatType.ShortFormat)
+        for column, sample in ((1, "1023.99 MB"), (2, "File Folder"), (3, modified)):
+            header.resizeSection(column, max(metrics.horizontalAdvance(sample) + 24, header.sectionSizeHint(column)))
+
+        self.name_width_timer = QTimer(self)
+        self.name_width_timer.setSingleShot(True)
+        self.name_width_timer.setInterval(200)
+        self.name_width_timer.timeout.connect(lambda: self.project_tree.resizeColumnToContents(0))
+        self.file_model.directoryLoaded.connect(lambda *_: self.name_width_timer.start())
+        self.project_tree.expanded.connect(lambda *_: self.name_width_timer.start())
+
+    def tree_index(self, path):
+        return self.tree_model.mapFromSource(self.file_model.index(path))
+
+    def tree_path(self, index):
+        return self.file_model.filePath(self.tree_model.mapToSource(index))
+
+    def update_visible_rows(self):
+        viewport_height = self.project_tree.viewport().height()
+        index = self.project_tree.indexAt(QPoint(0, 0))
+        paths = []
+        while index.isValid() and self.project_tree.visualRect(index).top() < viewport_height:
+            paths.append(self.tree_path(index))
+            index = self.project_tree.indexBelow(index)
+        self.file_model.set_visible_paths(paths)
+
     def load_project_root(self):
         """Load the project root directory from the configuration."""
         if 'settings' in self.config and 'project_root' in self.config['settings']:
             self.projects_root_dir = self.config['settings']['project_root']
             self.file_model.setRootPath(self.projects_root_dir)
-            self.project_tree.setRootIndex(self.file_model.index(self.projects_root_dir))
+            self.tree_model.invalidate_decisions()
+            self.project_tree.setRootIndex(self.tree_index(self.projects_root_dir))
+            self.catch_up_on_changes()
         else:
             QMessageBox.warning(self, "Error", "Project root directory is not set in the configuration.")
 
+    def catch_up_on_changes(self):
+        """Pick up changes made while the app was closed; unchanged directories are only stat'ed."""
+        task = self.tasks.submit("scan", "Catch up on changes", scan_projects, self.projects_root_dir)
+        task.progress.connect(self.on_scan_progress)
+        task.succeeded.connect(lambda message: self.statusBar().showMessage(message, 5000))
+
+    def start_backup_scheduler(self):
+        """Back up changed projects in the background, as configured in [backup]."""
+        self.backup_scheduler_thread = None
+        if not self.config.getboolean('backup', 'enabled', fallback=True):
+            return
+        max_mb_per_second = self.config.getfloat('backup', 'max_mb_per_second', fallback=20)
+        self.backup_scheduler_thread = BackupSchedulerThread(
+            interval_seconds=self.config.getint('backup', 'interval_minutes', fallback=30) * 60,
+            idle_seconds=self.config.getint('backup', 'idle_seconds', fallback=120),
+            max_concurrent=self.config.getint('backup', 'max_concurrent', fallback=1),
+            max_bytes_per_second=int(max_mb_per_second * (1 << 20)) if max_mb_per_second > 0 else None,
+            retention=self.retention_policy(),
+        )
+        self.backup_scheduler_thread.backup_finished.connect(lambda message: self.statusBar().showMessage(message, 10000))
+        self.backup_scheduler_thread.error_occurred.connect(lambda message: self.statusBar().showMessage(message, 10000))
+        self.backup_scheduler_thread.start()
+
+    def retention_policy(self):
+        return RetentionPolicy(
+            keep_last=self.config.getint('retention', 'keep_last', fallback=10),
+            keep_hourly=self.config.getint('retention', 'keep_hourly', fallback=24),
+            keep_daily=self.config.getint('retention', 'keep_daily', fallback=7),
+            keep_weekly=self.config.getint('retention', 'keep_weekly', fallback=4),
+        )
+
+    def closeEvent(self, event):
+        self.file_monitor.stop()
+        # Commands already running finish; queued ones are dropped
+        self.context_menu.git.shutdown(wait=False)
+        self.git_status.stop()
+        # Queued tasks are dropped and running ones asked to stop
+        self.tasks.shutdown(wait=False)
+        if self.backup_scheduler_thread:
+            self.backup_scheduler_thread.stop()
+        self.file_model.shutdown()
+        super().closeEvent(event)
+
     def create_menu_bar(self):
         menubar = self.menuBar()
 
@@ -493,6 +875,49 @@ class ProjectManagerUI(QMainWindow):
         view_todo_action = QAction('View Todo', self)
         view_todo_action.triggered.connect(self.open_todo_window)
         view_menu.addAction(view_todo_action)
+        monitoring_status_action = QAction('Monitoring Status', self)
+        monitoring_status_action.triggered.connect(self.show_monitoring_status)
+        view_menu.addAction(monitoring_status_action)
+        task_list_action = QAction('Tasks', self)
+        task_list_action.triggered.connect(self.open_task_list)
+        view_menu.addAction(task_list_action)
+
+        git_menu = menubar.addMenu('Git')
+        maintenance_action = QAction('Repository Maintenance...', self)
+        maintenance_action.triggered.connect(self.open_maintenance_dialog)
+        git_menu.addAction(maintenance_action)
+
+    def open_maintenance_dialog(self):
+        if not self.projects_root_dir:
+            QMessageBox.warning(self, "Error", "Project root directory is not set.")
+            return
+        # Kept after closing, so the results of the last run are still there when it is reopened
+        if self.maintenance_dialog is None or self.maintenance_dialog.root_dir != self.projects_root_dir:
+            self.maintenance_dialog = RepoMaintenanceDialog(
+                self.projects_root_dir, self.config.getint('git', 'maintenance_workers', fallback=4), self.tasks, self)
+        self.maintenance_dialog.show()
+        self.maintenance_dialog.raise_()
+
+    def open_task_list(self):
+        if self.task_list_dialog is None:
+            self.task_list_dialog = TaskListDialog(self.tasks, self)
+        self.task_list_dialog.show()
+        self.task_list_dialog.raise_()
+
+    def show_monitoring_status(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Monitoring Status")
+        dialog.setGeometry(300, 300, 700, 400)
+        layout = QVBoxLayout()
+        status_text = QPlainTextEdit()
+        status_text.setReadOnly(True)
+        status_text.setPlainText("\n".join(self.file_monitor.status_lines()) or "No projects are monitored.")
+        layout.addWidget(status_text)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        dialog.setLayout(layout)
+        dialog.exec()
 
     def open_todo_window(self):
         """Method to open the TODO window."""
@@ -501,28 +926,34 @@ class ProjectManagerUI(QMainWindow):
 
     def start_file_parsing(self):
         if self.projects_root_dir:
-            self.file_parsing_thread = FileTrackerThread(self.projects_root_dir)
-            self.file_parsing_thread.tracker_finished.connect(self.on_tracker_finished)
-            self.file_parsing_thread.start()
+            task = self.tasks.submit("scan", "Scan for untracked files", scan_projects, self.projects_root_dir)
+            task.progress.connect(self.on_scan_progress)
+            task.succeeded.connect(self.on_tracker_finished)
         else:
             QMessageBox.warning(self, "Error", "Project root directory is not set.")
 
     def scan_for_untracked_files(self):
         if self.projects_root_dir:
-            self.file_tracker_thread = FileTrackerThread(self.projects_root_dir)
-            self.file_tracker_thread.tracker_finished.connect(self.on_tracker_finished)
-            self.file_tracker_thread.start()
+            task = self.tasks.submit("scan", "Scan for untracked files", scan_projects, self.projects_root_dir)
+            task.progress.connect(self.on_scan_progress)
+            task.succeeded.connect(self.on_tracker_finished)
         else:
             QMessageBox.warning(self, "Error", "Project root directory is not set.")
 
+    def on_scan_progress(self, done, total, description):
+        self.statusBar().showMessage(description)
+
     def on_tracker_finished(self, message):
+        self.statusBar().clearMessage()
         QMessageBox.information(self, "Scan Complete", message)
 
     def set_root_directory(self):
         self.projects_root_dir = QFileDialog.getExistingDirectory(self, "Select Projects Root Directory")
         if self.projects_root_dir:
             self.file_model.setRootPath(self.projects_root_dir)
-            self.project_tree.setRootIndex(self.file_model.index(self.projects_root_dir))
+            self.tree_model.invalidate_decisions()
+            self.project_tree.setRootIndex(self.tree_index(self.projects_root_dir))
+            self.file_monitor.start(self.projects_root_dir)
 
             if 'settings' not in self.config:
                 self.config['settings'] = {}
@@ -531,7 +962,10 @@ class ProjectManagerUI(QMainWindow):
 
     def on_project_tree_clicked(self, index):
         self.current_tree_index = index
-        file_path = self.file_model.filePath(index)
+        if QApplication.keyboardModifiers() & (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier):
+            # Extending the selection, not opening
+            return
+        file_path = self.tree_path(index)
         if os.path.isdir(file_path):
             print(f"Folder clicked: {file_path}")
         else:
@@ -542,100 +976,271 @@ class ProjectManagerUI(QMainWindow):
         if not index.isValid():
             return
 
-        file_path = self.file_model.filePath(index)
+        file_path = self.tree_path(index)
         menu = QMenu(self)
 
-        compress_action = QAction("7-Zip to Backups", self)
-        compress_action.triggered.connect(lambda: self.compress_to_7zip(file_path))
+        backup_action = QAction("Snapshot to Backups", self)
+        backup_action.triggered.connect(lambda: self.snapshot_to_backups(file_path))
+        menu.addAction(backup_action)
+
+        # File actions apply to every selected item
+        selected_paths = self.selected_paths(file_path)
+        compress_action = QAction("Export Zip Archive", self)
+        if len(selected_paths) > 1:
+            compress_action.triggered.connect(lambda: self.compress_paths(selected_paths))
+        else:
+            compress_action.triggered.connect(lambda: self.export_archive(file_path))
         menu.addAction(compress_action)
 
         set_working_action = QAction("Set as Working", self)
         set_working_action.triggered.connect(lambda: self.set_as_working(file_path))
         menu.addAction(set_working_action)
 
+        restore_action = QAction("Restore from Backup...", self)
+        restore_action.triggered.connect(lambda: self.open_restore_dialog(file_path))
+        menu.addAction(restore_action)
+
+        prune_action = QAction("Prune Old Backups", self)
+        prune_action.triggered.connect(lambda: self.prune_backups(file_path))
+        menu.addAction(prune_action)
+
+        space_action = QAction("Backup Space Report", self)
+        space_action.triggered.connect(lambda: self.show_space_report(file_path))
+        menu.addAction(space_action)
+
+        # Git actions are merged into one command per repository
         git_add_action = QAction("Git Add", self)
-        git_add_action.triggered.connect(lambda: self.context_menu.git_add(file_path))
+        git_add_action.triggered.connect(lambda: self.context_menu.git_add(selected_paths))
         menu.addAction(git_add_action)
 
         git_commit_action = QAction("Git Commit", self)
-        git_commit_action.triggered.connect(lambda: self.context_menu.git_commit(file_path))
+        git_commit_action.triggered.connect(lambda: self.context_menu.git_commit(selected_paths))
         menu.addAction(git_commit_action)
 
         git_push_action = QAction("Git Push", self)
-        git_push_action.triggered.connect(lambda: self.context_menu.git_push(file_path))
+        git_push_action.triggered.connect(lambda: self.context_menu.git_push(selected_paths))
         menu.addAction(git_push_action)
 
         delete_action = QAction("Delete", self)
-        delete_action.triggered.connect(lambda: self.delete_file_or_folder(file_path))
+        delete_action.triggered.connect(lambda: self.delete_paths(selected_paths))
         menu.addAction(delete_action)
 
-        rename_action = QAction("Rename", self)
-        rename_action.triggered.connect(lambda: self.rename_file_or_folder(file_path))
-        menu.addAction(rename_action)
+        move_action = QAction("Move To...", self)
+        move_action.triggered.connect(lambda: self.move_paths(selected_paths))
+        menu.addAction(move_action)
+
+        if len(selected_paths) == 1:
+            rename_action = QAction("Rename", self)
+            rename_action.triggered.connect(lambda: self.rename_file_or_folder(file_path))
+            menu.addAction(rename_action)
+
+        rename_pattern_action = QAction("Rename by Pattern...", self)
+        rename_pattern_action.triggered.connect(lambda: self.rename_by_pattern(selected_paths))
+        menu.addAction(rename_pattern_action)
 
         menu.exec(self.project_tree.viewport().mapToGlobal(position))
 
-    def delete_file_or_folder(self, file_path):
+    def selected_paths(self, clicked_path):
+        """The selected paths if the clicked item is part of the selection, otherwise just the clicked one."""
+        paths = [self.tree_path(index) for index in self.project_tree.selectionModel().selectedRows(0)]
+        return paths if clicked_path in paths else [clicked_path]
+
+    def delete_paths(self, paths):
+        paths = [p for p in outermost_paths(paths) if p != os.path.normpath(self.projects_root_dir or "")]
+        if not paths:
+            return
+        names = os.path.basename(paths[0]) if len(paths) == 1 else f"{len(paths)} items"
+        answer = QMessageBox.question(self, "Delete", f"Permanently delete {names}, including everything inside "
+                                                      f"selected folders?")
+        if answer == QMessageBox.StandardButton.Yes:
+            self.start_bulk_operation("Delete", "io", "delete", paths)
+
+    def move_paths(self, paths):
+        dest_dir = QFileDialog.getExistingDirectory(self, "Move To", self.projects_root_dir or "")
+        if dest_dir:
+            self.start_bulk_operation("Move", "io", "move", outermost_paths(paths), dest_dir)
+
+    def rename_by_pattern(self, paths):
+        pattern, ok = QInputDialog.getText(self, "Rename by Pattern", "Regular expression matching the names:")
+        if not ok or not pattern:
+            return
+        replacement, ok = QInputDialog.getText(self, "Rename by Pattern", "Replacement (\\1 for groups):")
+        if not ok:
+            return
         try:
-            if os.path.isdir(file_path):
-                os.rmdir(file_path)
-            else:
-                os.remove(file_path)
-            QMessageBox.information(self, "Delete", f"Successfully deleted: {file_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Delete Error", f"An error occurred while deleting: {e}")
+            renames, problems = plan_renames(paths, pattern, replacement)
+        except re.error as e:
+            QMessageBox.warning(self, "Rename by Pattern", f"Invalid pattern: {e}")
+            return
+        if not renames:
+            QMessageBox.information(self, "Rename by Pattern", "\n".join(
+                ["No names to change."] + [f"{os.path.basename(p)}: {problem}" for p, problem in problems[:10]]))
+            return
+        lines = [f"{os.path.basename(old)} -> {os.path.basename(new)}" for old, new in renames[:10]]
+        if len(renames) > 10:
+            lines.append(f"... and {len(renames) - 10} more")
+        if problems:
+            lines.append(f"{len(problems)} item(s) will be skipped, e.g. {os.path.basename(problems[0][0])}: "
+                         f"{problems[0][1]}")
+        answer = QMessageBox.question(self, "Rename by Pattern", f"Rename {len(renames)} item(s)?\n\n" + "\n".join(lines))
+        if answer == QMessageBox.StandardButton.Yes:
+            self.start_bulk_operation("Rename", "io", "rename", renames)
+
+    def compress_paths(self, paths):
+        """Export one zip archive per project containing a selected item."""
+        jobs = []
+        project_dirs = {p if os.path.isdir(p) else os.path.dirname(p) for p in paths}
+        for project_dir in sorted(project_dirs):
+            job = self.archive_job(project_dir)
+            if job is None:
+                QMessageBox.warning(self, "Error", f"Tracker file not found in {project_dir}")
+                return
+            jobs.append(job)
+        self.start_bulk_operation("Compress", "archive", "compress", jobs)
+
+    def start_bulk_operation(self, title, category, operation, *args):
+        """Run a BulkFileOperation as one task, with one progress dialog for all of its items."""
+        count = len(args[0])
+        task = self.tasks.submit(category, f"{title} {count} item(s)", run_bulk_operation, operation,
+                                 self.config.getint('bulk', 'workers', fallback=4), *args)
+
+        progress = QProgressDialog(f"{title}: {count} item(s)...", "Cancel", 0, count, self)
+        progress.setWindowTitle(title)
+        progress.setMinimumDuration(500)
+        progress.canceled.connect(task.cancel)
+
+        def show_progress(done, total, description):
+            progress.setValue(done)
+            progress.setLabelText(f"{title}: {description}")
+
+        task.progress.connect(show_progress)
+        task.finished.connect(progress.reset)
+        task.succeeded.connect(lambda result: self.show_bulk_result(title, result))
+        task.failed.connect(lambda message: self.show_error_message(f"{title} failed: {message}"))
+
+    def show_bulk_result(self, title, result):
+        rate = result.files_done / result.seconds if result.seconds else 0
+        lines = [f"{title}: {result.items_done} of {result.items_total} item(s), {result.files_done} file(s) "
+                 f"in {result.seconds:.1f}s ({rate:.0f} files/s)" + (", cancelled" if result.cancelled else "")]
+        if result.errors:
+            lines.append(f"{len(result.errors)} error(s):")
+            lines.extend(f"{path}: {message}" for path, message in result.errors[:10])
+            QMessageBox.warning(self, title, "\n".join(lines))
+        else:
+            self.statusBar().showMessage(lines[0], 10000)
 
     def rename_file_or_folder(self, file_path):
         new_name, ok = QInputDialog.getText(self, "Rename", "Enter new name:")
         if ok and new_name:
             new_path = os.path.join(os.path.dirname(file_path), new_name)
-            try:
-                os.rename(file_path, new_path)
-                QMessageBox.information(self, "Rename", f"Successfully renamed to: {new_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Rename Error", f"An error occurred while renaming: {e}")
+            task = self.tasks.submit("io", f"Rename {os.path.basename(file_path)}", rename_path, file_path, new_path)
+            task.succeeded.connect(lambda message: QMessageBox.information(self, "Rename", message))
+            task.failed.connect(lambda message: QMessageBox.critical(
+                self, "Rename Error", f"An error occurred while renaming: {message}"))
 
-    def compress_to_7zip(self, file_path):
-        project_dir = file_path if os.path.isdir(file_path) else os.path.dirname(file_path)
+    def archive_job(self, project_dir):
+        """The tracked files of project_dir and a new zip file in its backups folder, or None if it is not tracked."""
         tracker_file = FileTracker.get_tracked_files(project_dir)
-
         if not tracker_file:
-            QMessageBox.warning(self, "Error", f"Tracker file not found in {project_dir}")
-            return
+            return None
 
-        backups_dir = os.path.join(project_dir, "backups")
+        backups_dir = SnapshotStore.for_project(project_dir).archive_dir("backups")
         os.makedirs(backups_dir, exist_ok=True)
 
         version = VersionManager.generate_version(project_dir)
         current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(backups_dir, f"{os.path.basename(project_dir)}_v{version}_{current_time}.7z")
+        output_file = os.path.join(backups_dir, f"{os.path.basename(project_dir)}_v{version}_{current_time}.zip")
+        return ArchiveJob(project_dir, [(os.path.join(project_dir, file), file) for file in tracker_file], output_file)
+
+    def export_archive(self, file_path):
+        project_dir = file_path if os.path.isdir(file_path) else os.path.dirname(file_path)
+        job = self.archive_job(project_dir)
+        if job is None:
+            QMessageBox.warning(self, "Error", f"Tracker file not found in {project_dir}")
+            return
+
+        output_file = job.output_file
+        task = self.tasks.submit("archive", f"Export {os.path.basename(output_file)}", compress_files,
+                                 [source_path for source_path, _ in job.files], output_file, project_dir)
+
+        progress = QProgressDialog(f"Compressing {os.path.basename(project_dir)}...", "Cancel", 0, 1000, self)
+        progress.setWindowTitle("Export Archive")
+        progress.setMinimumDuration(500)
+        progress.canceled.connect(task.cancel)
+
+        def show_progress(done, total, description):
+            progress.setValue(int(done * 1000 / total) if total else 0)
+            if description:
+                progress.setLabelText(description)
+
+        task.progress.connect(show_progress)
+        task.finished.connect(progress.reset)
+
+        task.succeeded.connect(self.show_information_message)
+        task.failed.connect(lambda message: self.show_error_message(f"An error occurred while compressing: {message}"))
+        task.cancelled.connect(lambda: self.show_error_message(f"Compression to {output_file} was cancelled."))
 
-        files_to_compress = [os.path.join(project_dir, file) for file in tracker_file]
-        self.compression_thread = CompressionThread(files_to_compress, output_file)
-        self.compression_thread.compression_finished.connect(self.show_information_message)
-        self.compression_thread.error_occurred.connect(self.show_error_message)
-        self.compression_thread.start()
+    def snapshot_to_backups(self, file_path):
+        project_dir = file_path if os.path.isdir(file_path) else os.path.dirname(file_path)
+        self.start_snapshot(project_dir, "backups", VersionManager.generate_version(project_dir))
 
     def set_as_working(self, file_path):
         project_dir = file_path if os.path.isdir(file_path) else os.path.dirname(file_path)
-        tracker_file = FileTracker.get_tracked_files(project_dir)
+        self.start_snapshot(project_dir, "working_versions", VersionManager.generate_version(project_dir, increment=True))
 
-        if not tracker_file:
+    def start_snapshot(self, project_dir, kind, version):
+        if not FileTracker.get_tracked_files(project_dir):
             QMessageBox.warning(self, "Error", f"Tracker file not found in {project_dir}")
             return
 
-        working_dir = os.path.join(project_dir, "working_versions")
-        os.makedirs(working_dir, exist_ok=True)
-
-        version = VersionManager.generate_version(project_dir, increment=True)
         current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(working_dir, f"{os.path.basename(project_dir)}_v{version}_{current_time}.7z")
+        name = f"{os.path.basename(project_dir)}_v{version}_{current_time}"
+        task = self.tasks.submit("backup", f"Snapshot {name}", take_snapshot, project_dir, kind, name, version)
+        task.succeeded.connect(self.show_information_message)
+        task.failed.connect(lambda message: self.show_error_message(
+            f"An error occurred while taking the snapshot: {message}"))
 
-        files_to_compress = [os.path.join(project_dir, file) for file in tracker_file]
-        self.compression_thread = CompressionThread(files_to_compress, output_file)
-        self.compression_thread.compression_finished.connect(self.show_information_message)
-        self.compression_thread.error_occurred.connect(self.show_error_message)
-        self.compression_thread.start()
+    def open_restore_dialog(self, file_path):
+        project_dir = file_path if os.path.isdir(file_path) else os.path.dirname(file_path)
+        dialog = RestoreDialog(project_dir, self.tasks, self)
+        if not dialog.backups:
+            QMessageBox.information(self, "Restore", f"No backups found for {project_dir}")
+            return
+        dialog.exec()
+
+    def prune_backups(self, file_path):
+        project_dir = file_path if os.path.isdir(file_path) else os.path.dirname(file_path)
+        task = self.tasks.submit("backup", f"Prune {os.path.basename(project_dir)}", prune_backups,
+                                 project_dir, self.retention_policy())
+        task.succeeded.connect(self.show_information_message)
+        task.failed.connect(lambda message: self.show_error_message(f"An error occurred while pruning backups: {message}"))
+
+    def show_space_report(self, file_path):
+        project_dir = file_path if os.path.isdir(file_path) else os.path.dirname(file_path)
+        report = space_report(project_dir, self.retention_policy())
+        mb = 1 << 20
+        lines = [
+            f"Backups of {os.path.basename(project_dir)}",
+            f"Backups: {report.backup_counts['backups']} backup(s), "
+            f"{report.backup_counts['working_versions']} working version(s)",
+            f"Snapshot blobs: {report.blob_count} ({report.blob_bytes / mb:.1f} MB)",
+            f"Zip archives: {report.archive_bytes / mb:.1f} MB",
+            f"Legacy 7z archives: {report.legacy_archive_count} ({report.legacy_archive_bytes / mb:.1f} MB)",
+            f"Total: {report.total_bytes / mb:.1f} MB (newest backup covers {report.latest_backup_bytes / mb:.1f} MB)",
+            f"Storage: {SnapshotStore.for_project(project_dir).store_dir}",
+        ]
+        if report.prunable_count:
+            lines.append(f"Prunable under the retention policy: {report.prunable_count} backup(s), "
+                         f"{report.prunable_bytes / mb:.1f} MB of archives")
+        if report.in_project_bytes:
+            lines.append(f"Still inside the project tree: {report.in_project_bytes / mb:.1f} MB")
+        QMessageBox.information(self, "Backup Space Report", "\n".join(lines))
+
+    def show_information_message(self, message):
+        QMessageBox.information(self, "Information", message)
+
+    def show_error_message(self, message):
+        QMessageBox.critical(self, "Error", message)
 
     def open_file_editor(self, file_path):
         # Check if the file is an image
@@ -652,10 +1257,9 @@ class ProjectManagerUI(QMainWindow):
         editor = QPlainTextEdit()
 
         # Load the file in a separate thread
-        self.file_read_thread = FileReadWriteThread(file_path, 'read')
-        self.file_read_thread.operation_finished.connect(lambda file_path, content: editor.setPlainText(content))
-        self.file_read_thread.error_occurred.connect(self.show_error_message)
-        self.file_read_thread.start()
+        task = self.tasks.submit("io", f"Open {os.path.basename(file_path)}", read_text_file, file_path)
+        task.succeeded.connect(editor.setPlainText)
+        task.failed.connect(lambda message: self.show_error_message(f"An error occurred: {message}"))
 
         highlighter = PythonHighlighter(editor.document())
 
@@ -693,10 +1297,9 @@ class ProjectManagerUI(QMainWindow):
 
     def save_file(self, file_path, content, dialog):
         # Save the file in a separate thread
-        self.file_write_thread = FileReadWriteThread(file_path, 'write', content)
-        self.file_write_thread.operation_finished.connect(lambda file_path, message: dialog.accept())
-        self.file_write_thread.error_occurred.connect(self.show_error_message)
-        self.file_write_thread.start()
+        task = self.tasks.submit("io", f"Save {os.path.basename(file_path)}", write_text_file, file_path, content)
+        task.succeeded.connect(lambda result: dialog.accept())
+        task.failed.connect(lambda message: self.show_error_message(f"An error occurred: {message}"))
 
     def create_project(self):
         project_name = self.project_name_input.text().strip()
@@ -719,21 +1322,48 @@ class ProjectManagerUI(QMainWindow):
             self.start_project_creation(project_path, project_type, dependencies)
 
     def start_project_creation(self, project_path, project_type, dependencies):
-        self.project_thread = ProjectCreationThread(project_path, project_type, dependencies)
-        self.project_thread.update_ui_signal.connect(self.on_project_created)
-        self.project_thread.start()
-
-    def on_project_created(self, message):
-        QMessageBox.information(self, "Project Creation", message)
-        if "created successfully" in message:
-            self.start_file_monitoring()
+        task = self.tasks.submit("project", f"Create {os.path.basename(project_path)}",
+                                 lambda task: ProjectCreator.create_project_structure(project_path, project_type,
+                                                                                      dependencies))
+        task.succeeded.connect(lambda result: self.on_project_created(project_path))
+        task.failed.connect(lambda message: QMessageBox.information(
+            self, "Project Creation", f"An error occurred: {message}"))
+
+    def on_project_created(self, project_path):
+        QMessageBox.information(self, "Project Creation", f"Project '{project_path}' created successfully.")
+        self.file_monitor.add_project(project_path)
+
+    def start_git_status(self):
+        """Colour tree items by git state, refreshed only for repositories that changed."""
+        self.git_status = GitStatusCache(
+            min_interval=self.config.getfloat('git', 'status_min_interval_seconds', fallback=2.0))
+        self.file_model.git_status = self.git_status
+        self.git_status.status_changed.connect(self.file_model.on_git_status_changed)
+        # .git is not monitored, so the tree learns about adds and commits from the executor
+        self.context_menu.git.command_finished.connect(lambda result: self.git_status.refresh(result.repo_dir))
 
     def start_file_monitoring(self):
-        project_name = self.project_name_input.text().strip()
-        project_type = self.project_type_input.currentText().lower()
-        project_path = os.path.normpath(os.path.join(self.projects_root_dir, project_type, project_name))
-        self.monitor_thread = FileMonitorThread(project_path)
-        self.monitor_thread.start()
+        """Monitor every project under the projects root, including those created before this start."""
+        self.file_monitor = FileMonitorService(
+            debounce_ms=self.config.getint('monitoring', 'debounce_ms', fallback=500),
+            max_queue_size=self.config.getint('monitoring', 'max_queue_size', fallback=10000),
+            max_watches=self.config.getint('monitoring', 'max_watches', fallback=0),
+            poll_seconds=self.config.getint('monitoring', 'poll_seconds', fallback=30),
+            cold_seconds=self.config.getint('monitoring', 'cold_minutes', fallback=10) * 60,
+        )
+        self.file_monitor.events_flushed.connect(self.on_events_flushed)
+        self.file_monitor.paths_changed.connect(self.file_model.on_paths_changed)
+        self.file_monitor.paths_changed.connect(self.tree_model.on_paths_changed)
+        self.file_monitor.paths_changed.connect(self.git_status.on_paths_changed)
+        self.file_monitor.watches_changed.connect(lambda *_: self.git_status.track(self.file_monitor.watched_projects()))
+        if self.backup_scheduler_thread:
+            self.file_monitor.project_changed.connect(self.backup_scheduler_thread.scheduler.mark_dirty)
+        if self.projects_root_dir:
+            self.file_monitor.start(self.projects_root_dir)
+
+    def on_events_flushed(self, batch_size, queue_depth, latency_ms):
+        self.statusBar().showMessage(
+            f"Tracked {batch_size} changed file(s) in {latency_ms:.0f} ms (queue depth: {queue_depth})", 5000)
 
     def update_placeholder_text(self, project_type):
         placeholders = {
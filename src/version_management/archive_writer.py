@@ -0,0 +1,240 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import struct
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ARCHIVE_CHUNK_SIZE = 1 << 20
+SPOOL_MAX_MEMORY = 4 << 20
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP64_LIMIT = 0xFFFFFFFF
+UTF8_FLAG = 0x0800
+
+# Members with these extensions are already compressed; deflating them again only costs CPU.
+STORED_EXTENSIONS = {
+    '.7z', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.rar', '.jar', '.whl',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp3', '.mp4', '.mkv', '.avi', '.mov', '.pdf',
+}
+
+
+class ArchiveCancelled(Exception):
+    pass
+
+
+class ArchiveMember:
+    def __init__(self, arcname, file_size, mtime, mode):
+        self.arcname = arcname
+        self.file_size = file_size
+        self.mtime = mtime
+        self.mode = mode
+        self.method = ZIP_DEFLATED
+        self.crc = 0
+        self.compress_size = 0
+        self.header_offset = 0
+        self.data_offset = 0
+        self.hash = None
+
+    def to_index_entry(self):
+        return {
+            "name": self.arcname, "size": self.file_size, "compress_size": self.compress_size,
+            "method": self.method, "crc": self.crc, "hash": self.hash,
+            "header_offset": self.header_offset, "data_offset": self.data_offset,
+        }
+
+
+class ArchiveWriter:
+    """Writes a standard zip archive, compressing members in parallel.
+
+    Workers deflate members into spooled temporary files (kept in memory up to
+    SPOOL_MAX_MEMORY, on disk beyond that) while the calling thread appends
+    finished members to the archive in order, so no whole file is held in memory
+    and at most a few members are in flight at once. Zip64 records are written
+    when sizes or offsets need them.
+
+    Next to the archive, a member index (<archive>.index.json) records each
+    member's data offset, sizes and BLAKE2b hash, so a single member can be
+    restored by seeking straight to it.
+    """
+
+    index_suffix = ".index.json"
+
+    def __init__(self, output_file, max_workers=None, compress_level=6,
+                 progress_callback=None, file_callback=None, cancel_event=None):
+        self.output_file = output_file
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.compress_level = compress_level
+        # progress_callback(bytes_done, bytes_total); file_callback(files_done, files_total, arcname)
+        self.progress_callback = progress_callback
+        self.file_callback = file_callback
+        self.cancel_event = cancel_event or threading.Event()
+        self.members = []
+
+        self._bytes_done = 0
+        self._bytes_total = 0
+        self._progress_lock = threading.Lock()
+
+    def write(self, files):
+        """Archive files, a list of (source_path, arcname) pairs."""
+        entries = []
+        for source_path, arcname in files:
+            try:
+                st = os.stat(source_path)
+            except OSError as e:
+                print(f"Skipping {source_path}: {e}")
+                continue
+            entries.append((source_path, ArchiveMember(arcname.replace(os.sep, '/'), st.st_size,
+                                                       st.st_mtime, st.st_mode)))
+        self._bytes_total = sum(member.file_size for _, member in entries)
+
+        window = self.max_workers * 2
+        temp_output = self.output_file + ".partial"
+        try:
+            with open(temp_output, 'wb') as out, \
+                    ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ArchiveWriter") as pool:
+                futures = []
+                next_entry = 0
+                for files_done in range(len(entries)):
+                    while next_entry < len(entries) and len(futures) < window:
+                        futures.append(pool.submit(self._compress_member, *entries[next_entry]))
+                        next_entry += 1
+                    member, spool = futures.pop(0).result()
+                    if spool is None:
+                        continue
+                    with spool:
+                        self._append_member(out, member, spool)
+                    self.members.append(member)
+                    if self.file_callback:
+                        self.file_callback(files_done + 1, len(entries), member.arcname)
+
+                self._check_cancelled()
+                self._write_central_directory(out)
+            self._write_index()
+            os.replace(temp_output, self.output_file)
+        except BaseException:
+            self.cancel_event.set()
+            for path in (temp_output, self.output_file + ArchiveWriter.index_suffix):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        return self.members
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise ArchiveCancelled("Archive creation was cancelled.")
+
+    def _report_bytes(self, count):
+        with self._progress_lock:
+            self._bytes_done += count
+            done = self._bytes_done
+        if self.progress_callback:
+            self.progress_callback(done, self._bytes_total)
+
+    def _compress_member(self, source_path, member):
+        stored = os.path.splitext(member.arcname)[1].lower() in STORED_EXTENSIONS
+        member.method = ZIP_STORED if stored else ZIP_DEFLATED
+        compressor = None if stored else zlib.compressobj(self.compress_level, zlib.DEFLATED, -15)
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        digest = hashlib.blake2b(digest_size=20)
+        crc = 0
+        file_size = 0
+        try:
+            with open(source_path, 'rb') as src:
+                for chunk in iter(lambda: src.read(ARCHIVE_CHUNK_SIZE), b''):
+                    self._check_cancelled()
+                    crc = zlib.crc32(chunk, crc)
+                    digest.update(chunk)
+                    file_size += len(chunk)
+                    spool.write(compressor.compress(chunk) if compressor else chunk)
+                    self._report_bytes(len(chunk))
+            if compressor:
+                spool.write(compressor.flush())
+        except OSError as e:
+            spool.close()
+            print(f"Skipping {source_path}: {e}")
+            return member, None
+        except BaseException:
+            spool.close()
+            raise
+
+        member.crc = crc
+        member.hash = digest.hexdigest()
+        member.file_size = file_size
+        member.compress_size = spool.tell()
+        spool.seek(0)
+        return member, spool
+
+    def _append_member(self, out, member, spool):
+        self._check_cancelled()
+        member.header_offset = out.tell()
+        name = member.arcname.encode('utf-8')
+        zip64 = member.file_size >= ZIP64_LIMIT or member.compress_size >= ZIP64_LIMIT
+        extra = struct.pack('<HHQQ', 0x0001, 16, member.file_size, member.compress_size) if zip64 else b''
+        dos_time, dos_date = _dos_datetime(member.mtime)
+        out.write(struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, 45 if zip64 else 20, UTF8_FLAG, member.method, dos_time, dos_date,
+            member.crc, ZIP64_LIMIT if zip64 else member.compress_size,
+            ZIP64_LIMIT if zip64 else member.file_size, len(name), len(extra)))
+        out.write(name)
+        out.write(extra)
+        member.data_offset = out.tell()
+        for chunk in iter(lambda: spool.read(ARCHIVE_CHUNK_SIZE), b''):
+            out.write(chunk)
+
+    def _write_index(self):
+        index = {"archive": os.path.basename(self.output_file),
+                 "members": [member.to_index_entry() for member in self.members]}
+        with open(self.output_file + ArchiveWriter.index_suffix, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+
+    def _write_central_directory(self, out):
+        cd_offset = out.tell()
+        for member in self.members:
+            name = member.arcname.encode('utf-8')
+            zip64_fields = []
+            file_size, compress_size, header_offset = member.file_size, member.compress_size, member.header_offset
+            if file_size >= ZIP64_LIMIT:
+                zip64_fields.append(file_size)
+                file_size = ZIP64_LIMIT
+            if compress_size >= ZIP64_LIMIT:
+                zip64_fields.append(compress_size)
+                compress_size = ZIP64_LIMIT
+            if header_offset >= ZIP64_LIMIT:
+                zip64_fields.append(header_offset)
+                header_offset = ZIP64_LIMIT
+            extra = b''
+            if zip64_fields:
+                extra = struct.pack('<HH', 0x0001, 8 * len(zip64_fields)) + struct.pack(
+                    '<' + 'Q' * len(zip64_fields), *zip64_fields)
+            version = 45 if zip64_fields else 20
+            dos_time, dos_date = _dos_datetime(member.mtime)
+            out.write(struct.pack(
+                '<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, UTF8_FLAG, member.method,
+                dos_time, dos_date, member.crc, compress_size, file_size, len(name), len(extra), 0, 0, 0,
+                (member.mode & 0xFFFF) << 16, header_offset))
+            out.write(name)
+            out.write(extra)
+
+        cd_end = out.tell()
+        cd_size = cd_end - cd_offset
+        count = len(self.members)
+        if count >= 0xFFFF or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            out.write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset))
+            out.write(struct.pack('<IIQI', 0x07064b50, 0, cd_end, 1))
+            out.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, 0xFFFF, 0xFFFF, ZIP64_LIMIT, ZIP64_LIMIT, 0))
+        else:
+            out.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0))
+
+
+def _dos_datetime(timestamp):
+    t = time.localtime(timestamp)
+    year = min(max(t.tm_year, 1980), 2107)
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
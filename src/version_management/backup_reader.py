@@ -0,0 +1,258 @@
+import os
+import re
+import json
+import zlib
+import hashlib
+import zipfile
+from collections import namedtuple
+from datetime import datetime
+from version_management.archive_writer import ArchiveWriter, ZIP_STORED
+from version_management.snapshot_store import SnapshotStore
+
+RESTORE_CHUNK_SIZE = 1 << 20
+BACKUP_KINDS = ("backups", "working_versions")
+
+BackupMember = namedtuple('BackupMember', 'name size hash')
+
+# <project>_v<version>_<YYYYmmdd_HHMMSS>.7z, as older versions named their archives
+LEGACY_ARCHIVE_NAME = re.compile(r'_v\d+_(\d{8}_\d{6})\.7z$')
+
+
+class RestoreError(Exception):
+    pass
+
+
+class ArchiveBackup:
+    """A zip archive written by ArchiveWriter, read through its member index.
+
+    Restoring one member seeks straight to its data offset and inflates only
+    that member. Archives without an index fall back to the zip central directory.
+    """
+    restorable = True
+
+    def __init__(self, archive_path, kind):
+        self.path = archive_path
+        self.kind = kind
+        self.label = os.path.basename(archive_path)
+        self.created = os.path.getmtime(archive_path)
+        self._index = None
+
+    def members(self):
+        return [BackupMember(e["name"], e["size"], e.get("hash")) for e in self._load_index().values()]
+
+    def delete(self):
+        """Remove the archive and its member index; returns the bytes freed."""
+        freed = 0
+        for path in (self.path, self.path + ArchiveWriter.index_suffix):
+            if os.path.exists(path):
+                freed += os.path.getsize(path)
+                os.remove(path)
+        return freed
+
+    def extract(self, prefix, dest_dir):
+        """Restore the member named prefix, or every member below it, into dest_dir.
+
+        Returns (files restored, bytes restored).
+        """
+        index = self._load_index()
+        entries = [index[name] for name in select_members(index, prefix)]
+        if not entries:
+            raise RestoreError(f"{prefix} is not in {self.label}")
+
+        restored_bytes = 0
+        with open(self.path, 'rb') as archive:
+            for entry in entries:
+                if "data_offset" in entry:
+                    restored_bytes += self._extract_indexed(archive, entry, dest_dir)
+                else:
+                    restored_bytes += self._extract_with_zipfile(entry, dest_dir)
+        return len(entries), restored_bytes
+
+    def _extract_indexed(self, archive, entry, dest_dir):
+        archive.seek(entry["data_offset"])
+        decompressor = None if entry["method"] == ZIP_STORED else zlib.decompressobj(-15)
+        remaining = entry["compress_size"]
+        crc = 0
+
+        with RestoredFile(dest_dir, entry["name"], entry.get("hash")) as out:
+            while remaining:
+                chunk = archive.read(min(RESTORE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise RestoreError(f"{self.label} is truncated at {entry['name']}")
+                remaining -= len(chunk)
+                data = decompressor.decompress(chunk) if decompressor else chunk
+                crc = zlib.crc32(data, crc)
+                out.write(data)
+            if decompressor:
+                data = decompressor.flush()
+                crc = zlib.crc32(data, crc)
+                out.write(data)
+            if crc != entry["crc"]:
+                raise RestoreError(f"CRC mismatch for {entry['name']} in {self.label}")
+            return out.size
+
+    def _extract_with_zipfile(self, entry, dest_dir):
+        with zipfile.ZipFile(self.path) as zf, zf.open(entry["name"]) as src, \
+                RestoredFile(dest_dir, entry["name"], None) as out:
+            for chunk in iter(lambda: src.read(RESTORE_CHUNK_SIZE), b''):
+                out.write(chunk)
+            return out.size
+
+    def _load_index(self):
+        if self._index is None:
+            index_path = self.path + ArchiveWriter.index_suffix
+            if os.path.exists(index_path):
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    members = json.load(f)["members"]
+            else:
+                with zipfile.ZipFile(self.path) as zf:
+                    members = [{"name": info.filename, "size": info.file_size}
+                               for info in zf.infolist() if not info.is_dir()]
+            self._index = {entry["name"]: entry for entry in members}
+        return self._index
+
+
+class LegacyArchiveBackup:
+    """A 7z archive an older version wrote into the project's backups or working_versions.
+
+    These are listed and pruned like other backups, but not restored: their
+    members are not read, extract them with 7-Zip.
+    """
+    restorable = False
+
+    def __init__(self, archive_path, kind):
+        self.path = archive_path
+        self.kind = kind
+        self.label = os.path.basename(archive_path)
+        match = LEGACY_ARCHIVE_NAME.search(self.label)
+        try:
+            self.created = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+        except (AttributeError, ValueError):
+            self.created = os.path.getmtime(archive_path)
+
+    def members(self):
+        return []
+
+    def delete(self):
+        """Remove the archive; returns the bytes freed."""
+        freed = os.path.getsize(self.path)
+        os.remove(self.path)
+        return freed
+
+    def extract(self, prefix, dest_dir):
+        raise RestoreError(f"{self.label} is a 7z archive; extract it with 7-Zip")
+
+
+class SnapshotBackup:
+    """A snapshot manifest in a SnapshotStore; each file is restored from its blob."""
+    restorable = True
+
+    def __init__(self, store, manifest_path, kind):
+        self.store = store
+        self.path = manifest_path
+        self.kind = kind
+        self.label = os.path.splitext(os.path.basename(manifest_path))[0]
+        self.created = os.path.getmtime(manifest_path)
+        self._files = None
+
+    def members(self):
+        return [BackupMember(name, size, digest) for name, (digest, size, _) in self._load_files().items()]
+
+    def delete(self):
+        """Remove the manifest; blobs it alone used are freed by SnapshotStore.collect_garbage."""
+        freed = os.path.getsize(self.path)
+        os.remove(self.path)
+        return freed
+
+    def extract(self, prefix, dest_dir):
+        files = self._load_files()
+        names = select_members(files, prefix)
+        if not names:
+            raise RestoreError(f"{prefix} is not in {self.label}")
+
+        restored_bytes = 0
+        for name in names:
+            digest = files[name][0]
+            with RestoredFile(dest_dir, name, digest) as out:
+                self.store.read_blob(digest, out)
+                restored_bytes += out.size
+        return len(names), restored_bytes
+
+    def _load_files(self):
+        if self._files is None:
+            self._files = self.store.load_manifest(self.path)["files"]
+        return self._files
+
+
+class RestoredFile:
+    """Writable file that lands at dest_dir/name only if its content hash matches."""
+
+    def __init__(self, dest_dir, name, expected_hash):
+        dest_dir = os.path.abspath(dest_dir)
+        self.path = os.path.normpath(os.path.join(dest_dir, *name.split('/')))
+        if os.path.commonpath([dest_dir, self.path]) != dest_dir:
+            raise RestoreError(f"Refusing to restore {name} outside {dest_dir}")
+        self.expected_hash = expected_hash
+        self.size = 0
+        self._digest = hashlib.blake2b(digest_size=20)
+        self._temp_path = self.path + ".restore-tmp"
+        self._file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self._temp_path, 'wb')
+        return self
+
+    def write(self, data):
+        self._digest.update(data)
+        self.size += len(data)
+        self._file.write(data)
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is not None:
+            os.remove(self._temp_path)
+            return False
+        if self.expected_hash and self._digest.hexdigest() != self.expected_hash:
+            os.remove(self._temp_path)
+            raise RestoreError(f"Hash mismatch while restoring {self.path}")
+        os.replace(self._temp_path, self.path)
+        return False
+
+
+def select_members(names, prefix):
+    """Return the names equal to prefix or below it; an empty prefix selects everything."""
+    prefix = prefix.replace(os.sep, '/').strip('/')
+    if not prefix:
+        return sorted(names)
+    return sorted(name for name in names if name == prefix or name.startswith(prefix + '/'))
+
+
+def project_stores(project_dir):
+    """Return the project's snapshot store, plus the in-project store of older versions if there is one."""
+    legacy_store = SnapshotStore.legacy_for_project(project_dir)
+    return [SnapshotStore.for_project(project_dir)] + ([legacy_store] if legacy_store else [])
+
+
+def archive_dirs(project_dir, kind):
+    """Return the directories holding a project's zip archives of a kind, including the legacy in-project one."""
+    return [SnapshotStore.for_project(project_dir).archive_dir(kind), os.path.join(project_dir, kind)]
+
+
+def list_backups(project_dir):
+    """Return every snapshot and archive of a project, including legacy 7z archives, newest first."""
+    backups = []
+    for kind in BACKUP_KINDS:
+        for store in project_stores(project_dir):
+            backups.extend(SnapshotBackup(store, path, kind) for path in store.list_snapshots(kind))
+        for archive_dir in archive_dirs(project_dir, kind):
+            if os.path.isdir(archive_dir):
+                with os.scandir(archive_dir) as entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        if entry.name.endswith(".zip"):
+                            backups.append(ArchiveBackup(entry.path, kind))
+                        elif entry.name.endswith(".7z"):
+                            backups.append(LegacyArchiveBackup(entry.path, kind))
+    return sorted(backups, key=lambda b: b.created, reverse=True)
@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+import ctypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from file_monitoring.file_tracker import FileTracker
+from version_management.snapshot_store import SnapshotStore
+from version_management.version_manager import VersionManager
+from version_management.retention import prune_project
+
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+PRIO_DARWIN_THREAD = 3
+PRIO_DARWIN_BG = 0x1000
+
+
+def lower_thread_priority():
+    """Run the calling thread at background CPU and I/O priority where the platform allows it."""
+    try:
+        if sys.platform == "win32":
+            # Background mode lowers the thread's CPU, I/O and memory priority together.
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif sys.platform == "darwin":
+            os.setpriority(PRIO_DARWIN_THREAD, 0, PRIO_DARWIN_BG)
+        else:
+            # Linux niceness is per thread, and without an explicit I/O class the
+            # best-effort I/O priority is derived from it.
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (OSError, AttributeError) as e:
+        print(f"Could not lower backup thread priority: {e}")
+
+
+def machine_idle_seconds():
+    """Seconds since the last keyboard or mouse input, or None where that is not available."""
+    if sys.platform != "win32":
+        return None
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return None
+    return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+
+class ByteThrottle:
+    """Token bucket shared by all backup workers; blocks readers above max_bytes_per_second."""
+
+    def __init__(self, max_bytes_per_second):
+        self.rate = max_bytes_per_second
+        self._allowance = float(max_bytes_per_second)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self, byte_count):
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.rate, self._allowance + (now - self._last) * self.rate)
+            self._last = now
+            self._allowance -= byte_count
+            delay = -self._allowance / self.rate if self._allowance < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+class BackupScheduler:
+    """Backs up projects that changed, and only those, in the background.
+
+    The file monitor reports changed projects through mark_dirty. A dirty project
+    is backed up once it has been quiet for idle_seconds (and, where the platform
+    reports it, the user has been away as long), or at the latest interval_seconds
+    after it first changed. Backups are snapshots into the project's SnapshotStore,
+    taken by at most max_concurrent low-priority workers whose reads, hashing
+    included, are throttled to max_bytes_per_second. With a retention policy, the project's old backups
+    are pruned by the same worker after each new one.
+    """
+
+    def __init__(self, interval_seconds=1800, idle_seconds=120, max_concurrent=1,
+                 max_bytes_per_second=None, retention=None, on_finished=None, on_error=None):
+        self.interval_seconds = interval_seconds
+        self.idle_seconds = idle_seconds
+        self.max_concurrent = max_concurrent
+        self.throttle = ByteThrottle(max_bytes_per_second) if max_bytes_per_second else None
+        self.retention = retention
+        # on_finished(project_dir, SnapshotResult or None if nothing changed, PruneResult or None);
+        # on_error(project_dir, message)
+        self.on_finished = on_finished
+        self.on_error = on_error
+
+        self._lock = threading.Lock()
+        # project dir -> [first change, last change] (monotonic seconds)
+        self._dirty = {}
+        self._running = set()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="BackupScheduler",
+                                        initializer=lower_thread_priority)
+
+    @property
+    def dirty_projects(self):
+        with self._lock:
+            return sorted(self._dirty)
+
+    def mark_dirty(self, project_dir):
+        now = time.monotonic()
+        with self._lock:
+            self._dirty.setdefault(os.path.normpath(project_dir), [now, now])[1] = now
+
+    def run_due(self):
+        """Start backups for dirty projects that are due; returns the projects started."""
+        now = time.monotonic()
+        user_idle = machine_idle_seconds()
+        started = []
+        with self._lock:
+            for project_dir, (first_change, last_change) in sorted(self._dirty.items(), key=lambda i: i[1][0]):
+                if len(self._running) + len(started) >= self.max_concurrent:
+                    break
+                if project_dir in self._running:
+                    continue
+                quiet = now - last_change >= self.idle_seconds
+                if quiet and user_idle is not None:
+                    quiet = user_idle >= self.idle_seconds
+                if quiet or now - first_change >= self.interval_seconds:
+                    started.append(project_dir)
+            for project_dir in started:
+                # Changes made while the backup runs mark the project dirty again.
+                del self._dirty[project_dir]
+                self._running.add(project_dir)
+                self._pool.submit(self._backup, project_dir)
+        return started
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _backup(self, project_dir):
+        try:
+            # Hashed on this low-priority thread and throttled, like the snapshot's own reads
+            fingerprints = FileTracker.get_fingerprints(project_dir, ensure_hashed=True, hash_here=True,
+                                                        throttle=self.throttle)
+            if fingerprints is None:
+                raise ValueError(f"Tracker file not found in {project_dir}")
+            store = SnapshotStore.for_project(project_dir)
+            result = None
+            pruned = None
+            if not store.matches_latest("backups", fingerprints):
+                version = VersionManager.generate_version(project_dir)
+                name = f"{os.path.basename(project_dir)}_v{version}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                result = store.create_snapshot(project_dir, fingerprints, "backups", name, version,
+                                               throttle=self.throttle)
+                if self.retention:
+                    pruned = prune_project(project_dir, self.retention)
+            if self.on_finished:
+                self.on_finished(project_dir, result, pruned)
+        except Exception as e:
+            self.mark_dirty(project_dir)
+            if self.on_error:
+                self.on_error(project_dir, str(e))
+        finally:
+            with self._lock:
+                self._running.discard(project_dir)
@@ -0,0 +1,150 @@
+import os
+import time
+import threading
+import subprocess
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# returncode is None when git could not be started; queued_seconds is the time spent
+# waiting behind other commands of the same repository
+GitResult = namedtuple('GitResult', 'repo_dir action args paths returncode stdout stderr queued_seconds run_seconds')
+
+# Stay well below the Windows command line limit of 32767 characters
+MAX_ARGS_LENGTH = 8000
+
+
+class GitJob:
+    def __init__(self, action, args, paths):
+        self.action = action
+        self.args = args
+        self.paths = paths
+        self.queued_at = time.monotonic()
+
+
+class GitExecutor(QObject):
+    """Runs git off the GUI thread: one command at a time per repository, repositories in parallel.
+
+    Commands of one repository run in the order they were submitted, so two of
+    them never compete for .git/index.lock; different repositories run on up to
+    max_parallel_repos threads. add() stages many paths with one git add per
+    repository, and paths added while an earlier git add of the same
+    repository is still queued join that invocation. Every command ends with
+    command_finished(GitResult), emitted from a worker thread.
+    """
+    command_finished = pyqtSignal(object)
+
+    def __init__(self, max_parallel_repos=4):
+        super().__init__()
+        self._pool = ThreadPoolExecutor(max_workers=max_parallel_repos, thread_name_prefix="GitExecutor")
+        self._lock = threading.Lock()
+        # repo dir -> deque of GitJob not started yet
+        self._queues = {}
+        self._running = set()
+
+    @staticmethod
+    def find_repo(path):
+        """Return the working tree root containing path, or None if it is not in a git repository."""
+        current = os.path.normpath(os.path.abspath(path))
+        if not os.path.isdir(current):
+            current = os.path.dirname(current)
+        while True:
+            if os.path.exists(os.path.join(current, ".git")):
+                return current
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+
+    @staticmethod
+    def group_by_repo(paths):
+        """Return ({repo_dir: [relative paths]}, [paths outside any repository])."""
+        groups = {}
+        outside = []
+        for path in paths:
+            repo_dir = GitExecutor.find_repo(path)
+            if repo_dir is None:
+                outside.append(path)
+                continue
+            relative = os.path.relpath(os.path.abspath(path), repo_dir)
+            groups.setdefault(repo_dir, []).append(relative)
+        return groups, outside
+
+    def add(self, paths):
+        """Stage paths with one git add per repository; returns the paths outside any repository."""
+        groups, outside = self.group_by_repo(paths)
+        for repo_dir, relative_paths in groups.items():
+            with self._lock:
+                queue = self._queues.get(repo_dir)
+                pending = queue[-1] if queue else None
+                if pending is not None and pending.action == "add":
+                    pending.paths.extend(p for p in relative_paths if p not in pending.paths)
+                    continue
+            self.submit(repo_dir, "add", None, relative_paths)
+        return outside
+
+    def commit(self, repo_dir, message, paths=None):
+        """Commit what is staged, or only the given paths (relative to repo_dir)."""
+        args = ["commit", "-m", message] + (["--"] + list(paths) if paths else [])
+        self.submit(repo_dir, "commit", args, list(paths or []))
+
+    def push(self, repo_dir, remote="origin"):
+        self.submit(repo_dir, "push", ["push", remote], [])
+
+    def submit(self, repo_dir, action, args, paths=()):
+        """Queue git <args> in repo_dir. For "add", args are built from paths when the job starts."""
+        repo_dir = os.path.normpath(repo_dir)
+        with self._lock:
+            self._queues.setdefault(repo_dir, deque()).append(GitJob(action, args, list(paths)))
+            if repo_dir in self._running:
+                return
+            self._running.add(repo_dir)
+        self._pool.submit(self._drain, repo_dir)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._queues.clear()
+        self._pool.shutdown(wait=wait)
+
+    def _drain(self, repo_dir):
+        while True:
+            with self._lock:
+                queue = self._queues.get(repo_dir)
+                if not queue:
+                    self._queues.pop(repo_dir, None)
+                    self._running.discard(repo_dir)
+                    return
+                job = queue.popleft()
+            if job.action == "add":
+                for chunk in self._chunks(job.paths):
+                    self._run(repo_dir, job, ["add", "--"] + chunk, chunk)
+            else:
+                self._run(repo_dir, job, job.args, job.paths)
+
+    def _run(self, repo_dir, job, args, paths):
+        started = time.monotonic()
+        try:
+            completed = subprocess.run(["git"] + args, cwd=repo_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       stdin=subprocess.DEVNULL,
+                                       creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+            returncode = completed.returncode
+            stdout = completed.stdout.decode('utf-8', errors='replace')
+            stderr = completed.stderr.decode('utf-8', errors='replace')
+        except OSError as e:
+            returncode, stdout, stderr = None, "", str(e)
+        finished = time.monotonic()
+        self.command_finished.emit(GitResult(repo_dir, job.action, args, paths, returncode, stdout, stderr,
+                                             started - job.queued_at, finished - started))
+
+    @staticmethod
+    def _chunks(paths):
+        chunk = []
+        length = 0
+        for path in paths:
+            if chunk and length + len(path) + 1 > MAX_ARGS_LENGTH:
+                yield chunk
+                chunk, length = [], 0
+            chunk.append(path)
+            length += len(path) + 1
+        if chunk:
+            yield chunk
@@ -0,0 +1,209 @@
+import os
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+from version_management.git_executor import GitExecutor
+
+CONFLICTED = "conflicted"
+MODIFIED = "modified"
+STAGED = "staged"
+UNTRACKED = "untracked"
+
+# A folder shows the most important state found below it
+STATE_PRIORITY = {UNTRACKED: 1, STAGED: 2, MODIFIED: 3, CONFLICTED: 4}
+
+
+def parse_porcelain_v2(output):
+    """Return {relative path: state} from `git status --porcelain=v2 -z` output.
+
+    Untracked directories are reported by git as "dir/" and keep the trailing slash.
+    """
+    states = {}
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "1":
+            fields = record.split(" ", 8)
+            states[fields[8]] = _change_state(fields[1])
+        elif kind == "2":
+            fields = record.split(" ", 9)
+            states[fields[9]] = _change_state(fields[1])
+            # The original path of a rename or copy follows as its own record
+            i += 1
+        elif kind == "u":
+            states[record.split(" ", 10)[10]] = CONFLICTED
+        elif kind == "?":
+            states[record[2:]] = UNTRACKED
+    return states
+
+
+def _change_state(xy):
+    # X is the index (staged) side, Y the work tree side; '.' means unchanged
+    return MODIFIED if xy[1] != "." else STAGED
+
+
+class RepoStatus:
+    def __init__(self, repo_dir, states):
+        self.repo_dir = repo_dir
+        self.files = {}
+        self.untracked_dirs = []
+        self.dirs = {}
+        for relative, state in states.items():
+            path = os.path.join(repo_dir, relative.rstrip("/").replace("/", os.sep))
+            if relative.endswith("/"):
+                self.untracked_dirs.append(path)
+            self.files[path] = state
+            parent = os.path.dirname(path)
+            while len(parent) >= len(repo_dir):
+                if STATE_PRIORITY[state] <= STATE_PRIORITY.get(self.dirs.get(parent), 0):
+                    break
+                self.dirs[parent] = state
+                if parent == repo_dir:
+                    break
+                parent = os.path.dirname(parent)
+
+    def status_of(self, path):
+        state = self.files.get(path) or self.dirs.get(path)
+        if state is None and self.untracked_dirs:
+            for directory in self.untracked_dirs:
+                if path.startswith(directory + os.sep):
+                    return UNTRACKED
+        return state
+
+    def changed_paths(self, other):
+        """Paths whose state differs between this status and other (which may be None)."""
+        mine = dict(self.files, **self.dirs)
+        theirs = dict(other.files, **other.dirs) if other else {}
+        return [path for path in mine.keys() | theirs.keys() if mine.get(path) != theirs.get(path)]
+
+
+class GitStatusCache(QObject):
+    """Per-repository git status, served from memory.
+
+    Each repository's status comes from one `git status --porcelain=v2 -z` run.
+    A repository is refreshed only when refresh() is asked for it, i.e. when the
+    file monitor reported changes in it or a git command ran in it, and at most
+    once per min_interval seconds: requests arriving meanwhile are merged into
+    one run at the end of the interval. status_of() never runs git.
+    status_changed(paths) is emitted from a worker thread with the paths whose
+    state changed.
+    """
+    status_changed = pyqtSignal(list)
+
+    def __init__(self, min_interval=2.0, max_parallel=2):
+        super().__init__()
+        self.min_interval = min_interval
+        self._pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="GitStatus")
+        self._lock = threading.Lock()
+        # repo dir -> RepoStatus (None until the first run finished)
+        self._repos = {}
+        self._last_run = {}
+        self._running = set()
+        self._pending = set()
+        self._timers = {}
+        self._stopped = False
+
+    def track(self, paths):
+        """Start serving the repositories containing paths, e.g. the monitored projects."""
+        for path in paths:
+            repo_dir = GitExecutor.find_repo(path)
+            if repo_dir is None:
+                continue
+            with self._lock:
+                if repo_dir in self._repos:
+                    continue
+                self._repos[repo_dir] = None
+            self.refresh(repo_dir)
+
+    def repo_of(self, path):
+        """The tracked repository containing path; no file system access."""
+        current = path
+        while current not in self._repos:
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+        return current
+
+    def status_of(self, path):
+        repo_dir = self.repo_of(path)
+        if repo_dir is None:
+            return None
+        status = self._repos.get(repo_dir)
+        return status.status_of(path) if status else None
+
+    def on_paths_changed(self, paths):
+        for repo_dir in {self.repo_of(os.path.normpath(p)) for p in paths} - {None}:
+            self.refresh(repo_dir)
+
+    def refresh(self, repo_dir):
+        """Run git status for repo_dir now, or once the rate limit allows."""
+        with self._lock:
+            if self._stopped or repo_dir not in self._repos:
+                return
+            if repo_dir in self._running or repo_dir in self._timers:
+                self._pending.add(repo_dir)
+                return
+            wait = self._last_run.get(repo_dir, 0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                timer = threading.Timer(wait, self._start_due, (repo_dir,))
+                timer.daemon = True
+                self._timers[repo_dir] = timer
+                timer.start()
+                return
+            self._start(repo_dir)
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+        self._pool.shutdown(wait=False)
+
+    def _start_due(self, repo_dir):
+        with self._lock:
+            self._timers.pop(repo_dir, None)
+            if not self._stopped:
+                self._start(repo_dir)
+
+    def _start(self, repo_dir):
+        # Called with _lock held
+        self._pending.discard(repo_dir)
+        self._running.add(repo_dir)
+        self._last_run[repo_dir] = time.monotonic()
+        self._pool.submit(self._run, repo_dir)
+
+    def _run(self, repo_dir):
+        status = None
+        try:
+            completed = subprocess.run(
+                ["git", "--no-optional-locks", "status", "--porcelain=v2", "-z", "--untracked-files=normal"],
+                cwd=repo_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+            if completed.returncode == 0:
+                status = RepoStatus(repo_dir, parse_porcelain_v2(completed.stdout.decode('utf-8', errors='replace')))
+            else:
+                print(f"git status failed in {repo_dir}: {completed.stderr.decode('utf-8', errors='replace').strip()}")
+        except OSError as e:
+            print(f"Could not run git status in {repo_dir}: {e}")
+
+        with self._lock:
+            self._running.discard(repo_dir)
+            previous = self._repos.get(repo_dir)
+            if status is not None and repo_dir in self._repos:
+                self._repos[repo_dir] = status
+            rerun = repo_dir in self._pending
+        if status is not None:
+            changed = status.changed_paths(previous)
+            if changed:
+                self.status_changed.emit(changed)
+        if rerun:
+            self.refresh(repo_dir)
@@ -0,0 +1,122 @@
+import os
+import time
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from version_management.git_status_cache import parse_porcelain_v2, MODIFIED, STAGED, UNTRACKED, CONFLICTED
+
+OPERATIONS = ("status", "changes", "gc", "maintenance")
+
+# staged/modified/untracked/conflicted are None for operations that do not look at the work tree;
+# ok is False when git failed, with its message in summary
+RepoReport = namedtuple('RepoReport', 'repo_dir operation ok branch ahead behind staged modified untracked '
+                                      'conflicted summary seconds')
+
+
+def find_repositories(root_dir, is_ignored=None):
+    """Return every git working tree under root_dir; the walk does not descend into a repository."""
+    repositories = []
+    stack = [os.path.normpath(root_dir)]
+    while stack:
+        directory = stack.pop()
+        if os.path.exists(os.path.join(directory, ".git")):
+            repositories.append(directory)
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if is_ignored and is_ignored(entry.path, True):
+                        continue
+                    stack.append(entry.path)
+        except OSError:
+            continue
+    return sorted(repositories)
+
+
+def run_git(repo_dir, args):
+    completed = subprocess.run(["git"] + args, cwd=repo_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               stdin=subprocess.DEVNULL,
+                               creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+    return (completed.returncode, completed.stdout.decode('utf-8', errors='replace'),
+            completed.stderr.decode('utf-8', errors='replace'))
+
+
+def inspect_repository(repo_dir, operation):
+    """Run one local operation in repo_dir and return its RepoReport; never raises."""
+    started = time.monotonic()
+    fields = dict(repo_dir=repo_dir, operation=operation, ok=True, branch=None, ahead=None, behind=None,
+                  staged=None, modified=None, untracked=None, conflicted=None, summary="")
+    try:
+        if operation in ("status", "changes"):
+            args = ["--no-optional-locks", "status", "--porcelain=v2", "-z"]
+            if operation == "status":
+                args.append("--branch")
+            returncode, stdout, stderr = run_git(repo_dir, args)
+            if returncode == 0:
+                fields.update(_status_fields(stdout))
+                fields["summary"] = _status_summary(fields, operation)
+        elif operation == "gc":
+            returncode, stdout, stderr = run_git(repo_dir, ["gc", "--auto", "--quiet"])
+            fields["summary"] = "done"
+        elif operation == "maintenance":
+            returncode, stdout, stderr = run_git(repo_dir, ["maintenance", "run", "--auto", "--quiet"])
+            fields["summary"] = "done"
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+        if returncode != 0:
+            fields.update(ok=False, summary=(stderr.strip() or stdout.strip() or f"exit status {returncode}"))
+    except (OSError, ValueError) as e:
+        fields.update(ok=False, summary=str(e))
+    return RepoReport(seconds=time.monotonic() - started, **fields)
+
+
+def run_maintenance(repositories, operation, max_workers=4, on_report=None, cancel_event=None):
+    """Run operation in every repository, max_workers at a time.
+
+    Each RepoReport goes to on_report(report) as soon as its repository is
+    done. Once cancel_event is set, repositories not started yet are skipped.
+    Returns the reports in completion order.
+    """
+    reports = []
+
+    def inspect(repo_dir):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        return inspect_repository(repo_dir, operation)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="RepoMaintenance") as pool:
+        for future in as_completed([pool.submit(inspect, repo_dir) for repo_dir in repositories]):
+            report = future.result()
+            if report is None:
+                continue
+            reports.append(report)
+            if on_report:
+                on_report(report)
+    return reports
+
+
+def _status_fields(output):
+    fields = {}
+    for record in output.split("\0"):
+        if record.startswith("# branch.head "):
+            fields["branch"] = record[len("# branch.head "):]
+        elif record.startswith("# branch.ab "):
+            ahead, behind = record[len("# branch.ab "):].split()
+            fields["ahead"], fields["behind"] = int(ahead), -int(behind)
+    states = list(parse_porcelain_v2(output).values())
+    fields.update(staged=states.count(STAGED), modified=states.count(MODIFIED),
+                  untracked=states.count(UNTRACKED), conflicted=states.count(CONFLICTED))
+    return fields
+
+
+def _status_summary(fields, operation):
+    changes = fields["staged"] + fields["modified"] + fields["conflicted"]
+    if not changes and not fields["untracked"]:
+        summary = "clean"
+    else:
+        summary = f"{changes} uncommitted, {fields['untracked']} untracked"
+    if operation == "status" and (fields.get("ahead") or fields.get("behind")):
+        summary += f", ahead {fields['ahead']}, behind {fields['behind']}"
+    return summary
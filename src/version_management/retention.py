@@ -0,0 +1,143 @@
+import os
+from datetime import datetime
+from version_management.snapshot_store import SnapshotStore
+from version_management.backup_reader import (BACKUP_KINDS, ArchiveBackup, LegacyArchiveBackup, SnapshotBackup,
+                                               list_backups, project_stores)
+
+
+class RetentionPolicy:
+    """Decides which backups to keep.
+
+    The newest keep_last backups are kept, plus the newest backup of each of the
+    last keep_hourly hours, keep_daily days and keep_weekly weeks that have one.
+    A limit of 0 disables that rule. The newest backup is always kept.
+    """
+
+    def __init__(self, keep_last=10, keep_hourly=24, keep_daily=7, keep_weekly=4):
+        self.keep_last = keep_last
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+
+    def select_kept(self, backups):
+        """Return the backups to keep out of backups, a list of one kind."""
+        backups = sorted(backups, key=lambda b: b.created, reverse=True)
+        kept = set(range(min(max(self.keep_last, 1), len(backups))))
+        rules = [
+            (self.keep_hourly, lambda t: t.strftime("%Y-%m-%d %H")),
+            (self.keep_daily, lambda t: t.strftime("%Y-%m-%d")),
+            (self.keep_weekly, lambda t: t.isocalendar()[:2]),
+        ]
+        for limit, bucket_of in rules:
+            buckets = set()
+            for i, backup in enumerate(backups):
+                bucket = bucket_of(datetime.fromtimestamp(backup.created))
+                if bucket in buckets:
+                    continue
+                if len(buckets) >= limit:
+                    break
+                buckets.add(bucket)
+                kept.add(i)
+        return [backups[i] for i in sorted(kept)]
+
+
+class PruneResult:
+    def __init__(self, backups_removed, blobs_removed, bytes_freed):
+        self.backups_removed = backups_removed
+        self.blobs_removed = blobs_removed
+        self.bytes_freed = bytes_freed
+
+
+class SpaceReport:
+    def __init__(self, project_dir):
+        self.project_dir = project_dir
+        self.backup_counts = dict.fromkeys(BACKUP_KINDS, 0)
+        self.blob_count = 0
+        self.blob_bytes = 0
+        self.archive_bytes = 0
+        # 7z archives an older version wrote into the project
+        self.legacy_archive_count = 0
+        self.legacy_archive_bytes = 0
+        # Backups the retention policy would remove, and their archive sizes (blobs are freed separately)
+        self.prunable_count = 0
+        self.prunable_bytes = 0
+        # Backup data an older version left inside the project tree
+        self.in_project_bytes = 0
+        # Size of the files in the newest backup, before deduplication and compression
+        self.latest_backup_bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self.blob_bytes + self.archive_bytes + self.legacy_archive_bytes
+
+
+def prune_project(project_dir, policy, grace_seconds=3600):
+    """Delete a project's backups that policy does not keep, then free unreferenced blobs."""
+    removed = 0
+    freed = 0
+    all_backups = list_backups(project_dir)
+    for kind in BACKUP_KINDS:
+        backups = [b for b in all_backups if b.kind == kind]
+        kept = set(id(b) for b in policy.select_kept(backups))
+        for backup in backups:
+            if id(backup) in kept:
+                continue
+            try:
+                freed += backup.delete()
+                removed += 1
+            except OSError as e:
+                print(f"Could not remove backup {backup.path}: {e}")
+
+    blobs_removed = 0
+    for store in project_stores(project_dir):
+        try:
+            count, size = store.collect_garbage(grace_seconds)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Skipping garbage collection in {store.store_dir}: {e}")
+            continue
+        blobs_removed += count
+        freed += size
+    return PruneResult(removed, blobs_removed, freed)
+
+
+def space_report(project_dir, policy=None):
+    """Measure the space a project's backups take, and what policy would prune if given."""
+    report = SpaceReport(project_dir)
+    backups = list_backups(project_dir)
+    for backup in backups:
+        report.backup_counts[backup.kind] += 1
+        if isinstance(backup, ArchiveBackup):
+            report.archive_bytes += os.path.getsize(backup.path)
+        elif isinstance(backup, LegacyArchiveBackup):
+            report.legacy_archive_count += 1
+            report.legacy_archive_bytes += os.path.getsize(backup.path)
+    restorable = [b for b in backups if b.restorable]
+    if restorable:
+        report.latest_backup_bytes = sum(member.size for member in restorable[0].members())
+    if policy is not None:
+        for kind in BACKUP_KINDS:
+            of_kind = [b for b in backups if b.kind == kind]
+            kept = set(id(b) for b in policy.select_kept(of_kind))
+            for backup in of_kind:
+                if id(backup) not in kept:
+                    report.prunable_count += 1
+                    if not isinstance(backup, SnapshotBackup):
+                        report.prunable_bytes += os.path.getsize(backup.path)
+
+    for store in project_stores(project_dir):
+        count, size = store.blob_usage()
+        report.blob_count += count
+        report.blob_bytes += size
+
+    in_project_dirs = [os.path.join(project_dir, kind) for kind in BACKUP_KINDS]
+    legacy_store = SnapshotStore.legacy_for_project(project_dir)
+    if legacy_store:
+        in_project_dirs.append(legacy_store.store_dir)
+    for directory in in_project_dirs:
+        for dirpath, _, filenames in os.walk(directory):
+            for name in filenames:
+                try:
+                    report.in_project_bytes += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+    return report
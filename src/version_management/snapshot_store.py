@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import tempfile
+from datetime import datetime
+
+BLOB_CHUNK_SIZE = 1 << 20
+
+
+class SnapshotResult:
+    def __init__(self, manifest_path, file_count, new_blobs, bytes_written, elapsed):
+        self.manifest_path = manifest_path
+        self.file_count = file_count
+        self.new_blobs = new_blobs
+        self.bytes_written = bytes_written
+        self.elapsed = elapsed
+
+
+class SnapshotStore:
+    """Deduplicating, content-addressed store for project snapshots.
+
+    File contents are kept once as zlib-compressed blobs named after their
+    BLAKE2b hash (the same hash the tracker records), and every snapshot is a
+    small JSON manifest mapping relative paths to blob hashes. Taking a snapshot
+    only writes blobs whose content is not in the store yet.
+
+    Stores live under storage_root, outside the projects tree, so backups are
+    neither scanned nor counted in project sizes. Older versions kept the store
+    in the project's .snapshots directory; that location is still read.
+    """
+
+    store_dir_name = ".snapshots"
+    storage_root = os.path.join(os.path.expanduser("~"), ".project_manager", "backups")
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, "objects")
+        self.manifests_dir = os.path.join(store_dir, "manifests")
+        self.archives_dir = os.path.join(store_dir, "archives")
+
+    @classmethod
+    def for_project(cls, project_dir):
+        project_dir = os.path.abspath(project_dir)
+        # The path hash keeps projects with the same name apart.
+        key = hashlib.blake2b(os.path.normcase(project_dir).encode("utf-8"), digest_size=4).hexdigest()
+        return cls(os.path.join(cls.storage_root, f"{os.path.basename(project_dir)}-{key}"))
+
+    @classmethod
+    def legacy_for_project(cls, project_dir):
+        """Return the store an older version kept inside the project, or None."""
+        store_dir = os.path.join(project_dir, cls.store_dir_name)
+        return cls(store_dir) if os.path.isdir(store_dir) else None
+
+    def archive_dir(self, kind):
+        return os.path.join(self.archives_dir, kind)
+
+    def kinds(self):
+        if not os.path.isdir(self.manifests_dir):
+            return []
+        with os.scandir(self.manifests_dir) as entries:
+            return sorted(e.name for e in entries if e.is_dir())
+
+    def blob_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def has_blob(self, digest):
+        return os.path.exists(self.blob_path(digest))
+
+    def create_snapshot(self, project_dir, fingerprints, kind, name, version=None, throttle=None):
+        """Write a snapshot of project_dir and return a SnapshotResult.
+
+        fingerprints maps relative paths to tracker Fingerprints with current
+        hashes; files whose hash is already stored are not read at all.
+        throttle, if given, is called with the size of every chunk read.
+        """
+        started = time.monotonic()
+        known = self._hashes_in_latest_manifest(kind)
+        files = {}
+        new_blobs = 0
+        bytes_written = 0
+
+        for relative_path, fingerprint in sorted(fingerprints.items()):
+            digest = fingerprint.hash
+            if digest is None or (digest not in known and not self.has_blob(digest)):
+                source = os.path.join(project_dir, relative_path)
+                try:
+                    digest, written = self.put_file(source, throttle)
+                except OSError as e:
+                    print(f"Skipping {source} in snapshot: {e}")
+                    continue
+                if written:
+                    new_blobs += 1
+                    bytes_written += written
+            known.add(digest)
+            files[relative_path.replace(os.sep, "/")] = [digest, fingerprint.size, fingerprint.mtime_ns]
+
+        manifest = {
+            "name": name,
+            "kind": kind,
+            "project": os.path.basename(os.path.normpath(project_dir)),
+            "version": version,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "files": files,
+        }
+        manifest_path = os.path.join(self.manifests_dir, kind, f"{name}.json")
+        self._write_atomic(manifest_path, json.dumps(manifest, indent=1).encode("utf-8"))
+        return SnapshotResult(manifest_path, len(files), new_blobs, bytes_written, time.monotonic() - started)
+
+    def put_file(self, path, throttle=None):
+        """Store a file's content; returns (digest, compressed bytes written or 0 if already stored).
+
+        The digest is computed while copying, so a file that changed after it was
+        hashed is stored under its actual content hash.
+        """
+        os.makedirs(self.objects_dir, exist_ok=True)
+        digest = hashlib.blake2b(digest_size=20)
+        compressor = zlib.compressobj(6)
+        written = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.objects_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as out, open(path, "rb") as src:
+                for chunk in iter(lambda: src.read(BLOB_CHUNK_SIZE), b""):
+                    if throttle:
+                        throttle(len(chunk))
+                    digest.update(chunk)
+                    data = compressor.compress(chunk)
+                    out.write(data)
+                    written += len(data)
+                data = compressor.flush()
+                out.write(data)
+                written += len(data)
+
+            hex_digest = digest.hexdigest()
+            blob_path = self.blob_path(hex_digest)
+            if os.path.exists(blob_path):
+                os.remove(temp_path)
+                return hex_digest, 0
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(temp_path, blob_path)
+            return hex_digest, written
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def read_blob(self, digest, out):
+        """Decompress a blob into the writable binary file object out."""
+        decompressor = zlib.decompressobj()
+        with open(self.blob_path(digest), "rb") as f:
+            for chunk in iter(lambda: f.read(BLOB_CHUNK_SIZE), b""):
+                out.write(decompressor.decompress(chunk))
+        out.write(decompressor.flush())
+
+    def list_snapshots(self, kind):
+        """Return the manifest paths of a kind, oldest first."""
+        kind_dir = os.path.join(self.manifests_dir, kind)
+        if not os.path.isdir(kind_dir):
+            return []
+        with os.scandir(kind_dir) as entries:
+            manifests = [e for e in entries if e.name.endswith(".json")]
+        return [e.path for e in sorted(manifests, key=lambda e: e.stat().st_mtime_ns)]
+
+    def load_manifest(self, manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def matches_latest(self, kind, fingerprints):
+        """Whether the latest snapshot of a kind holds exactly these files and contents."""
+        snapshots = self.list_snapshots(kind)
+        if not snapshots:
+            return False
+        try:
+            files = self.load_manifest(snapshots[-1])["files"]
+        except (OSError, ValueError, KeyError):
+            return False
+        current = {path.replace(os.sep, "/"): fp.hash for path, fp in fingerprints.items()}
+        return current == {path: entry[0] for path, entry in files.items()}
+
+    def collect_garbage(self, grace_seconds=3600):
+        """Delete blobs no manifest refers to; returns (blobs removed, bytes freed).
+
+        Blobs younger than grace_seconds are kept, because a snapshot in progress
+        stores its blobs before it writes its manifest.
+        """
+        referenced = set()
+        for kind in self.kinds():
+            for manifest_path in self.list_snapshots(kind):
+                # An unreadable manifest could hide references, so nothing is deleted then.
+                referenced.update(entry[0] for entry in self.load_manifest(manifest_path)["files"].values())
+
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        freed = 0
+        for prefix, path, st in self._blob_entries():
+            if st.st_mtime >= cutoff or prefix + os.path.basename(path) in referenced:
+                continue
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Could not remove {path}: {e}")
+                continue
+            removed += 1
+            freed += st.st_size
+        return removed, freed
+
+    def blob_usage(self):
+        """Return (blob count, bytes on disk) of the object store."""
+        count = 0
+        size = 0
+        for _, _, st in self._blob_entries():
+            count += 1
+            size += st.st_size
+        return count, size
+
+    def _blob_entries(self):
+        """Yield (hash prefix, path, stat) per blob; temporary files left by an interrupted write count too."""
+        if not os.path.isdir(self.objects_dir):
+            return
+        with os.scandir(self.objects_dir) as prefixes:
+            entries = list(prefixes)
+        prefix_dirs = [e for e in entries if e.is_dir()]
+        for temp_file in entries:
+            if temp_file.name.startswith(".tmp-") and temp_file.is_file():
+                try:
+                    yield "", temp_file.path, temp_file.stat()
+                except OSError:
+                    continue
+        for prefix_dir in prefix_dirs:
+            with os.scandir(prefix_dir.path) as blobs:
+                for blob in blobs:
+                    try:
+                        yield prefix_dir.name, blob.path, blob.stat()
+                    except OSError:
+                        continue
+
+    def _hashes_in_latest_manifest(self, kind):
+        snapshots = self.list_snapshots(kind)
+        if not snapshots:
+            return set()
+        try:
+            return {entry[0] for entry in self.load_manifest(snapshots[-1])["files"].values()}
+        except (OSError, ValueError, KeyError):
+            return set()
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)